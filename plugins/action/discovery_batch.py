@@ -0,0 +1,105 @@
+#!/usr/bin/env python
+# -*- encoding: utf-8; py-indent-offset: 4 -*-
+
+# Copyright: (c) 2026, Checkmk GmbH
+# GNU General Public License v3.0+
+# (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+from ansible.plugins.action import ActionBase
+
+DISCOVERY_MODULE = "checkmk.general.discovery"
+
+
+class ActionModule(ActionBase):
+    """Discover the services of all hosts of the current batch in one bulk
+    discovery, instead of one discovery job per host, which serialize on the
+    lock of the background job in Checkmk.
+
+    The plugin bypasses the host loop, so it runs once per batch. The result of
+    every host is returned in ``host_results``, by inventory name.
+    """
+
+    BYPASS_HOST_LOOP = True
+
+    def _batch_host_names(self, task_vars, host_name_var):
+        """Map the inventory names of the hosts of the batch to their names in
+        Checkmk, or to None for the hosts without the variable. The batch holds
+        all hosts of the play, also the ones that skipped the tasks setting it."""
+        batch = task_vars.get("ansible_play_batch") or [task_vars["inventory_hostname"]]
+        hostvars = task_vars.get("hostvars", {})
+
+        host_names = {}
+        for host in batch:
+            if host_name_var == "inventory_hostname":
+                host_names[host] = host
+                continue
+            host_name = hostvars.get(host, {}).get(host_name_var)
+            host_names[host] = self._templar.template(host_name) if host_name else None
+        return host_names
+
+    def run(self, tmp=None, task_vars=None):
+        result = super(ActionModule, self).run(tmp, task_vars)
+        del tmp
+        task_vars = task_vars or {}
+
+        module_args = dict(self._task.args)
+        host_name_var = module_args.pop("host_name_var", None) or "inventory_hostname"
+
+        for option in ("host_name", "hosts"):
+            if option in module_args:
+                result.update(
+                    failed=True,
+                    msg="The option %s is not supported, the hosts of the batch are discovered."
+                    % option,
+                )
+                return result
+
+        host_names = self._batch_host_names(task_vars, host_name_var)
+        module_args["hosts"] = list(
+            dict.fromkeys(name for name in host_names.values() if name)
+        )
+        module_args.setdefault("wait_for_completion", True)
+
+        if not module_args["hosts"]:
+            result.update(
+                skipped=True,
+                msg="No host of the batch has the variable %s." % host_name_var,
+            )
+        else:
+            result.update(
+                self._execute_module(
+                    module_name=DISCOVERY_MODULE,
+                    module_args=module_args,
+                    task_vars=task_vars,
+                )
+            )
+
+        # Fan the outcome of the bulk discovery out to the single hosts. The
+        # failed hosts are only known if the module waited for the job.
+        failed_hosts = (result.get("progress") or {}).get("failed_hosts") or {}
+        host_results = {}
+        for host, host_name in host_names.items():
+            if not host_name:
+                host_results[host] = {
+                    "host_name": None,
+                    "changed": False,
+                    "failed": False,
+                    "skipped": True,
+                    "msg": "The host has no variable %s." % host_name_var,
+                }
+                continue
+            error = failed_hosts.get(host_name)
+            host_results[host] = {
+                "host_name": host_name,
+                "changed": bool(result.get("changed")) and error is None,
+                "failed": bool(result.get("failed")) or error is not None,
+                "skipped": False,
+                "msg": error if error is not None else result.get("msg", ""),
+            }
+        result["host_results"] = host_results
+
+        return result
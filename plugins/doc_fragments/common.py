@@ -10,13 +10,15 @@ class ModuleDocFragment(object):
             description:
                 - The base url of your Checkmk server including the protocol but excluding the site.
                   If not set the module will fall back to the environment variable C(CHECKMK_VAR_SERVER_URL).
-            required: true
+                  Required, unless the module runs through the C(checkmk.general.checkmk) httpapi connection plugin.
+            required: false
             type: str
         site:
             description:
                 - The site you want to connect to. This will be appended to the server_url as part of the API request url.
                   If not set the module will fall back to the environment variable C(CHECKMK_VAR_SITE).
-            required: true
+                  Required, unless the module runs through the C(checkmk.general.checkmk) httpapi connection plugin.
+            required: false
             type: str
         api_auth_type:
             description: Type of authentication to use.
@@ -63,4 +65,28 @@ class ModuleDocFragment(object):
                   If not set the module will fall back to the environment variable C(CHECKMK_VAR_VALIDATE_CERTS).
             default: true
             type: bool
+        version_cache_ttl:
+            description:
+                - Number of seconds the Checkmk version of a site is cached on disk,
+                  in the temporary directory of the machine running the module.
+                  All tasks and forks asking for the version of the same I(server_url) and I(site)
+                  within that time share one request to the REST API.
+                  Set this to C(0) to disable the cache.
+                  If not set the module will fall back to the environment variable C(CHECKMK_VAR_VERSION_CACHE_TTL).
+            default: 0
+            type: int
+        invalidate_version_cache:
+            description:
+                - Drop the cached Checkmk version of the site before running the module,
+                  e.g. after a site update.
+            default: false
+            type: bool
+        invalidate_lookup_cache:
+            description:
+                - Drop the responses cached by the lookup plugins with I(persistent_cache) after the module
+                  changed something, so later lookups see the change.
+                - 'Only works if the module runs on the Ansible controller, for example with C(delegate_to: localhost).'
+            default: false
+            type: bool
+            version_added: "8.3.0"
     """
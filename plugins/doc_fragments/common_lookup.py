@@ -84,9 +84,92 @@ class ModuleDocFragment(object):
                   key: validate_certs
             type: bool
             default: True
+        cache_ttl:
+            description:
+                - The time in seconds responses of the Checkmk server are kept in an in-process cache,
+                  which is shared by all lookups. Identical requests within this time are answered from the cache.
+                - The default C(0) disables the cache.
+                - Use C(-vvv) to see the hits and misses of the cache.
+            required: False
+            vars:
+                - name: checkmk_var_lookup_cache_ttl
+            env:
+                - name: CHECKMK_VAR_LOOKUP_CACHE_TTL
+            ini:
+                - section: checkmk_lookup
+                  key: cache_ttl
+            type: int
+            default: 0
+            version_added: "8.3.0"
+        cache_size:
+            description:
+                - The maximum number of responses in the in-process cache, and in the persistent cache.
+                  The least recently used responses are dropped first.
+            required: False
+            vars:
+                - name: checkmk_var_lookup_cache_size
+            env:
+                - name: CHECKMK_VAR_LOOKUP_CACHE_SIZE
+            ini:
+                - section: checkmk_lookup
+                  key: cache_size
+            type: int
+            default: 32
+            version_added: "8.3.0"
+        cache_ttl_by_endpoint:
+            description:
+                - 'The time in seconds responses are cached, by the beginning of the endpoint of the REST API,
+                  for example C({"/version": 3600, "/domain-types/rule/collections/all": 30}).'
+                - The longest matching beginning wins. Other endpoints use I(cache_ttl).
+            required: False
+            vars:
+                - name: checkmk_var_lookup_cache_ttl_by_endpoint
+            ini:
+                - section: checkmk_lookup
+                  key: cache_ttl_by_endpoint
+            type: dict
+            default: {}
+            version_added: "8.3.0"
+        persistent_cache:
+            description:
+                - Also keep the cached responses in files in the temporary directory of the Ansible controller,
+                  which are shared by all forks. Forks requesting the same response at the same time then wait for
+                  the first one, so only one request is sent per TTL.
+                - Modules drop these files after a change with the option C(invalidate_lookup_cache).
+            required: False
+            vars:
+                - name: checkmk_var_lookup_persistent_cache
+            env:
+                - name: CHECKMK_VAR_LOOKUP_PERSISTENT_CACHE
+            ini:
+                - section: checkmk_lookup
+                  key: persistent_cache
+            type: bool
+            default: False
+            version_added: "8.3.0"
       notes:
         - Connection parameters are resolved from (in order of precedence) the value
           set directly on the plugin invocation, an Ansible variable of the form
           C(checkmk_var_*), an environment variable of the form C(CHECKMK_VAR_*),
           and the matching key under section C([checkmk_lookup]) in C(ansible.cfg).
     """
+
+    # For lookups which request several terms
+    CONCURRENCY = r"""
+      options:
+        max_concurrency:
+            description:
+                - The maximum number of requests sent to Checkmk in parallel, if several terms are given.
+                - The results are returned in the order of the terms. Set to C(1) to send one request after another.
+            required: False
+            vars:
+                - name: checkmk_var_lookup_max_concurrency
+            env:
+                - name: CHECKMK_VAR_LOOKUP_MAX_CONCURRENCY
+            ini:
+                - section: checkmk_lookup
+                  key: max_concurrency
+            type: int
+            default: 4
+            version_added: "8.3.0"
+    """
@@ -0,0 +1,153 @@
+# Copyright: (c) 2026, Checkmk GmbH
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+DOCUMENTATION = """
+    name: checkmk
+    author: Checkmk GmbH
+    version_added: "8.3.0"
+
+    short_description: HttpApi plugin for the Checkmk REST API
+
+    description:
+      - This HttpApi plugin provides methods to connect to the REST API of a Checkmk site
+        over a persistent HTTP(S) connection.
+      - All tasks of a play that run against the same host share one authenticated
+        connection and one cached version probe, instead of setting up both for every task.
+      - Use it by setting C(ansible_connection=ansible.netcommon.httpapi) and
+        C(ansible_network_os=checkmk.general.checkmk) for the host that represents
+        your Checkmk server. The C(ansible_host), C(ansible_httpapi_port),
+        C(ansible_httpapi_use_ssl) and C(ansible_httpapi_validate_certs) variables
+        of the connection define how the server is reached.
+
+    options:
+      site:
+        description:
+          - The site you want to connect to.
+        type: str
+        required: true
+        env:
+          - name: CHECKMK_VAR_SITE
+        vars:
+          - name: ansible_checkmk_site
+      api_auth_type:
+        description:
+          - Type of authentication to use. The credentials are taken from
+            C(ansible_user) and C(ansible_httpapi_password).
+        type: str
+        choices: [bearer, basic]
+        default: bearer
+        env:
+          - name: CHECKMK_VAR_API_AUTH_TYPE
+        vars:
+          - name: ansible_checkmk_api_auth_type
+
+    notes:
+      - The C(ansible.netcommon) collection is required to use this plugin.
+      - The modules C(contact_group), C(downtime), C(host_group) and C(service_group)
+        do not support this connection plugin yet and still need C(server_url) and C(site).
+"""
+
+EXAMPLES = """
+# Inventory
+# [checkmk_servers]
+# myserver ansible_host=myserver.example.com
+#
+# [checkmk_servers:vars]
+# ansible_connection=ansible.netcommon.httpapi
+# ansible_network_os=checkmk.general.checkmk
+# ansible_httpapi_use_ssl=true
+# ansible_httpapi_validate_certs=true
+# ansible_checkmk_site=mysite
+# ansible_user=myuser
+# ansible_httpapi_password=mysecret
+
+- name: "Manage hosts over one persistent connection."
+  hosts: checkmk_servers
+  gather_facts: false
+  tasks:
+    - name: "Create hosts."
+      checkmk.general.host:
+        name: "{{ item }}"
+        folder: "/"
+        state: "present"
+      loop: "{{ groups['linux'] }}"
+"""
+
+import base64
+import json
+
+from ansible.module_utils.common.text.converters import to_text
+from ansible.module_utils.connection import ConnectionError
+from ansible.plugins.httpapi import HttpApiBase
+
+
+class HttpApi(HttpApiBase):
+    def __init__(self, connection):
+        super(HttpApi, self).__init__(connection)
+        self._checkmk_version = None
+
+    def _base_path(self):
+        return "/%s/check_mk/api/1.0" % self.get_option("site")
+
+    def login(self, username, password):
+        if not username or not password:
+            raise ConnectionError(
+                "`ansible_user` and `ansible_httpapi_password` are required"
+                " to authenticate against the Checkmk REST API."
+            )
+
+        if self.get_option("api_auth_type") == "basic":
+            auth_str = "%s:%s" % (username, password)
+            auth_b64 = base64.b64encode(auth_str.encode("utf-8")).decode("utf-8")
+            authorization = "Basic %s" % auth_b64
+        else:
+            authorization = "Bearer %s %s" % (username, password)
+
+        self.connection._auth = {"Authorization": authorization}
+
+    def logout(self):
+        self.connection._auth = None
+
+    def handle_httperror(self, exc):
+        # Hand every HTTP error back to the module, which maps the status code
+        # to its own (changed, failed, message) semantics.
+        return exc
+
+    def send_request(self, data=None, path="", method="GET", headers=None):
+        """Send a request to the REST API of the site.
+
+        Returns a tuple of the HTTP status code, the lowercased response
+        headers and the response body as text.
+        """
+        request_headers = {
+            "Accept": "application/json",
+            "Content-Type": "application/json",
+        }
+        request_headers.update(headers or {})
+
+        response, response_data = self.connection.send(
+            self._base_path() + path,
+            data,
+            method=method,
+            headers=request_headers,
+        )
+
+        status = response.getcode()
+        response_headers = dict((k.lower(), v) for k, v in response.headers.items())
+        return status, response_headers, to_text(response_data.getvalue())
+
+    def get_checkmk_version(self):
+        """Return the raw Checkmk version of the site, probed once per connection"""
+        if self._checkmk_version is None:
+            status, headers, body = self.send_request(path="/version")
+            if status != 200:
+                raise ConnectionError(
+                    "Could not determine the Checkmk version: HTTP %s %s"
+                    % (status, body)
+                )
+            self._checkmk_version = json.loads(body).get("versions").get("checkmk")
+        return self._checkmk_version
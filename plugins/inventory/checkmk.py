@@ -13,7 +13,9 @@ DOCUMENTATION = """
         - Get hosts from any Checkmk site.
         - Generate groups based on tag groups or sites in Checkmk.
 
-    extends_documentation_fragment: [checkmk.general.common_lookup]
+    extends_documentation_fragment:
+        - checkmk.general.common_lookup
+        - ansible.builtin.inventory_cache
 
     options:
         plugin:
@@ -37,8 +39,9 @@ DOCUMENTATION = """
               - Restrict hosts to a specific folder path in Checkmk.
               - Given as a regular path, e.g. C(/linux/production).
               - Unless C(recursive) is enabled, only hosts directly in the given folder are returned.
-              - All hosts are always fetched from the site and filtered on the client
-                side, so this does not reduce the amount of data retrieved from Checkmk.
+              - From Checkmk 2.3.0 on, only the hosts of the folder (and its subfolders,
+                if C(recursive) is enabled) are fetched from the site. With older versions,
+                all hosts are fetched and filtered on the client side.
             required: false
             type: str
             env:
@@ -84,12 +87,32 @@ DOCUMENTATION = """
                 environment variable.
             required: false
             type: dict
+        max_concurrency:
+            description:
+              - Maximum number of requests sent to Checkmk in parallel.
+              - The tag groups, sites and hosts are fetched concurrently. With
+                server side folder scoping, the hosts of every folder are fetched
+                in a separate request. Set to C(1) to send all requests one after another.
+            required: false
+            default: 3
+            type: int
+            version_added: "8.3.0"
+            env:
+              - name: CHECKMK_VAR_MAX_CONCURRENCY
 
     notes:
         - Because inventory plugins run before C(group_vars/) and C(host_vars/) are
           loaded, C(checkmk_var_*) values placed there are B(not) visible to this
           plugin. Sources that B(do) work are extra-vars (C(-e)), environment
           variables (C(CHECKMK_VAR_*)) and C(ansible.cfg) C([checkmk_lookup]) entries.
+        - With C(cache) enabled, the tag groups, sites and hosts retrieved from
+          Checkmk are stored in the configured C(cache_plugin) and reused until
+          C(cache_timeout) expires. The filtering options are applied to the cached
+          data on every run, so changing them does not require a refresh.
+          The C(folder) and C(recursive) options are part of the cache key, because
+          they may limit the hosts retrieved from Checkmk.
+          Use C(ansible-inventory --flush-cache) or the C(refresh_inventory) meta task
+          to force fetching fresh data.
         - The C(lowercase_hosts) and C(domain_map) options change hostnames. If a
           transformation maps two different Checkmk hosts to the same name, they are
           merged into a single inventory host, so make sure transformed names stay unique.
@@ -129,6 +152,14 @@ plugin: checkmk.general.checkmk
 folder: "/linux"
 recursive: true
 
+# Keep the data retrieved from Checkmk for one hour in a JSON file cache:
+plugin: checkmk.general.checkmk
+groupsources: ["hosttags", "sites"]
+cache: true
+cache_plugin: ansible.builtin.jsonfile
+cache_connection: /tmp/checkmk_inventory
+cache_timeout: 3600
+
 # Build lowercase FQDNs by appending a domain suffix based on host tags:
 plugin: checkmk.general.checkmk
 lowercase_hosts: true
@@ -146,7 +177,8 @@ domain_map:
 #   CHECKMK_VAR_API_USER, CHECKMK_VAR_API_SECRET,
 #   CHECKMK_VAR_VALIDATE_CERTS, CHECKMK_VAR_API_AUTH_TYPE,
 #   CHECKMK_VAR_FOLDER, CHECKMK_VAR_RECURSIVE,
-#   CHECKMK_VAR_EXCLUDE_TAGS (comma-separated), CHECKMK_VAR_LOWERCASE_HOSTS
+#   CHECKMK_VAR_EXCLUDE_TAGS (comma-separated), CHECKMK_VAR_LOWERCASE_HOSTS,
+#   CHECKMK_VAR_MAX_CONCURRENCY
 
 # Minimal inventory file when using environment variables:
 plugin: checkmk.general.checkmk
@@ -164,23 +196,34 @@ groupsources: ["hosttags", "sites"]
 #   checkmk_var_validate_certs, checkmk_var_api_auth_type
 """
 
+import hashlib
 import json
-import re
+from concurrent.futures import ThreadPoolExecutor
 
 from ansible.errors import AnsibleError, AnsibleParserError
-from ansible.plugins.inventory import BaseInventoryPlugin
+from ansible.plugins.inventory import BaseInventoryPlugin, Cacheable
 from ansible.utils.display import Display
+from ansible_collections.checkmk.general.plugins.module_utils.inventory_grouping import (
+    GroupingEngine,
+    convertname,
+)
 from ansible_collections.checkmk.general.plugins.module_utils.lookup_api import (
     CheckMKLookupAPI,
 )
 from ansible_collections.checkmk.general.plugins.module_utils.utils import (
     normalize_folder,
 )
+from ansible_collections.checkmk.general.plugins.module_utils.version import (
+    CheckmkVersion,
+)
 
 display = Display()
 
+# First version that returns effective attributes for the hosts of a folder
+FOLDER_SCOPE_MIN_VERSION = CheckmkVersion("2.3.0")
+
 
-class InventoryModule(BaseInventoryPlugin):
+class InventoryModule(BaseInventoryPlugin, Cacheable):
     """Host inventory parser for ansible using Checkmk as source."""
 
     NAME = "checkmk.general.checkmk"
@@ -202,17 +245,27 @@ class InventoryModule(BaseInventoryPlugin):
         self.exclude_tags = []
         self.lowercase_hosts = False
         self.domain_map = {}
+        self.max_concurrency = 3
         self.groupsources = []
         self.hosttaggroups = []
         self.tags = []
         self.groups = []
         self.hosts = []
         self.sites = []
+        self._grouping = None
 
     def convertname(self, name):
         """Removes empty space and changes bad chars to _"""
-        regex = r"[^A-Za-z0-9\_]"
-        return re.sub(regex, "_", name.replace(" ", ""))
+        return convertname(name)
+
+    def _new_grouping(self):
+        """Precompile the host filters and group memberships from the options"""
+        return GroupingEngine(
+            self.tags,
+            groupsources=self.groupsources,
+            exclude_tags=self.exclude_tags,
+            domain_map=self.domain_map,
+        )
 
     def verify_file(self, path):
         """return true/false if this is possibly a valid file for this plugin to consume"""
@@ -258,22 +311,12 @@ class InventoryModule(BaseInventoryPlugin):
                 sites = ["site_" + site.get("id") for site in self.sites]
                 self.groups.extend(sites)
 
-    def _is_excluded(self, host):
-        """Return True if the host has any of the excluded tags set."""
-        if not self.exclude_tags:
-            return False
-        host_tags = host.get("tags", {})
+    def _excluded_by(self, grouping, host_id, host_tags):
         # host_tags has the form {"tag_criticality": "test", "tag_agent": "cmk-agent", ...}
-        # We reconstruct the full tag string "tag_<group>_<value>" and check against exclude_tags
-        for group, value in host_tags.items():
-            if value:
-                full_tag = group + "_" + value
-                if full_tag in self.exclude_tags:
-                    display.vvv(
-                        "Excluding host '%s' due to tag '%s'"
-                        % (host.get("id"), full_tag)
-                    )
-                    return True
+        full_tag = grouping.excluded_by(host_tags)
+        if full_tag:
+            display.vvv("Excluding host '%s' due to tag '%s'" % (host_id, full_tag))
+            return True
         return False
 
     def parse(self, inventory, loader, path, cache=False):
@@ -297,72 +340,144 @@ class InventoryModule(BaseInventoryPlugin):
             self.exclude_tags = self.get_option("exclude_tags") or []
             self.lowercase_hosts = self.get_option("lowercase_hosts")
             self.domain_map = self.get_option("domain_map") or {}
+            self.max_concurrency = self.get_option("max_concurrency")
         except Exception as e:
             raise AnsibleParserError("All correct options required: {}".format(e))
 
         if self.exclude_tags:
             display.vvv("Excluding hosts with tags: %s" % self.exclude_tags)
 
+        site_url = self.get_option("server_url") + "/" + self.get_option("site")
         api = CheckMKLookupAPI(
-            site_url=self.get_option("server_url") + "/" + self.get_option("site"),
+            site_url=site_url,
             api_auth_type=self.api_auth_type,
             api_auth_cookie=self.api_auth_cookie,
             api_user=self.get_option("api_user"),
             api_secret=self.get_option("api_secret"),
             validate_certs=self.get_option("validate_certs"),
+            cache_ttl=self.get_option("cache_ttl"),
+            cache_size=self.get_option("cache_size"),
+            cache_ttl_by_endpoint=self.get_option("cache_ttl_by_endpoint"),
+            persistent_cache=self.get_option("persistent_cache"),
+            display=display,
         )
 
-        self.hosttaggroups = self._get_taggroups(api)
+        cache_key = self._cache_key(path, site_url)
+        data = self._get_data(api, cache_key, cache)
+
+        self.hosttaggroups = data["hosttaggroups"]
         self.tags = [("tag_" + tag.get("id")) for tag in self.hosttaggroups]
-        self.sites = self._get_sites(api)
+        self.sites = data["sites"]
 
-        self.hosts = self._get_hosts(api)
+        self.hosts = self._parse_hosts(data["hosts"])
 
         self._generate_groups()
 
         self._populate()
 
+    def _cache_key(self, path, site_url):
+        """Return the key of the inventory data in the cache.
+
+        The same inventory file may point to different sites via environment
+        variables or extra-vars, so the site is part of the cache key. So are
+        the folder options, as they may limit the hosts fetched from the site,
+        and the user, who may not see all hosts. The user name or cookie is
+        only part of the key as a hash.
+        """
+        if self.api_auth_type == "cookie":
+            identity = self.api_auth_cookie
+        else:
+            identity = self.user
+        user_hash = hashlib.sha256(
+            ("%s|%s" % (self.api_auth_type, identity)).encode("utf-8")
+        ).hexdigest()
+        return self.get_cache_key(
+            "%s|%s|%s|%s|%s" % (path, site_url, self.folder, self.recursive, user_hash)
+        )
+
+    def _get_data(self, api, cache_key, cache):
+        """Return the tag groups, sites and hosts of the site.
+
+        The data is served from the inventory cache if caching is enabled and
+        the entry is still valid, otherwise it is fetched and the cache updated.
+        """
+        user_cache_setting = self.get_option("cache")
+        attempt_to_read_cache = user_cache_setting and cache
+        cache_needs_update = user_cache_setting and not cache
+
+        if attempt_to_read_cache:
+            try:
+                data = self._cache[cache_key]
+                display.vvv("Using cached inventory data for '%s'" % cache_key)
+                return data
+            except KeyError:
+                cache_needs_update = True
+
+        data = self._fetch_data(api)
+
+        if cache_needs_update:
+            self._cache[cache_key] = data
+
+        return data
+
+    def _fetch_data(self, api):
+        """Fetch the tag groups, sites and hosts from the site.
+
+        The requests are independent of each other, so they are issued
+        concurrently, bounded by the max_concurrency option. If a folder is
+        given and the site supports it, only the hosts of that folder (and
+        its subfolders) are requested.
+        """
+        max_workers = max(1, self.max_concurrency or 1)
+        display.vvv("Fetching inventory data with %d worker(s)" % max_workers)
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            version = executor.submit(self._get_version, api) if self.folder else None
+            hosttaggroups = executor.submit(self._get_taggroups, api)
+            sites = executor.submit(self._get_sites, api)
+
+            if version is not None and self._supports_folder_scope(version.result()):
+                hosts = self._request_folder_hosts(api, executor)
+            else:
+                hosts = [executor.submit(self._request_hosts, api)]
+
+            # Errors are raised in the same order as with sequential requests
+            data = {
+                "hosttaggroups": hosttaggroups.result(),
+                "sites": sites.result(),
+                "hosts": [host for future in hosts for host in future.result()],
+            }
+
+        return data
+
+    def _supports_folder_scope(self, version):
+        """Return True if the hosts of a folder can be fetched from the site
+        including their effective attributes."""
+        if version.isvalid() and version >= FOLDER_SCOPE_MIN_VERSION:
+            return True
+        display.vvv(
+            "Checkmk %s does not support folder scoped host listings,"
+            " filtering hosts on the client side" % version
+        )
+        return False
+
     def _populate(self):
         """Return the hosts and groups"""
+        grouping = self._grouping or self._new_grouping()
+        grouping.groupsources = self.groupsources or []
 
         for group in self.groups:
-            self.inventory.add_group(self.convertname(group))
+            self.inventory.add_group(grouping.convertname(group))
 
         for host in self.hosts:
-            self.inventory.add_host(host["id"])
-            self.inventory.set_variable(host["id"], "ipaddress", host["ipaddress"])
-            self.inventory.set_variable(host["id"], "folder", host["folder"])
+            host_id = host["id"]
+            self.inventory.add_host(host_id)
+            self.inventory.set_variable(host_id, "ipaddress", host["ipaddress"])
+            self.inventory.set_variable(host_id, "folder", host["folder"])
             if self.want_ipv4:
-                self.inventory.set_variable(
-                    host["id"], "ansible_host", host["ipaddress"]
-                )
-
-        if self.groupsources:
-            if "hosttags" in self.groupsources:
-                for host in self.hosts:
-                    for tag in self.tags:
-                        if host.get("tags").get(tag):
-                            self.inventory.add_child(
-                                tag + "_" + self.convertname(host.get("tags").get(tag)),
-                                host.get("id"),
-                            )
-                        else:
-                            self.inventory.add_child(tag + "_None", host.get("id"))
-            if "sites" in self.groupsources:
-                for host in self.hosts:
-                    self.inventory.add_child(
-                        "site_" + self.convertname(host.get("site")), host.get("id")
-                    )
+                self.inventory.set_variable(host_id, "ansible_host", host["ipaddress"])
 
-    def _get_domain_suffix(self, host_tags):
-        """Return the suffix of the first domain_map entry matching a host tag, or empty string."""
-        host_full_tags = {
-            group + "_" + value for group, value in host_tags.items() if value
-        }
-        for tag, suffix in self.domain_map.items():
-            if tag in host_full_tags:
-                return suffix
-        return ""
+            for group in grouping.host_groups(host["tags"], host["site"]):
+                self.inventory.add_child(group, host_id)
 
     def _folder_matches(self, host_folder, target=None):
         """Return True if the host's folder matches the folder option.
@@ -384,87 +499,184 @@ class InventoryModule(BaseInventoryPlugin):
         return False
 
     def _parse_hosts(self, raw_hosts):
-        """Convert raw API host list to internal format, apply folder, exclude_tags and domain_map."""
+        """Convert raw API host list to internal format, apply folder, exclude_tags and domain_map.
+
+        The tags of the parsed hosts are the values of all tag groups, in the
+        order of self.tags. See GroupingEngine.tag_values().
+        """
         folder_target = normalize_folder(self.folder) if self.folder else None
+        grouping = self._grouping = self._new_grouping()
         hosts = []
         for host in raw_hosts:
             host_id = host.get("id")
-            host_tags = {
-                taggroup: tag
-                for taggroup, tag in host.get("extensions")
-                .get("effective_attributes")
-                .items()
-                if taggroup in self.tags
-            }
-            parsed = {
-                "id": host_id,
-                "title": host.get("extensions").get("title"),
-                "ipaddress": host.get("extensions").get("attributes").get("ipaddress"),
-                "folder": host.get("extensions").get("folder"),
-                "site": host.get("extensions").get("effective_attributes").get("site"),
-                "tags": host_tags,
-            }
+            extensions = host.get("extensions")
+            effective_attributes = extensions.get("effective_attributes")
+            folder = extensions.get("folder")
 
-            if not self._folder_matches(parsed["folder"], folder_target):
+            if not self._folder_matches(folder, folder_target):
                 continue
 
-            if self._is_excluded(parsed):
+            if self.exclude_tags and self._excluded_by(
+                grouping, host_id, effective_attributes
+            ):
                 continue
 
-            if self.domain_map:
-                suffix = self._get_domain_suffix(host_tags)
+            parsed_id = host_id
+            if grouping.has_domain_map:
+                suffix = grouping.domain_suffix(effective_attributes)
                 if suffix:
-                    parsed["id"] = host_id + suffix
+                    parsed_id = host_id + suffix
                     display.vvv(
                         "Host '%s' gets suffix '%s' -> '%s'"
-                        % (host_id, suffix, parsed["id"])
+                        % (host_id, suffix, parsed_id)
                     )
 
             if self.lowercase_hosts:
-                parsed["id"] = parsed["id"].lower()
-
-            hosts.append(parsed)
+                parsed_id = parsed_id.lower()
+
+            hosts.append(
+                {
+                    "id": parsed_id,
+                    "title": extensions.get("title"),
+                    "ipaddress": extensions.get("attributes").get("ipaddress"),
+                    "folder": folder,
+                    "site": effective_attributes.get("site"),
+                    "tags": grouping.tag_values(effective_attributes),
+                }
+            )
         return hosts
 
     def _get_hosts(self, api):
-        # The folder option is filtered on the client side in _parse_hosts,
-        # because fetching hosts per folder via the REST API does not support
-        # effective_attributes on all supported Checkmk versions.
+        return self._parse_hosts(self._request_hosts(api))
+
+    def _request_hosts(self, api):
+        """Return the stripped hosts of the site"""
+        # Without server side folder scoping (see _request_folder_hosts),
+        # the folder option is filtered on the client side in _parse_hosts.
         if self.folder:
             display.vvv(
                 "Restricting hosts to folder '%s'%s"
                 % (self.folder, " (recursive)" if self.recursive else "")
             )
 
-        response = json.loads(
-            api.get(
+        return self._strip_hosts(
+            self._stream_collection(
+                api,
                 "/domain-types/host_config/collections/all",
                 {"effective_attributes": True},
             )
         )
-        if "code" in response:
-            raise AnsibleError(
-                "Received error for %s - %s: %s"
-                % (
-                    response.get("url", ""),
-                    response.get("code", ""),
-                    response.get("msg", ""),
-                )
+
+    def _request_folder_hosts(self, api, executor):
+        """Request the stripped hosts of the folder option and, if recursive,
+        all of its subfolders. Returns one future per folder."""
+        folder = normalize_folder(self.folder)
+        folders = [folder]
+        if self.recursive:
+            folders += self._get_subfolders(api, folder)
+
+        display.vvv(
+            "Fetching hosts of %d folder(s) below '%s' from the site"
+            % (len(folders), folder)
+        )
+        return [
+            executor.submit(self._request_hosts_in_folder, api, folder)
+            for folder in folders
+        ]
+
+    def _get_subfolders(self, api, folder):
+        response = self._load_response(
+            api.get(
+                "/domain-types/folder_config/collections/all",
+                {
+                    "parent": folder.replace("/", "~"),
+                    "recursive": True,
+                    "show_hosts": False,
+                },
             )
+        )
+        return [
+            normalize_folder(subfolder.get("extensions").get("path"))
+            for subfolder in response.get("value", [])
+        ]
 
-        return self._parse_hosts(response.get("value", []))
+    def _request_hosts_in_folder(self, api, folder):
+        return self._strip_hosts(
+            self._stream_collection(
+                api,
+                "/objects/folder_config/%s/collections/hosts"
+                % folder.replace("/", "~"),
+                {"effective_attributes": True},
+            )
+        )
 
-    def _get_taggroups(self, api):
-        response = json.loads(api.get("/domain-types/host_tag_group/collections/all"))
+    def _strip_hosts(self, raw_hosts):
+        """Strip the raw hosts to the fields used by _parse_hosts, while they
+        are streamed from the site. This keeps the memory usage and the
+        inventory cache small.
+
+        Only the site and the tag group attributes are kept of the effective
+        attributes. All tag group attributes start with tag_, so the hosts
+        can be stripped before the tag groups are known.
+        """
+        hosts = []
+        for host in raw_hosts:
+            extensions = host.get("extensions")
+            effective_attributes = extensions.get("effective_attributes")
+            hosts.append(
+                {
+                    "id": host.get("id"),
+                    "extensions": {
+                        "title": extensions.get("title"),
+                        "folder": extensions.get("folder"),
+                        "attributes": {
+                            "ipaddress": extensions.get("attributes").get("ipaddress"),
+                        },
+                        "effective_attributes": {
+                            key: value
+                            for key, value in effective_attributes.items()
+                            if key == "site" or key.startswith("tag_")
+                        },
+                    },
+                }
+            )
+        return hosts
+
+    def _stream_collection(self, api, endpoint, parameters=None):
+        """Yield the entries of a collection while it is being read and
+        raise AnsibleError if the request fails."""
+        stream = api.get_collection(endpoint, parameters)
+        for entry in stream:
+            yield entry
+        if stream.error:
+            self._raise_for_error(stream.error)
+
+    def _get_version(self, api):
+        response = self._load_response(api.get("/version"))
+        return CheckmkVersion(response.get("versions", {}).get("checkmk", ""))
+
+    def _load_response(self, raw_response):
+        """Decode a response of CheckMKLookupAPI and raise AnsibleError
+        if it reports an error."""
+        response = json.loads(raw_response)
         if "code" in response:
-            raise AnsibleError(
-                "Received error for %s - %s: %s"
-                % (
-                    response.get("url", ""),
-                    response.get("code", ""),
-                    response.get("msg", ""),
-                )
+            self._raise_for_error(response)
+        return response
+
+    def _raise_for_error(self, error):
+        raise AnsibleError(
+            "Received error for %s - %s: %s"
+            % (
+                error.get("url", ""),
+                error.get("code", ""),
+                error.get("msg", ""),
             )
+        )
+
+    def _get_taggroups(self, api):
+        response = self._load_response(
+            api.get("/domain-types/host_tag_group/collections/all")
+        )
 
         hosttaggroups = [
             {
@@ -477,16 +689,9 @@ class InventoryModule(BaseInventoryPlugin):
         return hosttaggroups
 
     def _get_sites(self, api):
-        response = json.loads(api.get("/domain-types/site_connection/collections/all"))
-        if "code" in response:
-            raise AnsibleError(
-                "Received error for %s - %s: %s"
-                % (
-                    response.get("url", ""),
-                    response.get("code", ""),
-                    response.get("msg", ""),
-                )
-            )
+        response = self._load_response(
+            api.get("/domain-types/site_connection/collections/all")
+        )
 
         sites = [
             {"id": site.get("id"), "customer": site.get("extensions").get("customer")}
@@ -21,7 +21,9 @@ DOCUMENTATION = """
         description: activation ID to look up
         required: True
 
-    extends_documentation_fragment: [checkmk.general.common_lookup]
+    extends_documentation_fragment:
+      - checkmk.general.common_lookup
+      - checkmk.general.common_lookup.concurrency
 
     notes:
       - Like all lookups, this runs on the Ansible controller and is unaffected by other keywords such as 'become'.
@@ -80,8 +82,6 @@ RETURN = """
     elements: str
 """
 
-import json
-
 from ansible.errors import AnsibleError
 from ansible.plugins.lookup import LookupBase
 from ansible_collections.checkmk.general.plugins.module_utils.lookup_api import (
@@ -110,13 +110,21 @@ class LookupModule(LookupBase):
             api_user=api_user,
             api_secret=api_secret,
             validate_certs=validate_certs,
+            cache_ttl=self.get_option("cache_ttl"),
+            cache_size=self.get_option("cache_size"),
+            cache_ttl_by_endpoint=self.get_option("cache_ttl_by_endpoint"),
+            persistent_cache=self.get_option("persistent_cache"),
+            display=self._display,
         )
 
         ret = []
 
-        for term in terms:
-            response = json.loads(api.get("/objects/activation_run/%s" % term))
+        responses = api.get_json_all(
+            ["/objects/activation_run/%s" % term for term in terms],
+            max_concurrency=self.get_option("max_concurrency"),
+        )
 
+        for response in responses:
             if "code" in response:
                 raise AnsibleError(
                     "Received error for %s - %s: %s"
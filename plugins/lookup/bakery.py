@@ -100,6 +100,11 @@ class LookupModule(LookupBase):
             api_user=api_user,
             api_secret=api_secret,
             validate_certs=validate_certs,
+            cache_ttl=self.get_option("cache_ttl"),
+            cache_size=self.get_option("cache_size"),
+            cache_ttl_by_endpoint=self.get_option("cache_ttl_by_endpoint"),
+            persistent_cache=self.get_option("persistent_cache"),
+            display=self._display,
         )
 
         response = json.loads(
@@ -27,7 +27,28 @@ DOCUMENTATION = """
         required: False
         default: False
 
-    extends_documentation_fragment: [checkmk.general.common_lookup]
+      batch_threshold:
+        description:
+          - Above this number of distinct host names, the hosts are fetched with collection requests,
+            instead of one request per host.
+          - From Checkmk 2.3.0 on, the collection is filtered by the host names, otherwise all hosts are
+            fetched, and the requested ones are picked on the Ansible controller.
+          - Set to C(0) to always request the hosts one by one.
+        type: int
+        required: False
+        default: 20
+        vars:
+          - name: checkmk_var_lookup_batch_threshold
+        env:
+          - name: CHECKMK_VAR_LOOKUP_BATCH_THRESHOLD
+        ini:
+          - section: checkmk_lookup
+            key: batch_threshold
+        version_added: "8.3.0"
+
+    extends_documentation_fragment:
+      - checkmk.general.common_lookup
+      - checkmk.general.common_lookup.concurrency
 
     notes:
       - Like all lookups, this runs on the Ansible controller and is unaffected by other keywords such as 'become'.
@@ -104,13 +125,24 @@ RETURN = """
     elements: dict
 """
 
-import json
-
 from ansible.errors import AnsibleError
 from ansible.plugins.lookup import LookupBase
 from ansible_collections.checkmk.general.plugins.module_utils.lookup_api import (
+    HTTP_ERROR_CODES,
     CheckMKLookupAPI,
+    map_concurrently,
 )
+from ansible_collections.checkmk.general.plugins.module_utils.version import (
+    CheckmkVersion,
+)
+
+HOST_COLLECTION = "/domain-types/host_config/collections/all"
+
+# First version that filters the host collection by host names
+HOSTNAMES_FILTER_MIN_VERSION = CheckmkVersion("2.3.0")
+
+# Host names per filtered request, which keeps the URLs short
+HOSTNAMES_PER_REQUEST = 100
 
 
 class LookupModule(LookupBase):
@@ -134,6 +166,11 @@ class LookupModule(LookupBase):
             api_user=api_user,
             api_secret=api_secret,
             validate_certs=validate_certs,
+            cache_ttl=self.get_option("cache_ttl"),
+            cache_size=self.get_option("cache_size"),
+            cache_ttl_by_endpoint=self.get_option("cache_ttl_by_endpoint"),
+            persistent_cache=self.get_option("persistent_cache"),
+            display=self._display,
         )
 
         ret = []
@@ -142,20 +179,94 @@ class LookupModule(LookupBase):
             "effective_attributes": effective_attributes,
         }
 
-        for term in terms:
-            api_endpoint = "/objects/host_config/" + term
+        batch_threshold = self.get_option("batch_threshold")
+        if batch_threshold and len(set(terms)) > batch_threshold:
+            hosts = self._request_hosts(api, terms, parameters)
+            for term in terms:
+                if term not in hosts:
+                    self._raise_for_error(
+                        {
+                            "url": api.url + "/objects/host_config/" + term,
+                            "code": 404,
+                            "msg": HTTP_ERROR_CODES[404],
+                        }
+                    )
+                ret.append(hosts[term])
+            return ret
 
-            response = json.loads(api.get("/objects/host_config/" + term, parameters))
+        responses = api.get_json_all(
+            ["/objects/host_config/" + term for term in terms],
+            parameters,
+            max_concurrency=self.get_option("max_concurrency"),
+        )
 
+        for response in responses:
             if "code" in response:
-                raise AnsibleError(
-                    "Received error for %s - %s: %s"
-                    % (
-                        response.get("url", ""),
-                        response.get("code", ""),
-                        response.get("msg", ""),
-                    )
-                )
+                self._raise_for_error(response)
             ret.append(response.get("extensions"))
 
         return ret
+
+    def _request_hosts(self, api, terms, parameters):
+        """Fetch the hosts of terms with collection requests instead of one
+        request per host. Returns the extensions of the hosts found, by name.
+
+        If the site filters the collection by host names, the names are sent
+        in chunks, with up to max_concurrency requests at the same time.
+        Otherwise all hosts are fetched, and the requested ones are picked
+        while the response is streamed.
+        """
+        names = list(dict.fromkeys(terms))
+
+        if self._supports_hostnames_filter(api):
+            chunks = [
+                dict(parameters, hostnames=names[i : i + HOSTNAMES_PER_REQUEST])
+                for i in range(0, len(names), HOSTNAMES_PER_REQUEST)
+            ]
+        else:
+            chunks = [parameters]
+
+        self._display.vvv(
+            "Fetching %d hosts with %d collection request(s)"
+            % (len(names), len(chunks))
+        )
+
+        wanted = set(names)
+        hosts = {}
+        for index in map_concurrently(
+            lambda chunk: self._index_hosts(api, chunk, wanted),
+            chunks,
+            self.get_option("max_concurrency"),
+        ):
+            hosts.update(index)
+        return hosts
+
+    def _index_hosts(self, api, parameters, wanted):
+        """Request the host collection and index the wanted hosts by name"""
+        stream = api.get_collection(HOST_COLLECTION, parameters)
+        hosts = {
+            host["id"]: host.get("extensions")
+            for host in stream
+            if host.get("id") in wanted
+        }
+        if stream.error:
+            self._raise_for_error(stream.error)
+        return hosts
+
+    def _supports_hostnames_filter(self, api):
+        response = api.get_json("/version")
+        if "code" in response:
+            # Fall back to fetching all hosts, which needs no version
+            return False
+        version = CheckmkVersion(response.get("versions", {}).get("checkmk", ""))
+        return version.isvalid() and version >= HOSTNAMES_FILTER_MIN_VERSION
+
+    def _raise_for_error(self, error):
+        raise AnsibleError(
+            "Received error for %s - %s: %s"
+            % (
+                error.get("url", ""),
+                error.get("code", ""),
+                error.get("msg", ""),
+            )
+        )
@@ -103,8 +103,6 @@ RETURN = """
     elements: dict
 """
 
-import json
-
 from ansible.errors import AnsibleError
 from ansible.plugins.lookup import LookupBase
 from ansible_collections.checkmk.general.plugins.module_utils.lookup_api import (
@@ -133,6 +131,11 @@ class LookupModule(LookupBase):
             api_user=api_user,
             api_secret=api_secret,
             validate_certs=validate_certs,
+            cache_ttl=self.get_option("cache_ttl"),
+            cache_size=self.get_option("cache_size"),
+            cache_ttl_by_endpoint=self.get_option("cache_ttl_by_endpoint"),
+            persistent_cache=self.get_option("persistent_cache"),
+            display=self._display,
         )
 
         ret = []
@@ -140,18 +143,20 @@ class LookupModule(LookupBase):
             "effective_attributes": effective_attributes,
         }
 
-        response = json.loads(
-            api.get("/domain-types/host_config/collections/all", parameters)
+        # Stream the hosts instead of holding the whole response as text
+        stream = api.get_collection(
+            "/domain-types/host_config/collections/all", parameters
         )
-        if "code" in response:
+        hosts = list(stream)
+        if stream.error:
             raise AnsibleError(
                 "Received error for %s - %s: %s"
                 % (
-                    response.get("url", ""),
-                    response.get("code", ""),
-                    response.get("msg", ""),
+                    stream.error.get("url", ""),
+                    stream.error.get("code", ""),
+                    stream.error.get("msg", ""),
                 )
             )
-        ret.append(response.get("value"))
+        ret.append(hosts)
 
         return ret
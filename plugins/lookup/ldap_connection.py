@@ -21,7 +21,9 @@ DOCUMENTATION = """
         description: ldap connection ID
         required: True
 
-    extends_documentation_fragment: [checkmk.general.common_lookup]
+    extends_documentation_fragment:
+      - checkmk.general.common_lookup
+      - checkmk.general.common_lookup.concurrency
 
     notes:
       - Like all lookups, this runs on the Ansible controller and is unaffected by other keywords such as 'become'.
@@ -82,7 +84,7 @@ RETURN = """
     elements: dict
 """
 
-import json
+import copy
 
 from ansible.errors import AnsibleError
 from ansible.plugins.lookup import LookupBase
@@ -114,13 +116,21 @@ class LookupModule(LookupBase):
             api_user=api_user,
             api_secret=api_secret,
             validate_certs=validate_certs,
+            cache_ttl=self.get_option("cache_ttl"),
+            cache_size=self.get_option("cache_size"),
+            cache_ttl_by_endpoint=self.get_option("cache_ttl_by_endpoint"),
+            persistent_cache=self.get_option("persistent_cache"),
+            display=self._display,
         )
 
         ret = []
 
-        for term in terms:
-            response = json.loads(api.get("/objects/ldap_connection/" + term))
+        responses = api.get_json_all(
+            ["/objects/ldap_connection/" + term for term in terms],
+            max_concurrency=self.get_option("max_concurrency"),
+        )
 
+        for response in responses:
             if "code" in response:
                 raise AnsibleError(
                     "Received error for %s - %s: %s"
@@ -131,7 +141,9 @@ class LookupModule(LookupBase):
                     )
                 )
 
-            ret.append(compress_recursive(response.get("extensions", {})))
+            # compress_recursive() changes the response, which may be cached
+            extensions = copy.deepcopy(response.get("extensions", {}))
+            ret.append(compress_recursive(extensions))
 
         # return log
         return ret
@@ -86,8 +86,6 @@ RETURN = """
     elements: dict
 """
 
-import json
-
 from ansible.errors import AnsibleError
 from ansible.plugins.lookup import LookupBase
 from ansible_collections.checkmk.general.plugins.module_utils.lookup_api import (
@@ -116,9 +114,14 @@ class LookupModule(LookupBase):
             api_user=api_user,
             api_secret=api_secret,
             validate_certs=validate_certs,
+            cache_ttl=self.get_option("cache_ttl"),
+            cache_size=self.get_option("cache_size"),
+            cache_ttl_by_endpoint=self.get_option("cache_ttl_by_endpoint"),
+            persistent_cache=self.get_option("persistent_cache"),
+            display=self._display,
         )
 
-        response = json.loads(api.get("/objects/rule/" + rule_id))
+        response = api.get_json("/objects/rule/" + rule_id)
 
         if "code" in response:
             raise AnsibleError(
@@ -143,7 +143,6 @@ RETURN = """
     elements: dict
 """
 
-import json
 import re
 
 from ansible.errors import AnsibleError
@@ -178,61 +177,53 @@ class LookupModule(LookupBase):
             api_user=api_user,
             api_secret=api_secret,
             validate_certs=validate_certs,
+            cache_ttl=self.get_option("cache_ttl"),
+            cache_size=self.get_option("cache_size"),
+            cache_ttl_by_endpoint=self.get_option("cache_ttl_by_endpoint"),
+            persistent_cache=self.get_option("persistent_cache"),
+            display=self._display,
         )
 
         parameters = {
             "ruleset_name": ruleset,
         }
 
-        response = json.loads(api.get("/domain-types/rule/collections/all", parameters))
+        patterns = []
+        for what, regex in regex_params.items():
+            if regex:
+                try:
+                    patterns.append((what, re.compile(regex)))
+                except re.error as e:
+                    raise AnsibleError(
+                        "Invalid regex for %s, pattern: %s, position: %s error: %s"
+                        % (what, e.pattern, e.pos, e.msg)
+                    )
+
+        def _rule_attribute(rule, what):
+            if what == "folder":
+                return rule.get("extensions", {}).get("folder", "")
+            return rule.get("extensions", {}).get("properties", {}).get(what, "")
+
+        # Filter the rules while they are streamed, so only the matching
+        # ones are kept in memory.
+        stream = api.get_collection("/domain-types/rule/collections/all", parameters)
+        rule_list = [
+            rule
+            for rule in stream
+            if all(
+                pattern.search(_rule_attribute(rule, what))
+                for what, pattern in patterns
+            )
+        ]
 
-        if "code" in response:
+        if stream.error:
             raise AnsibleError(
                 "Received error for %s - %s: %s"
                 % (
-                    response.get("url", ""),
-                    response.get("code", ""),
-                    response.get("msg", ""),
+                    stream.error.get("url", ""),
+                    stream.error.get("code", ""),
+                    stream.error.get("msg", ""),
                 )
             )
 
-        rule_list = response.get("value")
-
-        log = []
-
-        log.append("PARAMS: %s" % str(regex_params))
-        for what, regex in regex_params.items():
-            try:
-                if regex:
-                    log.append("ITEMS: %s" % str((what, regex)))
-
-                    def _rule_attribute(rule, what, regex):
-                        if what == "folder":
-                            log.append(
-                                "Folder: %s regex: %s"
-                                % (rule.get("extensions", {}).get("folder", ""), regex)
-                            )
-                            return rule.get("extensions", {}).get("folder", "")
-                        return (
-                            rule.get("extensions", {})
-                            .get("properties", {})
-                            .get(what, "")
-                        )
-
-                    rule_list = [
-                        r
-                        for r in rule_list
-                        if re.search(
-                            regex,
-                            _rule_attribute(r, what, regex),
-                        )
-                    ]
-
-            except re.error as e:
-                raise AnsibleError(
-                    "Invalid regex for %s, pattern: %s, position: %s error: %s"
-                    % (what, e.pattern, e.pos, e.msg)
-                )
-
-        # return [log]
         return [rule_list]
@@ -13,16 +13,41 @@ __metaclass__ = type
 import base64
 import json
 
+from ansible.module_utils.connection import Connection, ConnectionError
 from ansible.module_utils.urls import fetch_url
+from ansible_collections.checkmk.general.plugins.module_utils.cache import (
+    FileCache,
+    invalidate_lookup_cache,
+)
+from ansible_collections.checkmk.general.plugins.module_utils.connection_pool import (
+    ConnectionPool,
+    PooledResponse,
+)
 from ansible_collections.checkmk.general.plugins.module_utils.types import RESULT
 from ansible_collections.checkmk.general.plugins.module_utils.utils import (  # result_as_dict,
     GENERIC_HTTP_CODES,
+    check_connection_params,
     exit_module,
+    uses_connection_plugin,
 )
 from ansible_collections.checkmk.general.plugins.module_utils.version import (
     CheckmkVersion,
 )
 
+# One pool per module run, shared by all CheckmkAPI objects of that run.
+_CONNECTION_POOL = None
+
+
+def get_connection_pool(module):
+    global _CONNECTION_POOL
+    if _CONNECTION_POOL is None:
+        _CONNECTION_POOL = ConnectionPool(
+            validate_certs=module.params.get("validate_certs", True),
+            client_cert=module.params.get("client_cert"),
+            client_key=module.params.get("client_key"),
+        )
+    return _CONNECTION_POOL
+
 
 class CheckmkAPI:
     """Base class to contact a Checkmk server"""
@@ -34,12 +59,31 @@ class CheckmkAPI:
         server = self.params.get("server_url")
         site = self.params.get("site")
         self.url = "%s/%s/check_mk/api/1.0" % (server, site)
+        self.connection_pool = get_connection_pool(self.module)
 
         self.headers = {
             "Accept": "application/json",
             "Content-Type": "application/json",
         }
 
+        # With the httpapi connection plugin, the connection handles the
+        # authentication and the location of the site.
+        self.connection = None
+        if uses_connection_plugin(self.module):
+            self.connection = Connection(self.module._socket_path)
+        else:
+            check_connection_params(self.module)
+            self._set_authentication()
+
+        self.current = {}
+        self.required = {}
+        # may be "present", "absent" or an individual one
+        self.state = ""
+        self.version = None
+        # Whether a failed request ends the module, see _fetch()
+        self.fail_on_error = True
+
+    def _set_authentication(self):
         # Determine authentication type
         api_auth_type = self.params.get("api_auth_type", "bearer")
         api_user = self.params.get("api_user")
@@ -78,12 +122,6 @@ class CheckmkAPI:
         else:
             self.module.fail_json(msg="Unsupported `api_auth_type`: %s" % api_auth_type)
 
-        self.current = {}
-        self.required = {}
-        # may be "present", "absent" or an individual one
-        self.state = ""
-        self.version = None
-
     def _fetch(
         self,
         code_mapping="",
@@ -91,7 +129,7 @@ class CheckmkAPI:
         data=None,
         method="GET",
         logger=None,
-        fail_on_error=True,
+        fail_on_error=None,
     ):
         if not logger:
             logger = self.logger
@@ -122,16 +160,33 @@ class CheckmkAPI:
 
         num_of_retries = 1
         timeout = 60
+        url = "%s/%s" % (self.url, endpoint)
         for i in range(num_of_retries):
-            response, info = fetch_url(
-                module=self.module,
-                url="%s/%s" % (self.url, endpoint),
-                data=None if not data else self.module.jsonify(data),
-                headers=self.headers,
-                method=method,
-                use_proxy=None,
-                timeout=timeout,
-            )
+            if self.connection:
+                response, info = self._request_via_connection(
+                    endpoint=endpoint,
+                    data=None if not data else self.module.jsonify(data),
+                    method=method,
+                )
+            elif ConnectionPool.uses_proxy(url):
+                response, info = fetch_url(
+                    module=self.module,
+                    url=url,
+                    data=None if not data else self.module.jsonify(data),
+                    headers=self.headers,
+                    method=method,
+                    use_proxy=None,
+                    timeout=timeout,
+                )
+            else:
+                # Reuse the keep-alive connection of previous calls.
+                response, info = self.connection_pool.request(
+                    url=url,
+                    data=None if not data else self.module.jsonify(data),
+                    headers=self.headers,
+                    method=method,
+                    timeout=timeout,
+                )
 
             http_code = info["status"]
 
@@ -161,8 +216,19 @@ class CheckmkAPI:
             changed=changed,
         )
 
+        if (
+            method != "GET"
+            and not failed
+            and self.params.get("invalidate_lookup_cache")
+        ):
+            # Later lookups must not answer from responses before this change
+            invalidate_lookup_cache()
+
         # With fail_on_error=False, the caller handles the failed result,
         # e.g. to enrich the error message with context about partial changes.
+        # Without it, the fail_on_error attribute of the API decides.
+        if fail_on_error is None:
+            fail_on_error = self.fail_on_error
         if failed and fail_on_error:
             exit_module(
                 self.module,
@@ -173,12 +239,64 @@ class CheckmkAPI:
             # self.module.fail_json(**result_as_dict(result))
         if logger:
             logger.debug("_fetch(): result: %s" % str(result))
+            logger.debug("_fetch(): connection pool: %s" % self.connection_pool.stats())
         return result
 
+    def _request_via_connection(self, endpoint="", data=None, method="GET"):
+        """Send a request through the httpapi connection plugin.
+
+        Returns (response, info) like fetch_url() does."""
+        info = {"url": endpoint, "status": -1}
+        try:
+            status, headers, body = self.connection.send_request(
+                data=data,
+                path="/%s" % endpoint,
+                method=method,
+                headers=self.headers,
+            )
+        except ConnectionError as e:
+            info["msg"] = "Connection failure: %s" % str(e)
+            return None, info
+
+        info.update(headers)
+        info["status"] = status
+        if status >= 400:
+            info["body"] = body
+            return PooledResponse(""), info
+
+        return PooledResponse(body), info
+
     def getversion(self):
         if self.version:
             return self.version
 
+        if self.connection:
+            # The connection plugin probes the version only once per connection.
+            try:
+                self.version = CheckmkVersion(self.connection.get_checkmk_version())
+            except ConnectionError as e:
+                exit_module(self.module, msg=str(e), failed=True, logger=self.logger)
+            return self.version
+
+        cache = None
+        stats = None
+        ttl = self.params.get("version_cache_ttl") or 0
+        cache_key = "%s|%s" % (self.params.get("server_url"), self.params.get("site"))
+        if ttl > 0 or self.params.get("invalidate_version_cache"):
+            cache = FileCache("version", ttl)
+            if self.params.get("invalidate_version_cache"):
+                cache.invalidate(cache_key)
+            else:
+                version_raw, stats = cache.get(cache_key)
+                if version_raw:
+                    self.version = CheckmkVersion(version_raw)
+                    if self.logger:
+                        self.logger.debug(
+                            "getversion(): version cache hit: %s (hits: %d, misses: %d)"
+                            % (version_raw, stats["hits"], stats["misses"])
+                        )
+                    return self.version
+
         data = {}
 
         result = self._fetch(
@@ -193,6 +311,15 @@ class CheckmkAPI:
 
         content = result.content
         checkmkinfo = json.loads(content)
-        self.version = CheckmkVersion(checkmkinfo.get("versions").get("checkmk"))
+        version_raw = checkmkinfo.get("versions").get("checkmk")
+        self.version = CheckmkVersion(version_raw)
+
+        if cache and ttl > 0:
+            stats = cache.set(cache_key, version_raw, stats)
+            if self.logger:
+                self.logger.debug(
+                    "getversion(): version cache miss: %s (hits: %d, misses: %d)"
+                    % (version_raw, stats["hits"], stats["misses"])
+                )
 
         return self.version
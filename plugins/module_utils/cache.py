@@ -0,0 +1,226 @@
+#!/usr/bin/env python
+# -*- encoding: utf-8; py-indent-offset: 4 -*-
+
+# Copyright: (c) 2026, Checkmk GmbH
+# GNU General Public License v3.0+
+# (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+# Ensure compatibility to Python2
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import hashlib
+import json
+import os
+import stat
+import tempfile
+import time
+
+try:
+    import fcntl
+
+    HAS_FCNTL = True
+except ImportError:
+    HAS_FCNTL = False
+
+
+def default_cache_dir():
+    """Per-user cache directory below the temp dir of the machine running the module"""
+    return os.path.join(tempfile.gettempdir(), "ansible-checkmk-cache-%s" % os.getuid())
+
+
+def lookup_cache_dir():
+    """Directory of the responses cached by the lookup plugins, shared by all forks"""
+    return os.path.join(default_cache_dir(), "lookup")
+
+
+def private_dir(directory):
+    """Create the directory if needed and tell whether only the current user
+    can access it. The cache directory lives in a shared temp dir, so another
+    user could have created it first, or made it readable to others."""
+    try:
+        if not os.path.isdir(directory):
+            os.makedirs(directory, 0o700)
+        status = os.lstat(directory)
+    except (IOError, OSError):
+        return False
+    return (
+        stat.S_ISDIR(status.st_mode)
+        and status.st_uid == os.getuid()
+        and not status.st_mode & 0o077
+    )
+
+
+def invalidate_lookup_cache():
+    """Drop all responses cached by the lookup plugins, e.g. after a change"""
+    FileCache("lookup", 0, directory=lookup_cache_dir()).clear()
+
+
+class FileCache:
+    """Small JSON file cache with a TTL, safe to share between forks.
+
+    Every key is stored in its own file. Writes go to a temporary file first
+    and are then renamed into place, so concurrent readers never see a
+    partially written entry.
+
+    With max_entries, the least recently used entries above that number are
+    removed on writes. Without track_stats, hits are not counted in the
+    entry, so large entries are not written again on every hit.
+    """
+
+    def __init__(
+        self, namespace, ttl, directory=None, max_entries=None, track_stats=True
+    ):
+        self.namespace = namespace
+        self.ttl = ttl
+        self.directory = directory or default_cache_dir()
+        self.max_entries = max_entries
+        self.track_stats = track_stats
+
+    def _path(self, key):
+        digest = hashlib.sha256(("%s|%s" % (self.namespace, key)).encode("utf-8"))
+        return os.path.join(self.directory, "%s.json" % digest.hexdigest())
+
+    def _read(self, key):
+        if not private_dir(self.directory):
+            return None
+        try:
+            with open(self._path(key), "r") as cache_file:
+                return json.load(cache_file)
+        except (IOError, OSError, ValueError):
+            return None
+
+    def _write(self, key, entry):
+        if not private_dir(self.directory):
+            # Never trust or feed a directory other users can write to.
+            return
+        try:
+            fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+            with os.fdopen(fd, "w") as tmp_file:
+                json.dump(entry, tmp_file)
+            os.replace(tmp_path, self._path(key))
+            if self.max_entries:
+                self._evict()
+        except (IOError, OSError):
+            # A cache that cannot be written is not an error, just a miss next time.
+            pass
+
+    def _entries(self):
+        """Paths of all entries in the directory, least recently used first"""
+        paths = [
+            os.path.join(self.directory, name)
+            for name in os.listdir(self.directory)
+            if name.endswith(".json")
+        ]
+        return sorted(paths, key=lambda path: os.stat(path).st_mtime)
+
+    def _evict(self):
+        entries = self._entries()
+        for path in entries[: max(len(entries) - self.max_entries, 0)]:
+            try:
+                os.remove(path)
+            except (IOError, OSError):
+                pass
+
+    def get(self, key):
+        """Return the cached value and its stats, or (None, stats) if there is
+        no fresh entry."""
+        entry = self._read(key)
+        if not entry:
+            return None, {"hits": 0, "misses": 0}
+
+        stats = {"hits": entry.get("hits", 0), "misses": entry.get("misses", 0)}
+        if time.time() - entry.get("timestamp", 0) > self.ttl:
+            return None, stats
+
+        stats["hits"] += 1
+        if self.track_stats:
+            entry.update(stats)
+            self._write(key, entry)
+        else:
+            self._touch(key)
+        return entry.get("value"), stats
+
+    def lookup(self, key):
+        """Return the cached value and whether it is fresh, also for expired
+        entries, e.g. to revalidate them. Returns (None, False) if there is no
+        entry. Hits are not counted."""
+        entry = self._read(key)
+        if not entry:
+            return None, False
+
+        fresh = time.time() - entry.get("timestamp", 0) <= self.ttl
+        if fresh and not self.track_stats:
+            self._touch(key)
+        return entry.get("value"), fresh
+
+    def _touch(self, key):
+        try:
+            os.utime(self._path(key), None)
+        except (IOError, OSError):
+            pass
+
+    def set(self, key, value, stats=None):
+        stats = stats or {"hits": 0, "misses": 0}
+        stats["misses"] = stats.get("misses", 0) + 1
+        entry = {"value": value, "timestamp": time.time()}
+        entry.update(stats)
+        self._write(key, entry)
+        return stats
+
+    def invalidate(self, key):
+        try:
+            os.remove(self._path(key))
+        except (IOError, OSError):
+            pass
+
+    def clear(self):
+        """Remove all entries in the directory of the cache, not only the ones
+        of its namespace. Use it for caches with a directory of their own."""
+        if not private_dir(self.directory):
+            return
+        try:
+            entries = self._entries()
+        except (IOError, OSError):
+            return
+        for path in entries:
+            try:
+                os.remove(path)
+            except (IOError, OSError):
+                pass
+
+
+class FileLock:
+    """Exclusive lock shared by all processes on the machine running the module.
+
+    Used as a context manager. Where file locks are not available, or the
+    directory is not private to the current user, it does not lock at all,
+    which is the behavior without it.
+    """
+
+    def __init__(self, namespace, key, directory=None):
+        self.directory = directory or default_cache_dir()
+        digest = hashlib.sha256(("%s|%s" % (namespace, key)).encode("utf-8"))
+        self.path = os.path.join(self.directory, "%s.lock" % digest.hexdigest())
+        self._file = None
+
+    def __enter__(self):
+        if not HAS_FCNTL or not private_dir(self.directory):
+            return self
+        try:
+            self._file = open(self.path, "a")
+            fcntl.flock(self._file, fcntl.LOCK_EX)
+        except (IOError, OSError):
+            self._close()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self._close()
+        return False
+
+    def _close(self):
+        if self._file:
+            # Closing the file releases the lock
+            self._file.close()
+            self._file = None
@@ -0,0 +1,220 @@
+#!/usr/bin/env python
+# -*- encoding: utf-8; py-indent-offset: 4 -*-
+
+# Copyright: (c) 2026, Checkmk GmbH
+# GNU General Public License v3.0+
+# (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+# Ensure compatibility to Python2
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import gzip
+import socket
+import threading
+
+from ansible.module_utils.common.text.converters import to_bytes, to_native
+from ansible.module_utils.six.moves import http_client
+from ansible.module_utils.six.moves.urllib.parse import urljoin, urlsplit
+from ansible.module_utils.six.moves.urllib.request import getproxies, proxy_bypass
+from ansible.module_utils.urls import make_context
+
+# Errors that indicate that the server closed an idle keep-alive connection
+# before it read our request. Retrying those on a fresh connection is safe.
+STALE_CONNECTION_ERRORS = (
+    http_client.BadStatusLine,
+    http_client.CannotSendRequest,
+    BrokenPipeError,
+    ConnectionResetError,
+    ConnectionAbortedError,
+)
+
+# Redirects are followed like urllib, and thus fetch_url(), does
+REDIRECT_CODES = (301, 302, 303, 307, 308)
+MAX_REDIRECTS = 10
+
+
+class PooledResponse:
+    """Minimal file-like response, compatible with what fetch_url() returns"""
+
+    def __init__(self, body, headers=None):
+        self.body = body
+        self.headers = headers or {}
+
+    def read(self, size=-1):
+        if size is None or size < 0:
+            size = len(self.body)
+        body, self.body = self.body[:size], self.body[size:]
+        return body
+
+
+class ConnectionPool:
+    """Keeps HTTP/1.1 connections to the Checkmk server open across requests.
+
+    The pool lives for one module run. Connections are keyed by scheme, host
+    and port, so all requests to the same site share one TCP and TLS session.
+    Requests that need to go through a proxy are not handled by the pool,
+    see uses_proxy().
+    """
+
+    def __init__(self, validate_certs=True, client_cert=None, client_key=None):
+        self.validate_certs = validate_certs
+        self.client_cert = client_cert
+        self.client_key = client_key
+        self._ssl_context = None
+        self._idle = {}
+        # Modules may send requests from several threads
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.connections = 0
+        self.reused = 0
+
+    def _context(self):
+        if self._ssl_context is None:
+            self._ssl_context = make_context(
+                validate_certs=self.validate_certs,
+                client_cert=self.client_cert,
+                client_key=self.client_key,
+            )
+        return self._ssl_context
+
+    def _new_connection(self, scheme, host, port, timeout):
+        self.connections += 1
+        if scheme == "https":
+            return http_client.HTTPSConnection(
+                host, port=port, timeout=timeout, context=self._context()
+            )
+        return http_client.HTTPConnection(host, port=port, timeout=timeout)
+
+    def _acquire(self, key, timeout):
+        with self._lock:
+            idle = self._idle.get(key)
+            conn = idle.pop() if idle else None
+        if conn:
+            conn.timeout = timeout
+            if conn.sock:
+                conn.sock.settimeout(timeout)
+            self.reused += 1
+            return conn, True
+        return self._new_connection(key[0], key[1], key[2], timeout), False
+
+    def _release(self, key, conn, response):
+        if response.will_close:
+            conn.close()
+        else:
+            with self._lock:
+                self._idle.setdefault(key, []).append(conn)
+
+    @staticmethod
+    def uses_proxy(url):
+        parts = urlsplit(url)
+        return parts.scheme in getproxies() and not proxy_bypass(parts.hostname)
+
+    def stats(self):
+        return "%d requests, %d connections opened, %d reused" % (
+            self.requests,
+            self.connections,
+            self.reused,
+        )
+
+    def close(self):
+        for connections in self._idle.values():
+            for conn in connections:
+                conn.close()
+        self._idle = {}
+
+    def request(self, url, data=None, headers=None, method="GET", timeout=60):
+        """Send a request and return (response, info) like fetch_url() does.
+
+        Redirects are followed up to MAX_REDIRECTS times. Like urllib, a
+        301, 302 or 303 after a POST is followed with a GET without body,
+        307 and 308 are followed with the same method and body.
+        """
+        request_headers = {
+            "User-Agent": "ansible-httpget",
+            "Accept-Encoding": "gzip",
+        }
+        request_headers.update(headers or {})
+        body = to_bytes(data) if data is not None else None
+
+        for _redirect in range(MAX_REDIRECTS + 1):
+            response, content, info = self._send(
+                url, body, request_headers, method, timeout
+            )
+            if response is None:
+                return None, info
+            location = info.get("location")
+            if response.status not in REDIRECT_CODES or not location:
+                break
+
+            url = urljoin(url, location)
+            if response.status in (301, 302, 303) and method not in ("GET", "HEAD"):
+                method = "GET"
+                body = None
+                request_headers = {
+                    k: v
+                    for k, v in request_headers.items()
+                    if k.lower() not in ("content-type", "content-length")
+                }
+        else:
+            info.update(
+                msg="HTTP Error %d: Too many redirects, the last to %s"
+                % (response.status, url)
+            )
+            return PooledResponse(b""), info
+
+        if response.status >= 400:
+            # Same as fetch_url(): the error body is only available in the info.
+            info.update(msg="HTTP Error %d: %s" % (response.status, response.reason))
+            info["body"] = content
+            return PooledResponse(b""), info
+
+        info["msg"] = "OK (%d bytes)" % len(content)
+        return PooledResponse(content, response.msg), info
+
+    def _send(self, url, body, request_headers, method, timeout):
+        """Send one request, without following redirects.
+
+        Returns the response, its content and the info, or (None, None, info)
+        if the request failed.
+        """
+        parts = urlsplit(url)
+        key = (parts.scheme, parts.hostname, parts.port)
+        path = parts.path or "/"
+        if parts.query:
+            path = "%s?%s" % (path, parts.query)
+
+        info = {"url": url, "status": -1}
+        self.requests += 1
+        conn = None
+        try:
+            conn, reused = self._acquire(key, timeout)
+            try:
+                conn.request(method, path, body=body, headers=request_headers)
+                response = conn.getresponse()
+            except STALE_CONNECTION_ERRORS:
+                conn.close()
+                if not reused:
+                    raise
+                conn = self._new_connection(key[0], key[1], key[2], timeout)
+                conn.request(method, path, body=body, headers=request_headers)
+                response = conn.getresponse()
+
+            content = response.read()
+            if response.getheader("Content-Encoding", "").lower() == "gzip":
+                content = gzip.decompress(content)
+            self._release(key, conn, response)
+        except socket.timeout as e:
+            conn.close()
+            info.update(msg="Request failed: %s" % to_native(e), status=-1)
+            return None, None, info
+        except Exception as e:
+            if conn:
+                conn.close()
+            info.update(msg="Connection failure: %s" % to_native(e), status=-1)
+            return None, None, info
+
+        info.update({k.lower(): v for k, v in response.getheaders()})
+        info["status"] = response.status
+        return response, content, info
@@ -8,6 +8,15 @@ from __future__ import absolute_import, division, print_function
 
 __metaclass__ = type
 
+import copy
+import json
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from ansible_collections.checkmk.general.plugins.module_utils.types import (
+    generate_result,
+)
 from ansible_collections.checkmk.general.plugins.module_utils.version import (
     CheckmkVersion,
 )
@@ -60,8 +69,67 @@ SUPPORTED_VERSIONS = {
     "max": "2.5.0",
 }
 
+POLL_INTERVAL_MIN = 0.5
+POLL_INTERVAL_MAX = 15.0
+
+SHARD_SIZE = 0
+MAX_CONCURRENT_JOBS = 2
+SHARD_RETRIES = 1
+
+_JOB_ACTIVE = re.compile(r'"active"\s*:\s*(true|false)')
+# Progress lines of bulk discovery jobs on the outcome for a host, e.g.
+# "myhost: discovery successful" or "myhost: discovery failed: <error>".
+# Some versions prefix them with the number of the host, e.g. "[3/10] ".
+_HOST_PROGRESS = re.compile(
+    r"^(?:\[\d+/\d+\]\s+)?(\S+?):\s*(discovery\s+(\w+).*)$", re.IGNORECASE
+)
+
+
+def job_active(content):
+    """Whether a background job is still active.
+
+    Only the "active" flag is searched for while the job is running, the
+    possibly long log of the job in the same response is not decoded.
+    """
+    if isinstance(content, bytes):
+        content = content.decode("utf-8")
+    match = _JOB_ACTIVE.search(content)
+    if match:
+        return match.group(1) == "true"
+    return bool(json.loads(content).get("extensions", {}).get("active"))
+
+
+def job_progress(content):
+    """Summary of the status and the log of a bulk discovery job"""
+    status = json.loads(content).get("extensions", {}).get("status", {})
+    log_info = status.get("log_info", {})
+
+    hosts = {}
+    failed_hosts = {}
+    for line in log_info.get("JobProgressUpdate") or []:
+        match = _HOST_PROGRESS.match(line)
+        if match:
+            hosts[match.group(1)] = match.group(2)
+            if match.group(3).lower() == "failed":
+                failed_hosts[match.group(1)] = match.group(2)
+
+    return {
+        "job_state": status.get("state"),
+        "hosts_processed": len(hosts),
+        "failed_hosts": failed_hosts,
+        "job_result": (log_info.get("JobResult") or [])
+        + (log_info.get("JobException") or []),
+    }
+
+
+def new_progress():
+    return {"polls": 0, "elapsed": 0.0, "hosts_processed": 0}
+
 
 class Discovery:
+    # Whether several bulk discovery jobs may run at the same time
+    parallel_bulk_jobs = False
+
     def __init__(self, module, logger):
         self.module = module
         self.logger = logger
@@ -72,6 +140,22 @@ class Discovery:
         self.bulk_mode = not self.single_mode
         self.supported_versions = SUPPORTED_VERSIONS
 
+        self.poll_interval_min = max(
+            module.params.get("poll_interval_min") or POLL_INTERVAL_MIN, 0.1
+        )
+        self.poll_interval_max = max(
+            module.params.get("poll_interval_max") or POLL_INTERVAL_MAX,
+            self.poll_interval_min,
+        )
+        # Reported in the module result
+        self.progress = new_progress()
+
+        self.shard_size = module.params.get("shard_size", SHARD_SIZE)
+        self.max_concurrent_jobs = max(
+            module.params.get("max_concurrent_jobs") or MAX_CONCURRENT_JOBS, 1
+        )
+        self.shard_retries = max(module.params.get("shard_retries") or 0, 0)
+
     def _single_mode(self):
         return not (
             "hosts" in self.module.params
@@ -88,5 +172,174 @@ class Discovery:
     def compatible(self, version):
         return self._min_version() <= version <= self._max_version()
 
+    def _poll(self, what, poll):
+        """Call poll() until the job is done, or until the timeout is reached.
+
+        poll() returns a tuple (result, done). The delay between two polls
+        starts at poll_interval_min and doubles up to poll_interval_max, so
+        short jobs are noticed quickly and long ones are not polled more
+        often than needed.
+        """
+        start = time.time()
+        delay = self.poll_interval_min
+
+        while True:
+            result, done = poll()
+            self.progress["polls"] += 1
+            elapsed = time.time() - start
+
+            if done:
+                break
+
+            if self.timeout > 0:
+                if elapsed > self.timeout:
+                    result = generate_result(
+                        msg="Timeout reached while waiting for %s discovery" % what
+                    )
+                    break
+                delay = min(delay, self.timeout - elapsed + 0.1)
+
+            self.logger.debug(
+                "Waiting %.1fs for %s discovery, %.1fs elapsed" % (delay, what, elapsed)
+            )
+            time.sleep(delay)
+            delay = min(delay * 2, self.poll_interval_max)
+
+        self.progress["elapsed"] = round(self.progress["elapsed"] + elapsed, 3)
+        return result
+
+    def _job_done(self, what, result):
+        """Whether a discovery job is done, recording its progress if so"""
+        if result.failed:
+            # Only returned to shards, which handle the failure themselves
+            return True
+        if job_active(result.content):
+            return False
+        if what == "current":
+            self.progress.update(job_progress(result.content))
+        return True
+
+    def report(self, result):
+        """The progress of the discovery, for the module result"""
+        if self.single_mode:
+            self.progress["hosts_processed"] = 0 if result.failed else 1
+        return self.progress
+
     def start_discovery(self):
         raise NotImplementedError
+
+    def sharded(self):
+        """Whether the hosts are discovered in several bulk jobs"""
+        return bool(
+            self.bulk_mode
+            and self.wait_for_completion
+            and 0 < (self.shard_size or 0) < len(self.module.params.get("hosts"))
+        )
+
+    def _shard(self, hosts):
+        """A copy of this discovery for some of the hosts, with its own progress.
+
+        Failed requests of a shard do not end the module, as shards run in
+        worker threads. They fail the shard, which is retried then.
+        """
+        shard = copy.copy(self)
+        shard.discovery_api = copy.copy(self.discovery_api)
+        shard.discovery_api.params = dict(self.discovery_api.params, hosts=hosts)
+        shard.discovery_api.fail_on_error = False
+        shard.service_completion_api = copy.copy(self.service_completion_api)
+        shard.service_completion_api.fail_on_error = False
+        shard.progress = new_progress()
+        return shard
+
+    def _discover_shard(self, hosts):
+        shard = self._shard(hosts)
+        try:
+            result = shard.start_discovery()
+        except Exception as e:
+            result = generate_result(msg="Discovery of the shard failed: %s" % e)
+        return result, shard.progress
+
+    def start_sharded_discovery(self):
+        """Discover the hosts in shards of shard_size hosts, one bulk job each.
+
+        Up to max_concurrent_jobs jobs run at the same time, if the version
+        allows it. The hosts of shards whose job did not finish, and the
+        hosts the discovery failed for, are retried in new shards, up to
+        shard_retries times. The other hosts are not discovered again.
+        """
+        start = time.time()
+        workers = self.max_concurrent_jobs if self.parallel_bulk_jobs else 1
+
+        pending = list(dict.fromkeys(self.module.params.get("hosts")))
+        succeeded = set()
+        failed_hosts = {}
+        unfinished = []
+        shards_started = 0
+        retried = 0
+
+        for attempt in range(self.shard_retries + 1):
+            if attempt:
+                retried += len(pending)
+                self.logger.debug("Retrying the discovery of %d hosts" % len(pending))
+
+            shards = [
+                pending[i : i + self.shard_size]
+                for i in range(0, len(pending), self.shard_size)
+            ]
+            pending = []
+            unfinished = []
+
+            with ThreadPoolExecutor(max_workers=min(workers, len(shards))) as executor:
+                for hosts, (result, progress) in zip(
+                    shards, executor.map(self._discover_shard, shards)
+                ):
+                    shards_started += 1
+                    self.progress["polls"] += progress["polls"]
+
+                    if result.failed or progress.get("job_state") != "finished":
+                        # The job did not finish, all of its hosts are retried
+                        msg = (
+                            result.msg
+                            if result.failed
+                            else (
+                                "The discovery job ended in state %s"
+                                % progress.get("job_state")
+                            )
+                        )
+                        for host in hosts:
+                            failed_hosts[host] = msg
+                        pending.extend(hosts)
+                        unfinished.extend(hosts)
+                        continue
+
+                    for host in hosts:
+                        if host in progress["failed_hosts"]:
+                            failed_hosts[host] = progress["failed_hosts"][host]
+                            pending.append(host)
+                        else:
+                            failed_hosts.pop(host, None)
+                            succeeded.add(host)
+
+            if not pending:
+                break
+
+        self.progress.update(
+            elapsed=round(time.time() - start, 3),
+            hosts_processed=len(succeeded) + len(failed_hosts),
+            failed_hosts=failed_hosts,
+            shards=shards_started,
+            retried_hosts=retried,
+        )
+
+        return generate_result(
+            msg="Discovered %d hosts in %d shards, %d succeeded, %d failed."
+            % (
+                len(succeeded) + len(failed_hosts),
+                shards_started,
+                len(succeeded),
+                len(failed_hosts),
+            ),
+            http_code=200,
+            failed=bool(unfinished),
+            changed=bool(succeeded),
+        )
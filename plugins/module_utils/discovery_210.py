@@ -12,9 +12,6 @@ from __future__ import absolute_import, division, print_function
 
 __metaclass__ = type
 
-import json
-import time
-
 from ansible_collections.checkmk.general.plugins.module_utils.api import CheckmkAPI
 from ansible_collections.checkmk.general.plugins.module_utils.discovery import (
     HTTP_CODES,
@@ -138,28 +135,12 @@ class Discovery210(Discovery):
         return self.completion_bulk
 
     def _wait_for_completion(self, what):
-        now = time.time()
-        if self.timeout > 0:
-            deadline = now + self.timeout
-        else:
-            deadline = 0  # In case of infinite timeout
-
-        while True:
-            now = time.time()
-            if self.timeout > 0 and now > deadline:
-                return generate_result(
-                    msg="Timeout reached while waiting for %s discovery" % what
-                )
-
+        def poll():
             result = self.service_completion_api.get()
-
             # The completion api shows the state of the job
-            if not json.loads(result.content).get("extensions").get("active"):
-                break
+            return result, self._job_done(what, result)
 
-            time.sleep(3)
-
-        return result
+        return self._poll(what, poll)
 
     def start_discovery(self):
         if self.wait_for_previous:
@@ -13,7 +13,6 @@ from __future__ import absolute_import, division, print_function
 __metaclass__ = type
 
 import json
-import time
 
 from ansible_collections.checkmk.general.plugins.module_utils.api import CheckmkAPI
 from ansible_collections.checkmk.general.plugins.module_utils.discovery import (
@@ -168,6 +167,8 @@ class ServiceCompletionBulkAPI(CheckmkAPI):
 
 
 class Discovery250(Discovery):
+    parallel_bulk_jobs = True
+
     def __init__(self, module, logger):
         super().__init__(module, logger)
 
@@ -194,13 +195,6 @@ class Discovery250(Discovery):
         return self.completion_bulk
 
     def _wait_for_completion(self, what, job_id=None):
-        now = time.time()
-
-        if self.timeout > 0:
-            deadline = now + self.timeout
-        else:
-            deadline = 0  # In case of infinite timeout
-
         if self.bulk_mode and not job_id:
             return generate_result(
                 msg=(
@@ -211,28 +205,17 @@ class Discovery250(Discovery):
                 changed=True,
             )
 
-        while True:
-            now = time.time()
-            if self.timeout > 0 and now > deadline:
-                return generate_result(
-                    msg="Timeout reached while waiting for %s discovery" % what
-                )
-
+        def poll():
             if self.single_mode:
                 result = self.service_completion_api.get()
                 # For single mode, there's a forwarding, but _fetch_url() doesn't support that.
-                if result.http_code != 302:
-                    break
-
-            else:
-                # For bulk mode, the completion api shows the state of the job
-                result = self.service_completion_api.get(job_id)
-                if not json.loads(result.content).get("extensions").get("active"):
-                    break
+                return result, result.http_code != 302
 
-            time.sleep(3)
+            # For bulk mode, the completion api shows the state of the job
+            result = self.service_completion_api.get(job_id)
+            return result, self._job_done(what, result)
 
-        return result
+        return self._poll(what, poll)
 
     def start_discovery(self):
         if self.wait_for_previous and self.single_mode:
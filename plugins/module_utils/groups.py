@@ -0,0 +1,64 @@
+#!/usr/bin/env python
+# -*- encoding: utf-8; py-indent-offset: 4 -*-
+
+# Copyright: (c) 2026, Checkmk GmbH
+# GNU General Public License v3.0+
+# (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+# Ensure compatibility to Python2
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+from collections import namedtuple
+
+# Shared by the host_group, service_group and contact_group modules.
+
+GROUP_CHANGES = namedtuple("GroupChanges", "create update delete")
+
+
+def parse_group_collection(body, domain_type):
+    """Returns a dict of name: title of all groups in a collection response.
+
+    The response from 2.2.0 onwards is different from the one of 2.0.0 and 2.1.0,
+    which only contains the name as part of the href.
+    """
+    current_groups = {}
+    for el in body.get("value", []):
+        if el.get("domainType") == domain_type:  # 2.2.0
+            name = el.get("id")
+        else:  # 2.0.0 and 2.1.0
+            name = el.get("href").rsplit("/", 1)[-1]
+        current_groups[name] = el.get("title", el.get("name"))
+    return current_groups
+
+
+def reconcile_groups(desired_groups, current_groups, state):
+    """Compares the desired groups with the current ones in a single pass.
+
+    desired_groups is the list of group dicts with 'name' and optional 'title',
+    current_groups the dict returned by parse_group_collection().
+    Returns the groups to create, update and delete, in the order of
+    desired_groups. Raises ValueError for duplicate names.
+    """
+    create = []
+    update = []
+    delete = []
+    seen = set()
+
+    for el in desired_groups:
+        name = el.get("name")
+        if name in seen:
+            raise ValueError("two or more entries with the same name!")
+        seen.add(name)
+
+        if name not in current_groups:
+            if state == "present":
+                create.append(el)
+        elif state == "absent":
+            delete.append(el)
+        elif el.get("title", name) != current_groups[name]:
+            # The title defaults to the name, just like on creation
+            update.append(el)
+
+    return GROUP_CHANGES(create=create, update=update, delete=delete)
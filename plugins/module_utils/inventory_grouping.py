@@ -0,0 +1,158 @@
+#!/usr/bin/env python
+# -*- encoding: utf-8; py-indent-offset: 4 -*-
+
+# Copyright: (c) 2026, Checkmk GmbH
+# GNU General Public License v3.0+
+# (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+# Ensure compatibility to Python2
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import re
+
+# Used by the checkmk inventory plugin.
+
+_BAD_CHARS = re.compile(r"[^A-Za-z0-9\_]")
+
+# Number of distinct tag combinations whose group memberships are kept
+MAX_MEMOIZED_MEMBERSHIPS = 10000
+
+
+def convertname(name):
+    """Removes empty space and changes bad chars to _"""
+    return _BAD_CHARS.sub("_", name.replace(" ", ""))
+
+
+def split_full_tags(full_tags):
+    """Split full tag strings of the form tag_<group>_<value> into a list of
+    (tag group, {value: full tag}) pairs.
+
+    As both the group and the value may contain underscores, every possible
+    split is kept. Looking up all of them in a host's tags is equivalent to
+    building the full tag string for every tag of the host and comparing it,
+    but only costs one lookup per pair instead of one string per host tag.
+    """
+    candidates = {}
+    for full_tag in full_tags:
+        for index, char in enumerate(full_tag):
+            if char != "_":
+                continue
+            group, value = full_tag[:index], full_tag[index + 1 :]
+            # Only tag groups are considered, like when comparing full tags
+            if group.startswith("tag_") and value:
+                candidates.setdefault(group, {}).setdefault(value, full_tag)
+    return list(candidates.items())
+
+
+class GroupingEngine:
+    """Precompiled host filters and group memberships for the inventory plugin.
+
+    Everything that only depends on the plugin options and the tag groups
+    of the site is computed once: the excluded tags, the domain map, and
+    the normalized group names. Group names are memoized per tag value,
+    so every distinct name is normalized and allocated only once, and the
+    memberships per distinct combination of tags.
+
+    Hosts keep their tag values as a tuple in the order of ``tags``.
+    Identical tuples are shared between hosts, which keeps the memory
+    usage low for large sites, where many hosts have the same tags.
+    """
+
+    def __init__(
+        self,
+        tags,
+        groupsources=None,
+        exclude_tags=None,
+        domain_map=None,
+    ):
+        self.tags = list(tags)
+        self.groupsources = groupsources or []
+        self._excluded = split_full_tags(exclude_tags or [])
+        self._domain_map = [
+            (split_full_tags([full_tag]), suffix)
+            for full_tag, suffix in (domain_map or {}).items()
+        ]
+        self._names = {}
+        self._tag_groups = [{} for _tag in self.tags]
+        self._none_groups = [tag + "_None" for tag in self.tags]
+        self._site_groups = {}
+        self._tag_values = {}
+        self._memberships = {}
+
+    @property
+    def has_domain_map(self):
+        return bool(self._domain_map)
+
+    def convertname(self, name):
+        """Memoized version of convertname()"""
+        try:
+            return self._names[name]
+        except KeyError:
+            converted = self._names[name] = convertname(name)
+            return converted
+
+    def excluded_by(self, host_tags):
+        """Return the first excluded full tag set on the host, or None.
+
+        ``host_tags`` maps tag groups to values, like the effective
+        attributes of a host.
+        """
+        for group, values in self._excluded:
+            value = host_tags.get(group)
+            if value in values:
+                return values[value]
+        return None
+
+    def domain_suffix(self, host_tags):
+        """Return the suffix of the first domain_map entry matching a host tag,
+        or an empty string."""
+        for candidates, suffix in self._domain_map:
+            for group, values in candidates:
+                if host_tags.get(group) in values:
+                    return suffix
+        return ""
+
+    def tag_values(self, host_tags):
+        """Return the values of all tag groups as a shared tuple"""
+        values = tuple(map(host_tags.get, self.tags))
+        return self._tag_values.setdefault(values, values)
+
+    def host_groups(self, tag_values, site):
+        """Return the groups of a host, given its tag_values() and site"""
+        groups = []
+        if "hosttags" in self.groupsources:
+            groups.extend(self._tag_memberships(tag_values))
+        if "sites" in self.groupsources:
+            try:
+                groups.append(self._site_groups[site])
+            except KeyError:
+                group = self._site_groups[site] = "site_" + convertname(site)
+                groups.append(group)
+        return groups
+
+    def _tag_memberships(self, tag_values):
+        try:
+            return self._memberships[tag_values]
+        except KeyError:
+            pass
+
+        memberships = []
+        for index, value in enumerate(tag_values):
+            if value:
+                try:
+                    memberships.append(self._tag_groups[index][value])
+                except KeyError:
+                    group = self.tags[index] + "_" + convertname(value)
+                    self._tag_groups[index][value] = group
+                    memberships.append(group)
+            else:
+                memberships.append(self._none_groups[index])
+        memberships = tuple(memberships)
+
+        # Bound the memory used for sites where almost every host has
+        # different tags, the memberships are simply computed again there.
+        if len(self._memberships) < MAX_MEMOIZED_MEMBERSHIPS:
+            self._memberships[tag_values] = memberships
+        return memberships
@@ -0,0 +1,142 @@
+#!/usr/bin/env python
+# -*- encoding: utf-8; py-indent-offset: 4 -*-
+
+# Copyright: (c) 2026, Checkmk GmbH
+# GNU General Public License v3.0+
+# (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+# Ensure compatibility to Python2
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import codecs
+import json
+import re
+
+CHUNK_SIZE = 64 * 1024
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+
+
+class CollectionStream:
+    """Iterates over the entries of the ``value`` list of a collection response
+    while it is read from the server.
+
+    Only the current chunk of the response and the entry being decoded are
+    held in memory, instead of the whole body as bytes, as text and as one
+    big dict. All other members of the top level object are collected in
+    ``members``.
+
+    Errors are reported like CheckMKLookupAPI.get() reports them, as a dict
+    with ``code``, ``msg`` and ``url`` in ``error``. It is set before the
+    iteration if the request failed, or when reading or decoding fails
+    during the iteration, which then stops. Check it after consuming the
+    entries.
+    """
+
+    def __init__(self, stream, url, error=None, chunk_size=CHUNK_SIZE):
+        self.url = url
+        self.error = error
+        self.members = {}
+        self._stream = stream
+        self._chunk_size = chunk_size
+        self._decoder = json.JSONDecoder()
+        self._text_decoder = codecs.getincrementaldecoder("utf-8")()
+        self._buffer = ""
+        self._pos = 0
+        self._eof = False
+
+    def __iter__(self):
+        if self.error or self._stream is None:
+            return
+        try:
+            for entry in self._parse():
+                yield entry
+        except Exception as e:
+            self.error = {"code": 0, "msg": str(e), "url": self.url}
+        finally:
+            self._close()
+
+    def _close(self):
+        close = getattr(self._stream, "close", None)
+        if close:
+            close()
+        self._stream = None
+
+    def _parse(self):
+        self._expect("{")
+        if self._peek() == "}":
+            return
+
+        while True:
+            key = self._decode()
+            self._expect(":")
+            if key == "value" and self._peek() == "[":
+                self._pos += 1
+                if self._peek() == "]":
+                    self._pos += 1
+                else:
+                    while True:
+                        yield self._decode()
+                        if self._next_char() == "]":
+                            break
+                        self._pos -= 1
+                        self._expect(",")
+            else:
+                self.members[key] = self._decode()
+
+            if self._next_char() == "}":
+                return
+            self._pos -= 1
+            self._expect(",")
+
+    def _read(self):
+        chunk = self._stream.read(self._chunk_size)
+        if not chunk:
+            self._eof = True
+            text = self._text_decoder.decode(b"", final=True)
+        else:
+            text = self._text_decoder.decode(chunk)
+        self._buffer = self._buffer[self._pos :] + text
+        self._pos = 0
+
+    def _skip_whitespace(self):
+        while True:
+            self._pos = _WHITESPACE.match(self._buffer, self._pos).end()
+            if self._pos < len(self._buffer) or self._eof:
+                return
+            self._read()
+
+    def _peek(self):
+        self._skip_whitespace()
+        if self._pos >= len(self._buffer):
+            raise ValueError("Unexpected end of the response")
+        return self._buffer[self._pos]
+
+    def _next_char(self):
+        char = self._peek()
+        self._pos += 1
+        return char
+
+    def _expect(self, char):
+        found = self._next_char()
+        if found != char:
+            raise ValueError(
+                "Expecting '%s' but found '%s' in the response" % (char, found)
+            )
+
+    def _decode(self):
+        """Decode the next JSON value, reading more data until it is complete"""
+        self._skip_whitespace()
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buffer, self._pos)
+                # A number at the end of the buffer may continue in the next chunk
+                if end < len(self._buffer) or self._eof:
+                    self._pos = end
+                    return value
+            except ValueError:
+                if self._eof:
+                    raise
+            self._read()
@@ -9,12 +9,29 @@ from __future__ import absolute_import, division, print_function
 __metaclass__ = type
 
 import base64
+import hashlib
+import io
 import json
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 
 from ansible.module_utils.common.text.converters import to_text
 from ansible.module_utils.six.moves.urllib.error import HTTPError, URLError
 from ansible.module_utils.six.moves.urllib.parse import urlencode
 from ansible.module_utils.urls import open_url
+from ansible_collections.checkmk.general.plugins.module_utils.cache import (
+    FileCache,
+    FileLock,
+    lookup_cache_dir,
+)
+from ansible_collections.checkmk.general.plugins.module_utils.connection_pool import (
+    ConnectionPool,
+)
+from ansible_collections.checkmk.general.plugins.module_utils.json_stream import (
+    CollectionStream,
+)
 
 HTTP_ERROR_CODES = {
     400: "Bad Request: Parameter or validation failure.",
@@ -23,6 +40,81 @@ HTTP_ERROR_CODES = {
     406: "Not Acceptable: The requests accept headers can not be satisfied.",
 }
 
+# Used if a lookup does not set the size of the response cache
+DEFAULT_CACHE_SIZE = 32
+
+# Used if a lookup does not set the number of parallel requests
+DEFAULT_MAX_CONCURRENCY = 4
+
+# Same as the default of open_url()
+REQUEST_TIMEOUT = 10
+
+
+class ResponseCache:
+    """In-process LRU cache of responses, shared by all lookups of a process.
+
+    Ansible templates lazy variables again whenever they are used, so a
+    lookup in a play variable requests the same URL over and over. Entries
+    expire after the TTL the caller passes to get(), and the least recently
+    used entries are evicted above the size the caller passes to set().
+    """
+
+    def __init__(self):
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key, ttl):
+        value, fresh = self.lookup(key, ttl)
+        return value if fresh else None
+
+    def lookup(self, key, ttl):
+        """Return the cached value and whether it is fresh. Expired values are
+        returned as well, e.g. to revalidate them, and count as misses."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None, False
+            self._entries.move_to_end(key)
+            if time.monotonic() - entry[0] <= ttl:
+                self.hits += 1
+                return entry[1], True
+            self.misses += 1
+            return entry[1], False
+
+    def set(self, key, value, size=DEFAULT_CACHE_SIZE):
+        with self._lock:
+            self._entries[key] = (time.monotonic(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > max(size, 0):
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+
+RESPONSE_CACHE = ResponseCache()
+
+
+def map_concurrently(func, items, max_concurrency=DEFAULT_MAX_CONCURRENCY):
+    """Return [func(item) for item in items], with up to max_concurrency
+    calls at the same time. The first exception in the order of the items
+    is raised."""
+    workers = min(max(max_concurrency or 1, 1), len(items))
+    if workers <= 1:
+        return [func(item) for item in items]
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(func, items))
+
 
 class CheckMKLookupAPI:
     """Base class to contact a Checkmk server for ~Lookup calls"""
@@ -35,6 +127,11 @@ class CheckMKLookupAPI:
         api_user=None,
         api_secret=None,
         validate_certs=True,
+        cache_ttl=0,
+        cache_size=DEFAULT_CACHE_SIZE,
+        display=None,
+        cache_ttl_by_endpoint=None,
+        persistent_cache=False,
     ):
         self.headers = {
             "Accept": "application/json",
@@ -45,6 +142,15 @@ class CheckMKLookupAPI:
         self.site_url = site_url
         self.url = "%s/check_mk/api/1.0" % site_url
         self.validate_certs = validate_certs
+        # The response cache is off unless a TTL is set
+        self.cache_ttl = cache_ttl or 0
+        self.cache_size = DEFAULT_CACHE_SIZE if cache_size is None else cache_size
+        self.cache_ttl_by_endpoint = cache_ttl_by_endpoint or {}
+        self.persistent_cache = persistent_cache
+        self.display = display
+        # Shared by the workers of get_json_all(), so they keep their
+        # connections open across the terms instead of one per request.
+        self.connection_pool = ConnectionPool(validate_certs=validate_certs)
         # Bearer Authentication: "Bearer USERNAME PASSWORD"
         if api_auth_type == "bearer":
             if not api_user or not api_secret:
@@ -77,25 +183,202 @@ class CheckMKLookupAPI:
         else:
             raise ValueError("Unsupported `api_auth_type`: %s" % api_auth_type)
 
+    def _error(self, e, url):
+        """Return the error dict reported for an exception of _open()"""
+        if isinstance(e, HTTPError):
+            if e.code in HTTP_ERROR_CODES:
+                return {"code": e.code, "msg": HTTP_ERROR_CODES[e.code], "url": url}
+            return {"code": e.code, "msg": e.reason, "url": url}
+        return {"code": 0, "msg": str(e), "url": url}
+
+    def _open(self, url, headers):
+        """Request url through the connection pool and return the response.
+
+        Errors are raised like open_url() raises them. Requests through a
+        proxy are sent with open_url(), as the pool does not handle them.
+        """
+        if ConnectionPool.uses_proxy(url):
+            return open_url(url, headers=headers, validate_certs=self.validate_certs)
+
+        response, info = self.connection_pool.request(
+            url, headers=headers, timeout=REQUEST_TIMEOUT
+        )
+        status = info["status"]
+        if status == -1:
+            raise URLError(info["msg"])
+        if status >= 400 or status == 304:
+            reason = info["msg"].split(": ", 1)[-1]
+            raise HTTPError(url, status, reason, info, None)
+        return response
+
+    def _cache_key(self, kind, url):
+        """Key of a response in the cache, which also tells the credentials
+        apart, without keeping them in the cache"""
+        identity = self.headers.get("Authorization") or self.headers.get("Cookie")
+        return hashlib.sha256(
+            ("%s|%s|%s|%s" % (kind, url, identity, self.validate_certs)).encode("utf-8")
+        ).hexdigest()
+
+    def _ttl(self, endpoint):
+        """TTL of the responses of endpoint, from the longest matching prefix
+        in cache_ttl_by_endpoint, or cache_ttl"""
+        ttl = self.cache_ttl
+        match = ""
+        for prefix, prefix_ttl in self.cache_ttl_by_endpoint.items():
+            if endpoint.startswith(prefix) and len(prefix) > len(match):
+                match, ttl = prefix, prefix_ttl
+        return int(ttl or 0)
+
+    def _fetch(self, url, etag=""):
+        """Request url and return a cache entry of its body and ETag.
+
+        With the ETag of a cached response, the request is conditional, and
+        None is returned if the server answers 304 Not Modified.
+        """
+        headers = dict(self.headers)
+        if etag:
+            headers["If-None-Match"] = etag
+        try:
+            response = self._open(url, headers=headers)
+        except HTTPError as e:
+            if etag and e.code == 304:
+                return None
+            raise
+        response_headers = getattr(response, "headers", None)
+        return {
+            "body": to_text(response.read()),
+            "etag": (response_headers.get("ETag") if response_headers else "") or "",
+        }
+
+    def _revalidate(self, url, entry):
+        """Fetch a response again, conditional on the ETag of its expired entry.
+        Returns the entry and "revalidated" if it did not change, or the new
+        entry and "miss"."""
+        response = self._fetch(url, entry.get("etag", "") if entry else "")
+        if response is None:
+            return entry, "revalidated"
+        return response, "miss"
+
+    def _stored(self, file_cache, key):
+        """Read an entry of the persistent cache, ignoring entries in the
+        format of older versions, which kept only the body"""
+        stored, fresh = file_cache.lookup(key)
+        if not isinstance(stored, dict):
+            return None, False
+        return stored, fresh
+
+    def _cached(self, kind, endpoint, url):
+        """Return the cache entry of the response for url.
+
+        The in-process cache is asked first, then the persistent cache shared
+        by the forks. Forks missing the same entry wait for the first one to
+        fetch it, and read it from the cache then. Expired entries with an
+        ETag are revalidated with a conditional request. Exceptions are
+        passed on, so errors are never cached.
+        """
+        ttl = self._ttl(endpoint)
+        if ttl <= 0:
+            return self._fetch(url)
+
+        key = self._cache_key(kind, url)
+        entry, fresh = RESPONSE_CACHE.lookup(key, ttl)
+        source = "hit"
+        if not fresh and self.persistent_cache:
+            file_cache = FileCache(
+                "lookup",
+                ttl,
+                directory=lookup_cache_dir(),
+                max_entries=self.cache_size,
+                track_stats=False,
+            )
+            stored, fresh = self._stored(file_cache, key)
+            if not fresh:
+                with FileLock("lookup", key, directory=file_cache.directory):
+                    stored, fresh = self._stored(file_cache, key)
+                    if not fresh:
+                        stored, source = self._revalidate(url, stored or entry)
+                        # The decoded response is only kept in-process
+                        file_cache.set(
+                            key, {"body": stored["body"], "etag": stored["etag"]}
+                        )
+            if source == "hit":
+                source = "persistent hit"
+            if entry and stored.get("etag") and entry.get("etag") == stored["etag"]:
+                # Keep the decoded response of the unchanged entry
+                stored = entry
+            entry = stored
+            RESPONSE_CACHE.set(key, entry, self.cache_size)
+        elif not fresh:
+            entry, source = self._revalidate(url, entry)
+            RESPONSE_CACHE.set(key, entry, self.cache_size)
+
+        if self.display:
+            self.display.vvv(
+                "Checkmk lookup response cache %s for %s (hits: %d, misses: %d)"
+                % (source, url, RESPONSE_CACHE.hits, RESPONSE_CACHE.misses)
+            )
+        return entry
+
     def get(self, endpoint="", parameters=None):
         url = self.url + endpoint
 
         try:
             if parameters:
-                url = "%s?%s" % (url, urlencode(parameters))
+                url = "%s?%s" % (url, urlencode(parameters, doseq=True))
 
-            raw_response = open_url(
-                url, headers=self.headers, validate_certs=self.validate_certs
-            )
-            return to_text(raw_response.read())
-        except HTTPError as e:
-            if e.code in HTTP_ERROR_CODES:
-                return json.dumps(
-                    {"code": e.code, "msg": HTTP_ERROR_CODES[e.code], "url": url}
-                )
-            else:
-                return json.dumps({"code": e.code, "msg": e.reason, "url": url})
-        except URLError as e:
-            return json.dumps({"code": 0, "msg": str(e), "url": url})
+            return self._cached("get", endpoint, url)["body"]
+        except Exception as e:
+            return json.dumps(self._error(e, url))
+
+    def get_json(self, endpoint="", parameters=None):
+        """Like json.loads(get()), but the decoded response is cached along
+        with the response, so a response that did not change is not decoded
+        again. The result may be shared, do not modify it."""
+        url = self.url + endpoint
+
+        try:
+            if parameters:
+                url = "%s?%s" % (url, urlencode(parameters, doseq=True))
+
+            entry = self._cached("get", endpoint, url)
+        except Exception as e:
+            return self._error(e, url)
+
+        if "value" not in entry:
+            entry["value"] = json.loads(entry["body"])
+        return entry["value"]
+
+    def get_json_all(
+        self, endpoints, parameters=None, max_concurrency=DEFAULT_MAX_CONCURRENCY
+    ):
+        """Call get_json() for every endpoint, with up to max_concurrency
+        requests at the same time. The responses, including errors, are
+        returned in the order of the endpoints."""
+        return map_concurrently(
+            lambda endpoint: self.get_json(endpoint, parameters),
+            endpoints,
+            max_concurrency,
+        )
+
+    def get_collection(self, endpoint="", parameters=None):
+        """Request a collection and return a CollectionStream, which yields the
+        entries of its ``value`` list while the response is being read.
+
+        Use this instead of get() for large collections. Errors are reported
+        in the ``error`` attribute of the stream, in the same form as get()
+        reports them. With the response cache, the whole response is read
+        and kept in memory.
+        """
+        url = self.url + endpoint
+
+        try:
+            if parameters:
+                url = "%s?%s" % (url, urlencode(parameters, doseq=True))
+
+            if self._ttl(endpoint) <= 0:
+                return CollectionStream(self._open(url, headers=self.headers), url)
+
+            content = self._cached("collection", endpoint, url)["body"]
+            return CollectionStream(io.BytesIO(content.encode("utf-8")), url)
         except Exception as e:
-            return json.dumps({"code": 0, "msg": str(e), "url": url})
+            return CollectionStream(None, url, error=self._error(e, url))
@@ -0,0 +1,97 @@
+#!/usr/bin/env python
+# -*- encoding: utf-8; py-indent-offset: 4 -*-
+
+# Copyright: (c) 2026, Checkmk GmbH
+# GNU General Public License v3.0+
+# (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+# Ensure compatibility to Python2
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import time
+
+# Used by modules that wait for a write to become visible on the server,
+# instead of sleeping for a fixed time.
+
+DEFAULT_TIMEOUT = 30
+INITIAL_DELAY = 0.1
+MAX_DELAY = 2.0
+
+# 404 is not failed, as it tells that an object is absent.
+READINESS_HTTP_CODES = {
+    # http_code: (changed, failed, "Message")
+    200: (False, False, "Found"),
+    404: (False, False, "Not Found"),
+}
+
+
+def wait_until(
+    check,
+    timeout=DEFAULT_TIMEOUT,
+    delay=INITIAL_DELAY,
+    max_delay=MAX_DELAY,
+):
+    """Call check() until it returns True or the timeout is reached.
+
+    The delay between two calls starts at delay and doubles up to max_delay,
+    so the wait ends shortly after the server is ready, without polling it
+    in a tight loop. Returns a tuple (ready, waited), where waited is the
+    time spent in seconds.
+    """
+    start = time.monotonic()
+    deadline = start + timeout
+
+    while True:
+        if check():
+            return True, round(time.monotonic() - start, 3)
+
+        now = time.monotonic()
+        if now >= deadline:
+            return False, round(now - start, 3)
+
+        time.sleep(min(delay, deadline - now))
+        delay = min(delay * 2, max_delay)
+
+
+def wait_for_object(api, endpoint, present=True, etag="", etag_before="", **kwargs):
+    """Wait until a GET of endpoint shows the state after a write.
+
+    With present=True, the object has to exist. If the ETag before and the
+    ETag returned by the write are given, the object also has to be returned
+    with the new ETag, or at least with one different from the old one.
+    With present=False, the object has to be gone.
+    Responses other than 200 and 404 end the wait, as they do not tell
+    anything about the object. Takes the keyword arguments of wait_until()
+    and returns the same tuple.
+    """
+
+    def check():
+        result = api._fetch(
+            code_mapping=READINESS_HTTP_CODES,
+            endpoint=endpoint,
+            method="GET",
+            fail_on_error=False,
+        )
+
+        if result.http_code == 404:
+            return not present
+        if result.http_code != 200:
+            return True
+        if not present:
+            return False
+        if etag and etag_before:
+            return result.etag == etag or result.etag != etag_before
+        return True
+
+    return wait_until(check, **kwargs)
+
+
+def warn_if_not_ready(module, ready, waited, what):
+    """Warn that the server did not show a change before the deadline"""
+    if not ready:
+        module.warn(
+            "The server did not show the %s within %s seconds. Later tasks may"
+            " still see the state before the change." % (what, waited)
+        )
@@ -11,6 +11,9 @@ from __future__ import absolute_import, division, print_function
 __metaclass__ = type
 
 from ansible.module_utils.basic import env_fallback
+from ansible_collections.checkmk.general.plugins.module_utils.cache import (
+    invalidate_lookup_cache,
+)
 from ansible_collections.checkmk.general.plugins.module_utils.types import RESULT
 
 
@@ -18,11 +21,11 @@ def base_argument_spec():
     return dict(
         server_url=dict(
             type="str",
-            required=True,
+            required=False,
             fallback=(env_fallback, ["CHECKMK_VAR_SERVER_URL"]),
         ),
         site=dict(
-            type="str", required=True, fallback=(env_fallback, ["CHECKMK_VAR_SITE"])
+            type="str", required=False, fallback=(env_fallback, ["CHECKMK_VAR_SITE"])
         ),
         validate_certs=dict(
             type="bool",
@@ -66,9 +69,43 @@ def base_argument_spec():
             default=None,
             fallback=(env_fallback, ["CHECKMK_VAR_CLIENT_KEY"]),
         ),
+        version_cache_ttl=dict(
+            type="int",
+            required=False,
+            default=0,
+            fallback=(env_fallback, ["CHECKMK_VAR_VERSION_CACHE_TTL"]),
+        ),
+        invalidate_version_cache=dict(
+            type="bool",
+            required=False,
+            default=False,
+        ),
+        invalidate_lookup_cache=dict(
+            type="bool",
+            required=False,
+            default=False,
+        ),
     )
 
 
+def uses_connection_plugin(module):
+    """Whether the module runs through a persistent connection, i.e. the
+    checkmk.general.checkmk httpapi connection plugin."""
+    return bool(getattr(module, "_socket_path", None))
+
+
+def check_connection_params(module, connection_plugin_supported=True):
+    """Fail like a required parameter check, if server_url or site are missing.
+
+    Both are only optional, if the connection plugin provides them."""
+    if connection_plugin_supported and uses_connection_plugin(module):
+        return
+
+    missing = [p for p in ("server_url", "site") if not module.params.get(p)]
+    if missing:
+        module.fail_json(msg="missing required arguments: %s" % ", ".join(missing))
+
+
 def normalize_folder(folder):
     """Normalize a Checkmk folder path to slash-format.
 
@@ -119,6 +156,13 @@ def remove_null_value_keys(params):
             del params[k]
 
 
+def invalidate_lookup_cache_on_change(module):
+    """Honor invalidate_lookup_cache in modules that send their requests with
+    fetch_url() themselves, instead of through CheckmkAPI"""
+    if module.params.get("invalidate_lookup_cache"):
+        invalidate_lookup_cache()
+
+
 def exit_module(
     module,
     result=None,
@@ -129,7 +173,9 @@ def exit_module(
     failed=False,
     changed=False,
     logger=None,
+    **kwargs,
 ):
+    """Exit the module with the result, plus the return values in kwargs"""
     if not result:
         result = RESULT(
             http_code=http_code,
@@ -141,6 +187,7 @@ def exit_module(
         )
 
     result_as_dict = result._asdict()
+    result_as_dict.update(kwargs)
     if logger:
         result_as_dict["debug"] = logger.get_log()
     module.exit_json(**result_as_dict)
@@ -41,10 +41,40 @@ options:
         required: false
         default: false
         type: bool
+    debounce:
+        description:
+            - The time in seconds to wait before starting an activation, so that the changes
+              of tasks running in parallel are activated together.
+        required: false
+        default: 0
+        type: float
+        version_added: "8.3.0"
+    wait_for_completion:
+        description:
+          - If set to C(true), wait for the activation to finish by checking its state with an
+            increasing delay, and return the state and the duration of the activation of every site.
+          - Takes precedence over C(redirect).
+        required: false
+        default: false
+        type: bool
+        version_added: "8.3.0"
+    wait_timeout:
+        description:
+          - The time in seconds to wait for an activation to finish.
+          - Default is -1, which means infinite.
+        required: false
+        default: -1
+        type: int
+        version_added: "8.3.0"
 
 notes:
-    - This module always triggers an activation when there are pending changes.
-      It is not idempotent in the usual Ansible sense.
+    - This module triggers an activation when there are pending changes.
+      If there are none, nothing is done.
+    - If an activation of the same sites is already running, it is joined instead of
+      starting another one. The module waits for it to finish and then activates the changes
+      made in the meantime. Without C(sites), only an activation of all sites is joined.
+    - Parallel tasks activating changes on the same machine run one after the other,
+      so only the first one starts an activation.
     - 'Use C(run_once: true) to avoid activating once per host in a play.'
 
 seealso:
@@ -82,6 +112,21 @@ EXAMPLES = r"""
     redirect: true
   run_once: true
 
+- name: "Activate changes, wait for completion and show how long every site took."
+  checkmk.general.activation:
+    server_url: "https://myserver/"
+    site: "mysite"
+    api_user: "myuser"
+    api_secret: "mysecret"
+    wait_for_completion: true
+    wait_timeout: 900
+  run_once: true
+  register: activation_result
+
+- name: "Show the duration of the activation per site."
+  ansible.builtin.debug:
+    var: activation_result.sites
+
 # ---------------------------------------------------------------------------
 # Targeting specific sites
 # ---------------------------------------------------------------------------
@@ -163,12 +208,62 @@ msg:
     type: str
     returned: always
     sample: 'Activation started.'
+waited:
+    description: The time in seconds the module waited for the server to list the started activation.
+    type: float
+    returned: always
+    sample: 0.1
+ready:
+    description: Whether the server listed the started activation before the module stopped waiting.
+    type: bool
+    returned: always
+    sample: true
+joined:
+    description: The ID of the running activation the module joined, instead of starting one.
+    type: str
+    returned: always
+    sample: 'f2a3d1c4-1b7e-4c2a-9d0e-6b5c3a2e1f00'
+sites:
+    description:
+      - The state of the activation of every site, by site ID.
+      - Empty, unless the module waited for the activation with C(wait_for_completion), or
+        for a joined activation. Checkmk versions before 2.3.0 do not report it.
+    type: dict
+    returned: always
+    contains:
+        phase:
+            description: The phase of the activation of the site.
+            type: str
+            sample: 'done'
+        state:
+            description: The state of the activation of the site.
+            type: str
+            sample: 'success'
+        status_text:
+            description: The status message of the activation of the site.
+            type: str
+            sample: 'Success'
+        duration:
+            description: The time in seconds the activation of the site took.
+            type: float
+            sample: 12.5
 """
 
+import json
 import time
+from datetime import datetime
 
 from ansible.module_utils.basic import AnsibleModule
 from ansible_collections.checkmk.general.plugins.module_utils.api import CheckmkAPI
+from ansible_collections.checkmk.general.plugins.module_utils.cache import FileLock
+from ansible_collections.checkmk.general.plugins.module_utils.readiness import (
+    wait_for_object,
+    wait_until,
+    warn_if_not_ready,
+)
+from ansible_collections.checkmk.general.plugins.module_utils.types import (
+    generate_result,
+)
 from ansible_collections.checkmk.general.plugins.module_utils.utils import (
     base_argument_spec,
     result_as_dict,
@@ -189,15 +284,51 @@ HTTP_CODES = {
     423: (False, True, "There is already an activation running."),
 }
 
+HTTP_CODES_GET = {
+    # http_code: (changed, failed, "Message")
+    200: (False, False, "OK"),
+}
+
+# The longest time between two checks whether an activation has finished
+POLL_MAX_DELAY = 5.0
+
+
+def _timestamp(value):
+    try:
+        return datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except (AttributeError, TypeError, ValueError):
+        return None
+
+
+def site_status(run):
+    """Return the status and the duration of the activation of every site,
+    from the extensions of an activation run"""
+    sites = {}
+    for status in run.get("status_per_site") or []:
+        start = _timestamp(status.get("start_time"))
+        end = _timestamp(status.get("end_time"))
+        sites[status.get("site", "")] = {
+            "phase": status.get("phase", ""),
+            "state": status.get("state", ""),
+            "status_text": status.get("status_text", ""),
+            "duration": (
+                round((end - start).total_seconds(), 3) if start and end else None
+            ),
+        }
+    return sites
+
 
 class ActivationAPI(CheckmkAPI):
     def post(self):
         data = {
             "force_foreign_changes": self.params.get("force_foreign_changes"),
-            "redirect": self.params.get("redirect"),
-            "sites": self.params.get("sites", []),
+            # The module polls the activation itself to report on it
+            "redirect": self.params.get("redirect")
+            and not self.params.get("wait_for_completion"),
+            "sites": self._sites(),
         }
 
+        self.headers["If-Match"] = "*"
         return self._fetch(
             code_mapping=HTTP_CODES,
             endpoint="domain-types/activation_run/actions/activate-changes/invoke",
@@ -205,6 +336,107 @@ class ActivationAPI(CheckmkAPI):
             method="POST",
         )
 
+    def _sites(self):
+        sites = self.params.get("sites") or []
+        if isinstance(sites, str):
+            sites = [sites]
+        return sites
+
+    def _get(self, endpoint):
+        """GET endpoint and return the decoded content, or None if it fails"""
+        result = self._fetch(
+            code_mapping=HTTP_CODES_GET,
+            endpoint=endpoint,
+            method="GET",
+            fail_on_error=False,
+        )
+        if result.http_code != 200:
+            return None
+        return json.loads(result.content or "{}")
+
+    def pending_changes(self):
+        """Return the list of pending changes, or None if it cannot be read"""
+        content = self._get("domain-types/activation_run/collections/pending_changes")
+        if content is None:
+            return None
+        return content.get("value", [])
+
+    def _all_sites(self):
+        """Return the IDs of all sites, or None if they cannot be read"""
+        content = self._get("domain-types/site_connection/collections/all")
+        if content is None:
+            return None
+        return [site.get("id") for site in content.get("value", [])]
+
+    def running_activation(self):
+        """Return the id of a running activation of all sites to be activated.
+        Without sites, these are all sites of the setup."""
+        content = self._get("domain-types/activation_run/collections/running")
+        if not content or not content.get("value"):
+            return None
+
+        sites = set(self._sites() or self._all_sites() or [])
+        if not sites:
+            return None
+
+        for activation_run in content.get("value", []):
+            activation_sites = activation_run.get("extensions", {}).get("sites") or []
+            if activation_run.get("id") and sites <= set(activation_sites):
+                return activation_run["id"]
+        return None
+
+    def wait_for_completion(self, activation_id):
+        """Poll the activation run until it finished.
+
+        Returns a tuple (finished, waited, run), where run holds the
+        extensions of the activation run read last.
+        """
+        timeout = self.params.get("wait_timeout")
+        run = {}
+
+        def check():
+            content = self._get("objects/activation_run/%s" % activation_id)
+            if content is None:
+                # The run cannot be read, there is nothing to wait for
+                return True
+            run.update(content.get("extensions", {}))
+            return not run.get("is_running", False)
+
+        finished, waited = wait_until(
+            check,
+            timeout=timeout if timeout is not None and timeout >= 0 else float("inf"),
+            max_delay=POLL_MAX_DELAY,
+        )
+        return finished, waited, run
+
+
+def completion_result(activation_id, finished, waited, run):
+    """Turn the final state of an activation run into the result of the module"""
+    sites = site_status(run)
+    failed_sites = sorted(
+        site for site, status in sites.items() if status["state"] == "error"
+    )
+    if not finished:
+        msg = "Activation %s did not finish within %s seconds." % (
+            activation_id,
+            waited,
+        )
+    elif failed_sites:
+        msg = "Activation %s failed on the sites %s." % (
+            activation_id,
+            ", ".join(failed_sites),
+        )
+    else:
+        msg = "Activation %s has been completed." % activation_id
+
+    result = generate_result(
+        msg=msg,
+        http_code=200,
+        failed=not finished or bool(failed_sites),
+        changed=True,
+    )
+    return result, sites
+
 
 def run_module():
     argument_spec = base_argument_spec()
@@ -212,17 +444,86 @@ def run_module():
         sites=dict(type="raw", default=[]),
         force_foreign_changes=dict(type="bool", default=False),
         redirect=dict(type="bool", default=False),
+        debounce=dict(type="float", default=0),
+        wait_for_completion=dict(type="bool", default=False),
+        wait_timeout=dict(type="int", default=-1),
     )
 
     module = AnsibleModule(argument_spec=argument_spec, supports_check_mode=False)
 
     activation = ActivationAPI(module)
-    activation.headers["If-Match"] = "*"
-    result = activation.post()
-
-    time.sleep(3)
-
-    module.exit_json(**result_as_dict(result))
+    waited = 0
+    ready = True
+    joined = ""
+    sites = {}
+
+    # Parallel tasks activating on the same site run one after the other, so
+    # the later ones find the activation of the first one running, or no
+    # pending changes left.
+    with FileLock("activation", "%s|%s" % (activation.url, activation._sites())):
+        joined = activation.running_activation() or ""
+        if joined:
+            # Changes made after the joined activation started are only
+            # known once it finished.
+            finished, waited, run = activation.wait_for_completion(joined)
+            if not finished:
+                result, sites = completion_result(joined, finished, waited, run)
+                module.exit_json(
+                    waited=waited,
+                    ready=ready,
+                    joined=joined,
+                    sites=sites,
+                    **result_as_dict(result),
+                )
+            sites = site_status(run)
+
+        # Changes made while the joined activation was running are still
+        # pending and activated below.
+        if activation.pending_changes() == []:
+            result = generate_result(
+                msg=(
+                    "Joined the running activation %s." % joined
+                    if joined
+                    else "There are no changes to be activated."
+                ),
+                http_code=200,
+                failed=False,
+            )
+            module.exit_json(
+                waited=waited,
+                ready=ready,
+                joined=joined,
+                sites=sites,
+                **result_as_dict(result),
+            )
+
+        if module.params.get("debounce"):
+            # Collect the changes of parallel tasks into this activation
+            time.sleep(module.params.get("debounce"))
+
+        result = activation.post()
+
+        if result.http_code == 200:
+            activation_id = json.loads(result.content or "{}").get("id")
+            if activation_id and module.params.get("wait_for_completion"):
+                finished, waited_run, run = activation.wait_for_completion(
+                    activation_id
+                )
+                waited += waited_run
+                result, sites = completion_result(
+                    activation_id, finished, waited_run, run
+                )
+            elif activation_id:
+                # The activation was started, wait until the server lists it
+                ready, waited_started = wait_for_object(
+                    activation, "/objects/activation_run/%s" % activation_id
+                )
+                waited += waited_started
+                warn_if_not_ready(module, ready, waited, "started activation")
+
+    module.exit_json(
+        waited=waited, ready=ready, joined=joined, sites=sites, **result_as_dict(result)
+    )
 
 
 def main():
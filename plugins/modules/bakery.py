@@ -42,6 +42,15 @@ options:
         choices: ["baked", "signed", "baked_signed"]
         type: str
 
+    wait_timeout:
+        description:
+            - The time in seconds to wait for the baking job to finish.
+            - Set to C(0) to return right after the job was started.
+        required: false
+        type: int
+        default: 30
+        version_added: "8.3.0"
+
 notes:
     - The agent bakery is only available in the commercial editions of Checkmk.
       This module will fail on Checkmk Community.
@@ -129,12 +138,27 @@ msg:
     type: str
     returned: always
     sample: 'Done.'
+waited:
+    description: The time in seconds the module waited for the baking job to finish.
+    type: float
+    returned: always
+    sample: 2.3
+ready:
+    description: Whether the server showed the finished baking job before the module stopped waiting.
+    type: bool
+    returned: always
+    sample: true
 """
 
-import time
+import json
 
 from ansible.module_utils.basic import AnsibleModule
 from ansible_collections.checkmk.general.plugins.module_utils.api import CheckmkAPI
+from ansible_collections.checkmk.general.plugins.module_utils.readiness import (
+    READINESS_HTTP_CODES,
+    wait_until,
+    warn_if_not_ready,
+)
 from ansible_collections.checkmk.general.plugins.module_utils.utils import (
     base_argument_spec,
     result_as_dict,
@@ -164,6 +188,21 @@ class BakeryAPI(CheckmkAPI):
             method="POST",
         )
 
+    def baking_finished(self):
+        result = self._fetch(
+            code_mapping=READINESS_HTTP_CODES,
+            endpoint="/domain-types/agent/actions/baking_status/invoke",
+            method="GET",
+            fail_on_error=False,
+        )
+
+        # Without a baking status, there is nothing to wait for
+        if result.http_code != 200:
+            return True
+
+        state = json.loads(result.content or "{}").get("state")
+        return state not in ("initialized", "running")
+
 
 def run_module():
     argument_spec = base_argument_spec()
@@ -175,6 +214,7 @@ def run_module():
             choices=["baked", "signed", "baked_signed"],
             required=True,
         ),
+        wait_timeout=dict(type="int", default=30),
     )
 
     module = AnsibleModule(argument_spec=argument_spec, supports_check_mode=False)
@@ -182,9 +222,14 @@ def run_module():
     bakery = BakeryAPI(module)
     result = bakery.post()
 
-    time.sleep(3)
+    waited = 0
+    ready = True
+    timeout = module.params.get("wait_timeout")
+    if not result.failed and timeout and timeout > 0:
+        ready, waited = wait_until(bakery.baking_finished, timeout=timeout)
+        warn_if_not_ready(module, ready, waited, "finished baking job")
 
-    module.exit_json(**result_as_dict(result))
+    module.exit_json(waited=waited, ready=ready, **result_as_dict(result))
 
 
 def main():
@@ -83,10 +83,55 @@ options:
         required: false
         type: int
         default: -1
+    poll_interval_min:
+        description:
+            - The time in seconds to wait before checking again whether a discovery has finished.
+            - The time is doubled after every check, up to I(poll_interval_max).
+        required: false
+        type: float
+        default: 0.5
+        version_added: "8.3.0"
+    poll_interval_max:
+        description:
+            - The maximum time in seconds between two checks whether a discovery has finished.
+        required: false
+        type: float
+        default: 15.0
+        version_added: "8.3.0"
+    shard_size:
+        description:
+            - In bulk mode, discover more hosts than this in several bulk discovery jobs
+              of at most this many hosts each.
+            - Only used together with I(wait_for_completion). The default C(0) discovers all
+              hosts in one job.
+            - The message and the C(progress) returned for several jobs differ from those of one job.
+        required: false
+        type: int
+        default: 0
+        version_added: "8.3.0"
+    max_concurrent_jobs:
+        description:
+            - The maximum number of bulk discovery jobs running at the same time, when the
+              hosts are discovered in several jobs (see I(shard_size)).
+            - Checkmk versions before 2.4.0 can only run one bulk discovery job at a time,
+              the jobs are run one after the other there.
+        required: false
+        type: int
+        default: 2
+        version_added: "8.3.0"
+    shard_retries:
+        description:
+            - How often the hosts of a bulk discovery job that did not finish, and the hosts the
+              discovery failed for, are discovered again. The other hosts are not discovered again.
+        required: false
+        type: int
+        default: 1
+        version_added: "8.3.0"
 
 notes:
     - When using C(hosts) (bulk mode), hosts are processed in batches controlled by C(bulk_size).
       A larger C(bulk_size) is faster but may put more load on the Checkmk server.
+    - Large lists of C(hosts) can be split into several bulk discovery jobs, see C(shard_size).
 
 seealso:
     - module: checkmk.general.activation
@@ -261,6 +306,49 @@ msg:
     type: str
     returned: always
     sample: 'Discovery started.'
+progress:
+    description: The progress of the discovery.
+    type: dict
+    returned: always
+    contains:
+        polls:
+            description: The number of requests made to check whether a discovery has finished.
+            type: int
+            sample: 4
+        elapsed:
+            description: The time in seconds spent waiting for discoveries to finish.
+            type: float
+            sample: 3.52
+        hosts_processed:
+            description: The number of hosts the discovery has processed.
+            type: int
+            sample: 10
+        job_state:
+            description: The final state of the bulk discovery job.
+            type: str
+            returned: when the module waited for a bulk discovery in one job
+            sample: 'finished'
+        failed_hosts:
+            description: The hosts the bulk discovery failed for, with the message of the job.
+            type: dict
+            returned: when the module waited for a bulk discovery
+            sample: {"myhost": "discovery failed: timeout"}
+        shards:
+            description: The number of bulk discovery jobs started, including retries.
+            type: int
+            returned: when the hosts were discovered in several jobs
+            sample: 30
+        retried_hosts:
+            description: The number of hosts discovered again after a failure.
+            type: int
+            returned: when the hosts were discovered in several jobs
+            sample: 12
+        job_result:
+            description: The result and exception lines of the log of the bulk discovery job.
+            type: list
+            elements: str
+            returned: when the module waited for a bulk discovery in one job
+            sample: ["Bulk discovery successful"]
 """
 
 from ansible.module_utils.basic import AnsibleModule
@@ -331,6 +419,11 @@ def run_module():
         wait_for_completion=dict(type="bool", default=True),
         wait_for_previous=dict(type="bool", default=True),
         wait_timeout=dict(type="int", default=-1),
+        poll_interval_min=dict(type="float", default=0.5),
+        poll_interval_max=dict(type="float", default=15.0),
+        shard_size=dict(type="int", default=0),
+        max_concurrent_jobs=dict(type="int", default=2),
+        shard_retries=dict(type="int", default=1),
     )
 
     module = AnsibleModule(
@@ -370,12 +463,16 @@ def run_module():
             logger=logger,
         )
 
-    result = discovery.start_discovery()
+    if discovery.sharded():
+        result = discovery.start_sharded_discovery()
+    else:
+        result = discovery.start_discovery()
 
     exit_module(
         module,
         result=result,
         logger=logger,
+        progress=discovery.report(result),
     )
 
 
@@ -0,0 +1,129 @@
+#!/usr/bin/python
+# -*- encoding: utf-8; py-indent-offset: 4 -*-
+
+# Copyright: (c) 2026, Checkmk GmbH
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+DOCUMENTATION = r"""
+---
+module: discovery_batch
+
+short_description: Discover services of all hosts of a play batch in one bulk discovery
+
+version_added: "8.3.0"
+
+description:
+- Collect the hosts of the current batch of the play and discover their services
+  with one bulk discovery job, instead of one discovery job per host.
+- The result of every host is returned in C(host_results).
+- This is an action plugin, which runs the M(checkmk.general.discovery) module once
+  for the whole batch. All options of that module are supported, except
+  I(host_name) and I(hosts).
+
+extends_documentation_fragment: [checkmk.general.common]
+
+options:
+    host_name_var:
+        description:
+            - The variable holding the name of a host in Checkmk. It is read from the
+              variables of every host of the batch.
+            - The batch holds all hosts of the play, also the ones that skipped the
+              tasks before. Hosts without this variable are left out, so set it only
+              for the hosts to discover, e.g. with M(ansible.builtin.set_fact).
+            - With the default, all hosts of the batch are discovered with their
+              inventory name.
+        required: false
+        type: str
+        default: inventory_hostname
+    state:
+        description:
+            - The action to perform during discovery.
+            - See M(checkmk.general.discovery) for the choices.
+        required: false
+        type: str
+        default: new
+    wait_for_completion:
+        description:
+            - If true, wait for the discovery to finish.
+            - Only then the results of the single hosts are known.
+        required: false
+        type: bool
+        default: True
+
+notes:
+    - The plugin runs once for the batch, like a task with C(run_once). Set C(run_once)
+      on the task as well to register the result for all hosts of the batch.
+    - Further options are passed on to M(checkmk.general.discovery) unchanged.
+    - Failed and unreachable hosts are not part of the batch and are not discovered.
+
+seealso:
+    - module: checkmk.general.discovery
+
+author:
+    - Checkmk GmbH (@Checkmk)
+"""
+
+EXAMPLES = r"""
+- name: "Discover the services of all hosts of the batch."
+  checkmk.general.discovery_batch:
+    server_url: "https://myserver/"
+    site: "mysite"
+    api_user: "myuser"
+    api_secret: "mysecret"
+    host_name_var: "checkmk_host_name"
+    state: "fix_all"
+  delegate_to: localhost
+  run_once: true
+  register: discovery_state
+
+- name: "Fail for the hosts the discovery failed for."
+  ansible.builtin.fail:
+    msg: "{{ discovery_state.host_results[inventory_hostname].msg }}"
+  when: discovery_state.host_results[inventory_hostname].failed
+"""
+
+RETURN = r"""
+http_code:
+    description: The HTTP code the Checkmk API returns.
+    type: int
+    returned: always
+    sample: '200'
+msg:
+    description: The output message of the bulk discovery.
+    type: str
+    returned: always
+    sample: 'Discovery successful.'
+progress:
+    description: The progress of the bulk discovery, see M(checkmk.general.discovery).
+    type: dict
+    returned: always
+host_results:
+    description: The result of the discovery for every host of the batch, by inventory name.
+    type: dict
+    returned: always
+    contains:
+        host_name:
+            description: The name of the host in Checkmk.
+            type: str
+            sample: 'myhost'
+        changed:
+            description: Whether the discovery of the host was done.
+            type: bool
+            sample: true
+        failed:
+            description: Whether the discovery failed for the host.
+            type: bool
+            sample: false
+        skipped:
+            description: Whether the host was left out, because it has no variable I(host_name_var).
+            type: bool
+            sample: false
+        msg:
+            description: The message of the bulk discovery job for the host, if it failed.
+            type: str
+            sample: 'Discovery successful.'
+"""
@@ -73,9 +73,25 @@ options:
         type: str
         default: ''
     host_name:
-        description: The host to schedule the downtime on.
-        required: true
+        description: The host to schedule the downtime on. Mutually exclusive with I(hosts).
+        required: false
         type: str
+    hosts:
+        description:
+            - The hosts to schedule the downtimes on. Mutually exclusive with I(host_name).
+            - The current downtimes of all hosts are read with one request, and the missing
+              downtimes are created or the existing ones removed in batches of I(batch_size) hosts.
+            - Hosts and service descriptions are matched exactly, not as regular expressions.
+        required: false
+        type: list
+        elements: str
+        version_added: "8.3.0"
+    batch_size:
+        description: The number of hosts whose downtimes are created or removed with one request, when using I(hosts).
+        required: false
+        type: int
+        default: 100
+        version_added: "8.3.0"
     service_descriptions:
         description: Array of service descriptions. If set only service-downtimes will be set. If omitted a host downtime will be set.
         required: false
@@ -274,6 +290,33 @@ EXAMPLES = r"""
     - "myhost02"
     - "myhost03"
 
+- name: "Schedule a host downtime for many hosts with a few requests."
+  checkmk.general.downtime:
+    server_url: "https://myserver/"
+    site: "mysite"
+    api_user: "myuser"
+    api_secret: "mysecret"
+    hosts: "{{ groups['webservers'] }}"
+    comment: "Managed by Ansible"
+    end_after:
+      hours: 2
+
+- name: "Schedule service downtimes for many hosts."
+  checkmk.general.downtime:
+    server_url: "https://myserver/"
+    site: "mysite"
+    api_user: "myuser"
+    api_secret: "mysecret"
+    hosts:
+      - "myhost01"
+      - "myhost02"
+    comment: "Managed by Ansible"
+    service_descriptions:
+      - "CPU utilization"
+      - "Memory"
+    end_after:
+      hours: 1
+
 # ---------------------------------------------------------------------------
 # Flexible (triggered) downtime
 # ---------------------------------------------------------------------------
@@ -345,6 +388,11 @@ msg:
     type: str
     returned: always
     sample: ''
+targets:
+    description: The result for every host, when using I(hosts).
+    type: dict
+    returned: when I(hosts) is used
+    sample: {"myhost01": {"changed": true, "failed": false, "service_descriptions": ["CPU utilization"]}}
 """
 
 import json
@@ -355,6 +403,8 @@ from ansible.module_utils.basic import AnsibleModule
 from ansible.module_utils.urls import fetch_url
 from ansible_collections.checkmk.general.plugins.module_utils.utils import (
     base_argument_spec,
+    check_connection_params,
+    invalidate_lookup_cache_on_change,
 )
 
 try:
@@ -368,6 +418,7 @@ def bail_out(module, state, msg):
         result = {"msg": msg, "changed": False, "failed": False}
         module.exit_json(**result)
     elif state == "changed":
+        invalidate_lookup_cache_on_change(module)
         result = {"msg": msg, "changed": True, "failed": False}
         module.exit_json(**result)
     else:
@@ -612,10 +663,209 @@ def remove_downtime(module, base_url, headers):
             )
 
 
+def _any_of(column, values):
+    return {
+        "op": "or",
+        "expr": [{"op": "=", "left": column, "right": value} for value in values],
+    }
+
+
+def _batches(items, size):
+    size = max(size, 1)
+    for index in range(0, len(items), size):
+        yield items[index : index + size]
+
+
+def _get_current_bulk_downtimes(module, base_url, headers):
+    """Read the downtimes of all hosts with one query.
+
+    Returns a dict of host name -> set of service descriptions, or of "HOST"
+    for host downtimes. Hosts are filtered locally, to keep the query short
+    for long lists of hosts.
+    """
+    hosts = set(module.params.get("hosts"))
+    service_descriptions = module.params.get("service_descriptions")
+    comment = module.params.get("comment")
+    is_service = len(service_descriptions) != 0
+
+    filters = [{"op": "=", "left": "is_service", "right": "1" if is_service else "0"}]
+    if is_service:
+        filters.append(_any_of("service_description", service_descriptions))
+    if comment:
+        filters.append({"op": "~", "left": "comment", "right": comment})
+
+    api_endpoint = "/domain-types/downtime/collections/all"
+    params = {"query": json.dumps({"op": "and", "expr": filters})}
+
+    url = "%s%s?%s" % (base_url, api_endpoint, urlencode(params))
+    response, info = fetch_url(module, url, headers=headers, method="GET")
+
+    if info["status"] != 200:
+        bail_out(
+            module,
+            "failed",
+            "Error calling API while getting downtimes for %d hosts. HTTP code %d. Details: %s, "
+            % (len(hosts), info["status"], info.get("body", str(info))),
+        )
+
+    body = json.loads(response.read().decode("utf-8"))
+
+    current = {}
+    for dt in body["value"]:
+        host_name = dt.get("extensions", {}).get("host_name")
+        if host_name not in hosts:
+            continue
+        if is_service:
+            item = dt["title"].split(":", 1)[1].strip()
+        else:
+            item = "HOST"
+        current.setdefault(host_name, set()).add(item)
+    return current
+
+
+def _bulk_targets(module, current, present):
+    """Compute the downtimes to create (present) or remove for every host.
+
+    Returns a dict of host name -> list of service descriptions, which is
+    empty for host downtimes. Hosts with nothing to do are left out.
+    """
+    service_descriptions = module.params.get("service_descriptions")
+    force = module.params.get("force")
+
+    targets = {}
+    for host_name in dict.fromkeys(module.params.get("hosts")):
+        existing = current.get(host_name, set())
+        if service_descriptions:
+            if present:
+                services = [
+                    s for s in service_descriptions if force or s not in existing
+                ]
+            else:
+                services = [s for s in service_descriptions if s in existing]
+            if services:
+                targets[host_name] = services
+        elif (force or not existing) if present else existing:
+            targets[host_name] = []
+    return targets
+
+
+def _bulk_request(module, base_url, headers, batch):
+    """Create or remove the downtimes of a batch of hosts with one request"""
+    service_descriptions = module.params.get("service_descriptions")
+    comment = module.params.get("comment")
+    is_service = len(service_descriptions) != 0
+
+    if module.params.get("state") == "absent":
+        filters = [_any_of("host_name", batch)]
+        if is_service:
+            filters.append(_any_of("service_description", service_descriptions))
+        if comment is not None:
+            filters.append({"op": "~", "left": "comment", "right": comment})
+        api_endpoint = "/domain-types/downtime/actions/delete/invoke"
+        params = {
+            "delete_type": "query",
+            "query": json.dumps({"op": "and", "expr": filters}),
+        }
+
+    else:
+        start_time, end_time = _set_timestamps(module)
+        params = {
+            "start_time": start_time,
+            "end_time": end_time,
+            "duration": module.params.get("duration"),
+            "recur": "fixed",
+            "comment": comment,
+        }
+        if is_service:
+            api_endpoint = "/domain-types/downtime/collections/service"
+            query = {
+                "op": "or",
+                "expr": [
+                    {
+                        "op": "and",
+                        "expr": [
+                            {"op": "=", "left": "host_name", "right": host_name},
+                            _any_of("description", services),
+                        ],
+                    }
+                    for host_name, services in batch.items()
+                ],
+            }
+            params.update(downtime_type="service_by_query", query=json.dumps(query))
+        else:
+            api_endpoint = "/domain-types/downtime/collections/host"
+            query = _any_of("name", list(batch))
+            params.update(downtime_type="host_by_query", query=json.dumps(query))
+
+    response, info = fetch_url(
+        module,
+        base_url + api_endpoint,
+        module.jsonify(params),
+        headers=headers,
+        method="POST",
+    )
+
+    if info["status"] != 204:
+        return "HTTP code %d. Details: %s" % (
+            info["status"],
+            info.get("body", str(info)),
+        )
+    return None
+
+
+def bulk_downtimes(module, base_url, headers):
+    """Create or remove the downtimes of all hosts in hosts.
+
+    The current downtimes are read with one query, and the hosts to change
+    are sent in batches. Returns the result for every host.
+    """
+    present = module.params.get("state") == "present"
+    current = _get_current_bulk_downtimes(module, base_url, headers)
+    targets = _bulk_targets(module, current, present)
+
+    results = dict(
+        (host_name, {"changed": False, "failed": False, "service_descriptions": []})
+        for host_name in module.params.get("hosts")
+    )
+
+    errors = []
+    for batch_hosts in _batches(list(targets), module.params.get("batch_size")):
+        batch = dict((host_name, targets[host_name]) for host_name in batch_hosts)
+        error = _bulk_request(module, base_url, headers, batch)
+        if error:
+            errors.append("%s: %s" % (", ".join(batch_hosts), error))
+        for host_name, services in batch.items():
+            results[host_name] = {
+                "changed": error is None,
+                "failed": error is not None,
+                "service_descriptions": services,
+            }
+
+    changed = sum(1 for r in results.values() if r["changed"])
+    msg = "Downtimes %s for %d of %d hosts with comment '%s'." % (
+        "added" if present else "removed",
+        changed,
+        len(results),
+        module.params.get("comment"),
+    )
+    if changed:
+        invalidate_lookup_cache_on_change(module)
+    if errors:
+        module.fail_json(
+            msg="Error calling API while %s downtimes. %s"
+            % ("adding" if present else "removing", " ".join(errors)),
+            changed=changed > 0,
+            targets=results,
+        )
+    module.exit_json(msg=msg, changed=changed > 0, failed=False, targets=results)
+
+
 def run_module():
     argument_spec = base_argument_spec()
     argument_spec.update(
-        host_name=dict(type="str", required=True),
+        host_name=dict(type="str", required=False),
+        hosts=dict(type="list", elements="str", required=False),
+        batch_size=dict(type="int", default=100),
         comment=dict(type="str", default="Managed by Ansible"),
         duration=dict(type="int", default=0),
         start_after=dict(type="dict", default={}),
@@ -627,7 +877,17 @@ def run_module():
         state=dict(type="str", default="present", choices=["present", "absent"]),
     )
 
-    module = AnsibleModule(argument_spec=argument_spec, supports_check_mode=False)
+    module = AnsibleModule(
+        argument_spec=argument_spec,
+        mutually_exclusive=[
+            ("host_name", "hosts"),
+        ],
+        required_one_of=[
+            ("host_name", "hosts"),
+        ],
+        supports_check_mode=False,
+    )
+    check_connection_params(module, connection_plugin_supported=False)
 
     # Use the parameters to initialize some common variables
     headers = {
@@ -649,7 +909,10 @@ def run_module():
     state = module.params.get("state", "present")
 
     # Handle the host accordingly to above findings and desired state
-    if state == "present":
+    if module.params.get("hosts") is not None:
+        bulk_downtimes(module, base_url, headers)
+
+    elif state == "present":
         state, msg = set_downtime(module, base_url, headers)
         bail_out(module, state, msg)
 
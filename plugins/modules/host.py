@@ -26,9 +26,54 @@ extends_documentation_fragment: [checkmk.general.common]
 
 options:
     name:
-        description: The host you want to manage.
-        required: true
+        description:
+            - The host you want to manage.
+              B(Mutually exclusive with I(hosts).)
+        required: false
         type: str
+    hosts:
+        description:
+            - Manage a list of hosts in one task (bulk mode).
+              All hosts are read with one request. Hosts to be created, modified or deleted
+              are then sent to the bulk endpoints of the REST API in chunks of I(chunk_size).
+              I(folder), I(attributes), I(update_attributes) and I(remove_attributes) given on the task level
+              are used for every host that does not set them itself.
+              Cluster hosts and I(remove_attributes) of dict type are not supported in bulk mode.
+              B(Mutually exclusive with I(name), I(nodes), I(add_nodes) and I(remove_nodes).)
+        required: false
+        type: list
+        elements: dict
+        version_added: "8.3.0"
+        suboptions:
+            name:
+                description: The name of the host.
+                required: true
+                type: str
+            folder:
+                description: The folder of the host. See I(folder) on the task level.
+                required: false
+                type: str
+            attributes:
+                description: The attributes of the host. See I(attributes) on the task level.
+                required: false
+                type: raw
+            update_attributes:
+                description: The attributes of the host to update. See I(update_attributes) on the task level.
+                required: false
+                type: raw
+            remove_attributes:
+                description: The attributes of the host to remove. See I(remove_attributes) on the task level.
+                required: false
+                type: raw
+    chunk_size:
+        description:
+            - The maximum number of hosts sent to the REST API in one bulk request.
+              Only used with I(hosts).
+            - Must be at least 1.
+        required: false
+        type: int
+        default: 100
+        version_added: "8.3.0"
     folder:
         description:
             - The folder your host is located in.
@@ -272,6 +317,40 @@ EXAMPLES = r"""
       - "myhost03"
     state: "present"
 
+# ---------------------------------------------------------------------------
+# Bulk mode
+# ---------------------------------------------------------------------------
+# All hosts are read with one request and written with bulk requests.
+# Task level options are used for every host that does not set them itself.
+
+- name: "Create or update many hosts in one task."
+  checkmk.general.host:
+    server_url: "https://myserver/"
+    site: "mysite"
+    api_user: "myuser"
+    api_secret: "mysecret"
+    hosts:
+      - name: "myhost01"
+        attributes:
+          ipaddress: "192.168.0.1"
+      - name: "myhost02"
+        attributes:
+          ipaddress: "192.168.0.2"
+      - name: "myhost03"
+        folder: "/windows"
+    folder: "/linux"
+    chunk_size: 500
+    state: "present"
+
+- name: "Delete many hosts in one task."
+  checkmk.general.host:
+    server_url: "https://myserver/"
+    site: "mysite"
+    api_user: "myuser"
+    api_secret: "mysecret"
+    hosts: "{{ groups['decommissioned'] | map('community.general.dict_kv', 'name') }}"
+    state: "absent"
+
 # ---------------------------------------------------------------------------
 # Using environment variables for authentication
 # ---------------------------------------------------------------------------
@@ -300,6 +379,15 @@ msg:
     type: str
     returned: always
     sample: 'Host created.'
+hosts:
+    description: The result for every host in bulk mode, in the order of I(hosts).
+    type: list
+    elements: dict
+    returned: when I(hosts) is used
+    sample: [
+        {"name": "myhost01", "changed": true, "failed": false, "msg": "Host created"},
+        {"name": "myhost02", "changed": false, "failed": false, "msg": "Host already exists with the desired parameters."},
+    ]
 """
 
 import json
@@ -350,6 +438,10 @@ class HostHTTPCodes:
         200: (True, False, "Cluster host nodes modified"),
     }
     delete = {204: (True, False, "Host deleted")}
+    get_all = {200: (False, False, "Hosts found")}
+    bulk_create = {200: (True, False, "Host created")}
+    bulk_edit = {200: (True, False, "Host modified")}
+    bulk_delete = {204: (True, False, "Host deleted")}
 
 
 class HostEndpoints:
@@ -358,6 +450,9 @@ class HostEndpoints:
     rename = "/objects/host_config/%s/actions/rename/invoke"
     create_cluster = "/domain-types/host_config/collections/clusters"
     modify_cluster = "/objects/host_config/%s/properties/nodes"
+    bulk_create = "/domain-types/host_config/actions/bulk-create/invoke"
+    bulk_edit = "/domain-types/host_config/actions/bulk-update/invoke"
+    bulk_delete = "/domain-types/host_config/actions/bulk-delete/invoke"
 
 
 class HostAPI(CheckmkAPI):
@@ -874,13 +969,358 @@ class HostAPI(CheckmkAPI):
         return result
 
 
+class HostBulkAPI(CheckmkAPI):
+    """Manages a list of hosts with one read and chunked bulk writes"""
+
+    def __init__(self, module):
+        super().__init__(module)
+
+        self.extended_functionality = self.params.get("extended_functionality", True)
+        self.chunk_size = self.params.get("chunk_size")
+        if self.chunk_size < 1:
+            self.module.fail_json(
+                msg="ERROR: chunk_size must be at least 1, got %d!" % self.chunk_size
+            )
+
+        self.desired = self._get_desired()
+        self.current = self._get_current()
+
+        # One result per host, in the order of the 'hosts' parameter
+        self.results = dict(
+            (host["host_name"], {"changed": False, "failed": False, "msg": ""})
+            for host in self.desired
+        )
+
+        self._verify_compatibility()
+
+    def _get_desired(self):
+        desired = []
+        seen = set()
+
+        for entry in self.params.get("hosts"):
+            host = {"host_name": entry.get("name")}
+            if host["host_name"] in seen:
+                self.module.fail_json(
+                    msg="ERROR: Host %s is listed more than once!" % host["host_name"]
+                )
+            seen.add(host["host_name"])
+
+            # Task level options are the defaults for every host
+            folder = entry.get("folder") or self.params.get("folder")
+            if folder:
+                host["folder"] = normalize_folder(folder)
+
+            for key in HOST:
+                value = entry.get(key) or self.params.get(key)
+                if value:
+                    host[key] = value
+
+            for key in HOST_PARENTS_PARSE:
+                if host.get(key) and host.get(key).get("parents"):
+                    host[key]["parents"] = check_type_list(host[key].get("parents"))
+
+            desired.append(host)
+
+        return desired
+
+    def _get_current(self):
+        result = self._fetch(
+            code_mapping=HostHTTPCodes.get_all,
+            endpoint=HostEndpoints.create,
+            method="GET",
+        )
+
+        current = {}
+        for el in json.loads(result.content).get("value", []):
+            extensions = el.get("extensions", {})
+            attributes = extensions.get("attributes", {})
+            attributes.pop("meta_data", None)
+            attributes.pop("network_scan_results", None)
+            current[el.get("id")] = {
+                "folder": normalize_folder(extensions.get("folder", "/")),
+                "attributes": attributes,
+            }
+
+        return current
+
+    def _verify_compatibility(self):
+        # Same check as in single mode, but with only one version probe for all hosts
+        if any(sum([1 for key in HOST if host.get(key)]) > 1 for host in self.desired):
+            ver = self.getversion()
+            msg = (
+                "As of Check MK v2.2.0p7 and v2.3.0b1, simultaneous use of"
+                " attributes, remove_attributes, and update_attributes is no longer supported."
+            )
+
+            if ver >= CheckmkVersion("2.2.0p7"):
+                self.module.fail_json(msg=msg)
+            else:
+                self.module.warn(msg)
+
+    def _set_result(self, host_name, changed=False, failed=False, msg=""):
+        self.results[host_name] = {"changed": changed, "failed": failed, "msg": msg}
+
+    def _detect_changes(self, host, current):
+        """Returns the changes of one existing host and the bulk-update entry"""
+        current_attributes = current.get("attributes", {})
+        entry = {"host_name": host["host_name"]}
+        changes = []
+
+        if host.get("attributes") and current_attributes != host.get("attributes"):
+            changes.append("attributes: %s" % json.dumps(host.get("attributes")))
+            entry["attributes"] = host.get("attributes")
+
+        if host.get("update_attributes"):
+            merged_attributes = dict_merge(
+                current_attributes, host.get("update_attributes")
+            )
+            if merged_attributes != current_attributes:
+                try:
+                    c_m, m_c = recursive_diff(current_attributes, merged_attributes)
+                    changes.append("update attributes: %s" % json.dumps(m_c))
+                except Exception:
+                    changes.append("update attributes")
+                entry["update_attributes"] = (
+                    merged_attributes
+                    if self.extended_functionality
+                    else host.get("update_attributes")
+                )
+
+        if host.get("remove_attributes"):
+            if not isinstance(host.get("remove_attributes"), list):
+                raise ValueError(
+                    "The parameter remove_attributes must be a list of strings in bulk mode!"
+                )
+            removes_which = [
+                a for a in host.get("remove_attributes") if current_attributes.get(a)
+            ]
+            if removes_which:
+                changes.append("remove attributes: %s" % " ".join(removes_which))
+                entry["remove_attributes"] = (
+                    removes_which
+                    if self.extended_functionality
+                    else host.get("remove_attributes")
+                )
+
+        return changes, entry
+
+    def _plan(self):
+        plan = {"create": [], "edit": [], "move": [], "delete": []}
+        state = self.params.get("state")
+
+        for host in self.desired:
+            host_name = host["host_name"]
+            current = self.current.get(host_name)
+
+            if state == "absent":
+                if current:
+                    plan["delete"].append(host_name)
+                else:
+                    self._set_result(host_name, msg="Host already absent.")
+                continue
+
+            if not current:
+                entry = {
+                    "host_name": host_name,
+                    "folder": host.get("folder", normalize_folder("/")),
+                    "attributes": host.get("attributes")
+                    or host.get("update_attributes", {}),
+                }
+                plan["create"].append(entry)
+                continue
+
+            try:
+                changes, entry = self._detect_changes(host, current)
+            except ValueError as e:
+                self._set_result(host_name, failed=True, msg="ERROR: %s" % str(e))
+                continue
+
+            move = host.get("folder") and host.get("folder") != current.get("folder")
+            if move and changes:
+                self._set_result(
+                    host_name,
+                    failed=True,
+                    msg=(
+                        "ERROR: The folder parameter is different from the folder in which"
+                        " the host is located, while other parameters are also specified!"
+                    ),
+                )
+            elif move:
+                plan["move"].append(
+                    {"host_name": host_name, "target_folder": host.get("folder")}
+                )
+            elif changes:
+                plan["edit"].append((entry, changes))
+            else:
+                self._set_result(
+                    host_name, msg="Host already exists with the desired parameters."
+                )
+
+        return plan
+
+    def _chunks(self, entries):
+        for i in range(0, len(entries), self.chunk_size):
+            yield entries[i : i + self.chunk_size]
+
+    def _bulk_request(self, code_mapping, endpoint, method, entries, host_names, msgs):
+        for chunk, names, chunk_msgs in zip(
+            self._chunks(entries), self._chunks(host_names), self._chunks(msgs)
+        ):
+            result = self._fetch(
+                code_mapping=code_mapping,
+                endpoint=endpoint,
+                data={"entries": chunk},
+                method=method,
+                fail_on_error=False,
+            )
+            for host_name, msg in zip(names, chunk_msgs):
+                self._set_result(
+                    host_name,
+                    changed=result.changed,
+                    failed=result.failed,
+                    msg=result.msg if result.failed else msg,
+                )
+
+    def _move(self, entry):
+        host_name = entry["host_name"]
+        result = self._fetch(
+            code_mapping=HostHTTPCodes.get,
+            endpoint="%s/%s" % (HostEndpoints.default, host_name),
+            method="GET",
+            fail_on_error=False,
+        )
+        if not result.failed:
+            self.headers["If-Match"] = result.etag
+            result = self._fetch(
+                code_mapping=HostHTTPCodes.move,
+                endpoint="%s/%s/actions/move/invoke"
+                % (HostEndpoints.default, host_name),
+                data={"target_folder": entry["target_folder"]},
+                method="POST",
+                fail_on_error=False,
+            )
+            self.headers.pop("If-Match", None)
+
+        msg = result.msg
+        if not result.failed:
+            msg = "Host moved. Moved to: %s" % entry["target_folder"]
+        self._set_result(
+            host_name, changed=result.changed, failed=result.failed, msg=msg
+        )
+
+    def run(self):
+        plan = self._plan()
+
+        if self.module.check_mode:
+            for entry in plan["create"]:
+                self._set_result(
+                    entry["host_name"],
+                    changed=True,
+                    msg="Running in check mode. Would have done a create.",
+                )
+            for entry, changes in plan["edit"]:
+                self._set_result(
+                    entry["host_name"],
+                    changed=True,
+                    msg="Running in check mode. Would have done an edit. Changed: %s"
+                    % ", ".join(changes),
+                )
+            for entry in plan["move"]:
+                self._set_result(
+                    entry["host_name"],
+                    changed=True,
+                    msg="Running in check mode. Would have moved the host to: %s"
+                    % entry["target_folder"],
+                )
+            for host_name in plan["delete"]:
+                self._set_result(
+                    host_name,
+                    changed=True,
+                    msg="Running in check mode. Would have done a delete.",
+                )
+            return self.result()
+
+        self._bulk_request(
+            HostHTTPCodes.bulk_delete,
+            HostEndpoints.bulk_delete,
+            "POST",
+            plan["delete"],
+            plan["delete"],
+            ["Host deleted"] * len(plan["delete"]),
+        )
+        self._bulk_request(
+            HostHTTPCodes.bulk_create,
+            HostEndpoints.bulk_create,
+            "POST",
+            plan["create"],
+            [entry["host_name"] for entry in plan["create"]],
+            ["Host created"] * len(plan["create"]),
+        )
+        self._bulk_request(
+            HostHTTPCodes.bulk_edit,
+            HostEndpoints.bulk_edit,
+            "PUT",
+            [entry for entry, changes in plan["edit"]],
+            [entry["host_name"] for entry, changes in plan["edit"]],
+            [
+                "Host modified. Changed: %s" % ", ".join(changes)
+                for entry, changes in plan["edit"]
+            ],
+        )
+        for entry in plan["move"]:
+            self._move(entry)
+
+        return self.result()
+
+    def result(self):
+        hosts = [
+            dict(name=host["host_name"], **self.results[host["host_name"]])
+            for host in self.desired
+        ]
+
+        counts = {}
+        for host in hosts:
+            if host["failed"]:
+                key = "failed"
+            elif host["changed"]:
+                key = "changed"
+            else:
+                key = "unchanged"
+            counts[key] = counts.get(key, 0) + 1
+
+        return {
+            "changed": counts.get("changed", 0) > 0,
+            "failed": counts.get("failed", 0) > 0,
+            "msg": "Hosts changed: %d, unchanged: %d, failed: %d."
+            % (
+                counts.get("changed", 0),
+                counts.get("unchanged", 0),
+                counts.get("failed", 0),
+            ),
+            "hosts": hosts,
+        }
+
+
 def run_module():
     argument_spec = base_argument_spec()
     argument_spec.update(
         name=dict(
             type="str",
-            required=True,
+            required=False,
+        ),
+        hosts=dict(
+            type="list",
+            required=False,
+            elements="dict",
+            options=dict(
+                name=dict(type="str", required=True),
+                folder=dict(type="str", required=False),
+                attributes=dict(type="raw", required=False),
+                update_attributes=dict(type="raw", required=False),
+                remove_attributes=dict(type="raw", required=False),
+            ),
         ),
+        chunk_size=dict(type="int", required=False, default=100),
         attributes=dict(type="raw", required=False),
         remove_attributes=dict(type="raw", required=False),
         update_attributes=dict(type="raw", required=False),
@@ -899,10 +1339,20 @@ def run_module():
             ("nodes", "add_nodes"),
             ("nodes", "remove_nodes"),
             ("add_nodes", "remove_nodes"),
+            ("name", "hosts"),
+            ("hosts", "nodes"),
+            ("hosts", "add_nodes"),
+            ("hosts", "remove_nodes"),
+        ],
+        required_one_of=[
+            ("name", "hosts"),
         ],
         supports_check_mode=True,
     )
 
+    if module.params.get("hosts") is not None:
+        module.exit_json(**HostBulkAPI(module).run())
+
     # Create an API object that contains the current and desired state
     current_host = HostAPI(module)
 
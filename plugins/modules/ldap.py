@@ -1125,8 +1125,6 @@ def run_module():
 
     argument_spec = base_argument_spec()
     argument_spec.update(
-        server_url=dict(type="str", required=True),
-        site=dict(type="str", required=True),
         ldap_config=dict(
             type="dict",
             required=True,
@@ -172,13 +172,25 @@ msg:
     type: str
     returned: always
     sample: 'Done.'
+waited:
+    description: The time in seconds the module waited for the server to show the changed password.
+    type: float
+    returned: always
+    sample: 0.1
+ready:
+    description: Whether the server showed the changed password before the module stopped waiting.
+    type: bool
+    returned: always
+    sample: true
 """
 
-import time
-
 from ansible.module_utils.basic import AnsibleModule
 from ansible_collections.checkmk.general.plugins.module_utils.api import CheckmkAPI
 from ansible_collections.checkmk.general.plugins.module_utils.logger import Logger
+from ansible_collections.checkmk.general.plugins.module_utils.readiness import (
+    wait_for_object,
+    warn_if_not_ready,
+)
 from ansible_collections.checkmk.general.plugins.module_utils.types import RESULT
 from ansible_collections.checkmk.general.plugins.module_utils.utils import (
     base_argument_spec,
@@ -306,6 +318,9 @@ def run_module():
     )
 
     passwordget = PasswordsGetAPI(module, logger=logger)
+    endpoint = "/objects/password/%s" % module.params.get("name")
+    waited = 0
+    ready = True
 
     if module.params.get("state") == "present":
         version = passwordget.getversion()
@@ -314,9 +329,12 @@ def run_module():
         if result.http_code == 200:
             passwordupdate = PasswordsUpdateAPI(module, logger=logger)
             passwordupdate.headers["If-Match"] = result.etag
+            etag_before = result.etag
             result = passwordupdate.put(version)
 
-            time.sleep(3)
+            ready, waited = wait_for_object(
+                passwordget, endpoint, etag=result.etag, etag_before=etag_before
+            )
 
         elif result.http_code == 404:
             passwordcreate = PasswordsCreateAPI(module, logger=logger)
@@ -337,7 +355,7 @@ def run_module():
 
             result = passwordcreate.post(version)
 
-            time.sleep(3)
+            ready, waited = wait_for_object(passwordget, endpoint)
 
     if module.params.get("state") == "absent":
         result = passwordget.get()
@@ -347,12 +365,15 @@ def run_module():
             passworddelete.headers["If-Match"] = result.etag
             result = passworddelete.delete()
 
-            time.sleep(3)
+            ready, waited = wait_for_object(passwordget, endpoint, present=False)
 
+    warn_if_not_ready(module, ready, waited, "changed password")
     exit_module(
         module,
         result=result,
         logger=logger,
+        waited=waited,
+        ready=ready,
     )
 
 
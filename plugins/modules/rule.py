@@ -25,8 +25,10 @@ extends_documentation_fragment: [checkmk.general.common]
 
 options:
     rule:
-        description: Definition of the rule as returned by the Checkmk API.
-        required: true
+        description:
+            - Definition of the rule as returned by the Checkmk API.
+              B(Mutually exclusive with I(rules).)
+        required: false
         type: dict
         suboptions:
             rule_id:
@@ -89,9 +91,98 @@ options:
                     - Required when I(state) is C(present).
                 required: false
                 type: str
+    rules:
+        description:
+            - Manage a list of rules in one task (bulk mode).
+              Every ruleset is read once. The creates, edits, moves and deletes needed for all rules
+              are planned on this state first, and then applied in the order of the list.
+              The ETag returned by every write is used for the next write to the same rule.
+            - In check mode, the planned changes are shown as a diff.
+              B(Mutually exclusive with I(rule).)
+        required: false
+        type: list
+        elements: dict
+        version_added: "8.3.0"
+        suboptions:
+            ruleset:
+                description: Name of the ruleset of the rule. Defaults to I(ruleset) on the task level.
+                required: false
+                type: str
+            state:
+                description: State of the rule. Defaults to I(state) on the task level.
+                required: false
+                choices: ["present", "absent"]
+                type: str
+            rule:
+                description: Definition of the rule. See I(rule) on the task level.
+                required: true
+                type: dict
+                suboptions:
+                    rule_id:
+                        description:
+                            - If provided, update/delete an existing rule.
+                            - If omitted, we try to find an equal rule based on C(properties),
+                              C(conditions), C(folder) and C(value_raw).
+                            - Please mind the additional notes below.
+                        required: false
+                        type: str
+                    location:
+                        description:
+                            - Location of the rule within a folder.
+                            - By default rules are created at the bottom of the "/" folder.
+                        required: false
+                        type: dict
+                        suboptions:
+                            position:
+                                description:
+                                    - Position of the rule in the folder.
+                                    - Has no effect when I(state=absent).
+                                    - For new rule C(any) wil be equivalent to C(bottom).
+                                required: false
+                                type: str
+                                choices:
+                                    - "top"
+                                    - "bottom"
+                                    - "any"
+                                    - "before"
+                                    - "after"
+                                default: "any"
+                            neighbour:
+                                description:
+                                    - Put the rule C(before) or C(after) this rule_id.
+                                    - Required when I(position) is C(before) or C(after).
+                                    - Mutually exclusive with I(folder).
+                                required: false
+                                type: str
+                                aliases: [rule_id]
+                            folder:
+                                description:
+                                    - Folder of the rule.
+                                    - Required when I(position) is C(top), C(bottom), or (any).
+                                    - Required when I(state=absent).
+                                    - Mutually exclusive with I(neighbour).
+                                required: false
+                                default: "/"
+                                type: str
+                    conditions:
+                        description: Conditions of the rule.
+                        required: false
+                        type: dict
+                    properties:
+                        description: Properties of the rule.
+                        required: false
+                        type: dict
+                    value_raw:
+                        description:
+                            - Rule values as exported from the web interface.
+                            - Required when I(state) is C(present).
+                        required: false
+                        type: str
     ruleset:
-        description: Name of the ruleset to manage.
-        required: true
+        description:
+            - Name of the ruleset to manage.
+            - Required with I(rule). With I(rules), the default for rules that do not set it.
+        required: false
         type: str
     state:
         description: State of the rule.
@@ -282,6 +373,39 @@ EXAMPLES = r"""
   loop_control:
     label: "{{ item.id }}"
 
+# ---------------------------------------------------------------------------
+# Bulk mode
+# ---------------------------------------------------------------------------
+# Every ruleset is read once, all changes are planned and then applied in order.
+# Run with --check --diff to review the plan.
+
+- name: "Manage several rules in one task."
+  checkmk.general.rule:
+    server_url: "https://myserver/"
+    site: "mysite"
+    api_user: "myuser"
+    api_secret: "mysecret"
+    ruleset: "checkgroup_parameters:memory_percentage_used"
+    rules:
+      - rule:
+          properties:
+            description: "Allow higher memory usage"
+            comment: "Managed by Ansible"
+          value_raw: "{'levels': (80.0, 90.0)}"
+          location:
+            folder: "/linux"
+            position: "top"
+      - ruleset: "checkgroup_parameters:filesystem"
+        rule:
+          properties:
+            description: "Allow fuller filesystems"
+            comment: "Managed by Ansible"
+          value_raw: "{'levels': (90.0, 95.0)}"
+      - rule:
+          rule_id: "{{ obsolete_rule_id }}"
+        state: "absent"
+    state: "present"
+
 # ---------------------------------------------------------------------------
 # Using environment variables for authentication
 # ---------------------------------------------------------------------------
@@ -318,6 +442,19 @@ msg:
     type: str
     returned: always
     sample: 'Rule created.'
+rules:
+    description: The result for every rule in bulk mode, in the order of I(rules).
+    type: list
+    elements: dict
+    returned: when I(rules) is used
+    sample: [
+        {"ruleset": "checkgroup_parameters:filesystem", "rule_id": "1f97bc43-52dc-4f1a-ab7b-c2e9553958ab",
+         "state": "present", "actions": ["create", "move"], "changed": true, "failed": false,
+         "msg": "Rule created; Rule moved"},
+        {"ruleset": "checkgroup_parameters:filesystem", "rule_id": "f0c48b5c-b6c2-4d4c-a1b5-2c4e5f3a9c9f",
+         "state": "present", "actions": [], "changed": false, "failed": false,
+         "msg": "Rule already exists with the desired parameters."},
+    ]
 http_code:
     description: The HTTP code the Checkmk API returns.
     type: int
@@ -369,6 +506,7 @@ content:
                     returned: when the rule is created or when it already exists
 """
 
+import copy
 import json
 from ast import literal_eval
 
@@ -480,46 +618,178 @@ class RuleEndpoints:
     create = "/domain-types/rule/collections/all"
 
 
-# Get complete ruleset of current rule
-class RuleLocation(CheckmkAPI):
-    def __init__(self, module, folder, rule_id):
-        super().__init__(module)
-        self.module = module
-        self.params = module.params
-
-        self.folder = folder
-        self.rule_id = rule_id
-
-        self.ruleset = self.params.get("ruleset")
-
-        self.rule_dict = self._get_ruleset(self.ruleset)
-        self.folder_rule_list = [
-            k for k, v in self.rule_dict.items() if v == self.folder
-        ]
-        self.folder_index = self.folder_rule_list.index(self.rule_id)
-        self.folder_size = len(self.folder_rule_list)
-
-    def _build_default_endpoint(self):
-        return "%s/%s" % (
-            RuleEndpoints.default,
-            self.ruleset,
-        )
-
-    def _get_ruleset(self, ruleset):
-        result = self._fetch(
+def _freeze(data):
+    """Hashable representation of data that compares like data itself"""
+    if isinstance(data, dict):
+        return (dict, frozenset((k, _freeze(v)) for k, v in data.items()))
+    if isinstance(data, (list, tuple)):
+        return (list, tuple(_freeze(v) for v in data))
+    if isinstance(data, (set, frozenset)):
+        return (set, frozenset(_freeze(v) for v in data))
+    return data
+
+
+class RulesetSnapshot:
+    """All rules of a ruleset, fetched once per run.
+
+    Every part of the module that needs the rules of the ruleset reads them
+    from here, so the collection is only transferred and parsed once. After
+    a write to the ruleset, call invalidate() and the next read fetches it
+    again, or apply the write with add(), update(), move() or remove().
+    """
+
+    def __init__(self, api, ruleset):
+        self.api = api
+        self.ruleset = ruleset
+        self._rules = None
+        self._rules_by_id = {}
+        self._folder_rules = {}
+        self._folder_index = {}
+        self._fingerprints = None
+        self._fingerprint_of = None
+        self._rule_fingerprints = {}
+
+    def _load(self):
+        result = self.api._fetch(
             code_mapping=RuleHTTPCodes.list_rules,
             endpoint=RuleEndpoints.create + "?ruleset_name=" + self.ruleset,
             method="GET",
         )
 
+        rules = []
         if result.http_code == 200:
-            content = json.loads(result.content)
-            return {
-                r.get("id"): r.get("extensions", {}).get("folder")
-                for r in content.get("value")
-            }
+            rules = json.loads(result.content).get("value") or []
+
+        self._rules = rules
+        self._fingerprints = None
+        self._rule_fingerprints = {}
+        self._rules_by_id = {}
+        self._folder_rules = {}
+        self._folder_index = {}
+        for rule in rules:
+            rule_id = rule.get("id")
+            folder_rules = self._folder_rules.setdefault(
+                rule.get("extensions", {}).get("folder"), []
+            )
+            self._rules_by_id[rule_id] = rule
+            self._folder_index[rule_id] = len(folder_rules)
+            folder_rules.append(rule_id)
+
+    def _ensure_loaded(self):
+        if self._rules is None:
+            self._load()
+
+    def invalidate(self):
+        self._rules = None
+
+    @property
+    def rules(self):
+        """The rules of the ruleset, in the order of the ruleset"""
+        self._ensure_loaded()
+        return self._rules
+
+    def get(self, rule_id):
+        """The rule with the given id, or None"""
+        self._ensure_loaded()
+        return self._rules_by_id.get(rule_id)
+
+    def find(self, fingerprint, fingerprint_of):
+        """The id of the first rule whose fingerprint_of(rule) equals the
+        given fingerprint, or None.
+
+        The fingerprints of all rules are computed once per snapshot and
+        kept in a hash index, so every lookup is a dict access.
+        """
+        self._ensure_loaded()
+        if self._fingerprints is None:
+            self._fingerprint_of = fingerprint_of
+            self._fingerprints = {}
+            for rule in self._rules:
+                self._add_fingerprint(rule)
+
+        for rule_id in self._fingerprints.get(fingerprint, []):
+            # Rules changed or removed by the methods below leave stale entries
+            if self._rule_fingerprints.get(rule_id) == fingerprint:
+                return rule_id
+        return None
 
-        return {}
+    def _add_fingerprint(self, rule):
+        if self._fingerprints is None:
+            return
+        fingerprint = self._fingerprint_of(rule)
+        self._rule_fingerprints[rule.get("id")] = fingerprint
+        self._fingerprints.setdefault(fingerprint, []).append(rule.get("id"))
+
+    def folder_rules(self, folder):
+        """The ids of the rules in a folder, in the order of the folder"""
+        self._ensure_loaded()
+        return self._folder_rules.get(folder, [])
+
+    def folder_index(self, rule_id):
+        """The position of a rule within its folder"""
+        self._ensure_loaded()
+        return self._folder_index[rule_id]
+
+    # The methods below apply a write to the snapshot instead of fetching
+    # the ruleset again, so a sequence of writes can be planned on it.
+
+    def _place(self, rule_id, folder, folder_index=None):
+        folder_rules = self._folder_rules.setdefault(folder, [])
+        if folder_index is None:
+            folder_index = len(folder_rules)
+        folder_rules.insert(folder_index, rule_id)
+        for index in range(folder_index, len(folder_rules)):
+            self._folder_index[folder_rules[index]] = index
+
+    def _unplace(self, rule_id):
+        folder_rules = self._folder_rules[self._folder_of(rule_id)]
+        folder_index = self._folder_index.pop(rule_id)
+        del folder_rules[folder_index]
+        for index in range(folder_index, len(folder_rules)):
+            self._folder_index[folder_rules[index]] = index
+
+    def _folder_of(self, rule_id):
+        return self._rules_by_id[rule_id].get("extensions", {}).get("folder")
+
+    def add(self, rule):
+        """Add a rule at the bottom of its folder, like a create does"""
+        self._ensure_loaded()
+        self._rules.append(rule)
+        self._rules_by_id[rule.get("id")] = rule
+        self._place(rule.get("id"), rule.get("extensions", {}).get("folder"))
+        self._add_fingerprint(rule)
+
+    def update(self, rule_id, extensions):
+        """Update the extensions of a rule"""
+        self._ensure_loaded()
+        rule = self._rules_by_id[rule_id]
+        rule["extensions"] = dict(rule.get("extensions", {}), **extensions)
+        self._add_fingerprint(rule)
+
+    def move(self, rule_id, folder, folder_index=None):
+        """Move a rule to the given position of a folder, or to its bottom"""
+        self._ensure_loaded()
+        self._unplace(rule_id)
+        self.update(rule_id, {"folder": folder})
+        self._place(rule_id, folder, folder_index)
+
+    def remove(self, rule_id):
+        """Remove a rule"""
+        self._ensure_loaded()
+        self._unplace(rule_id)
+        self._rules.remove(self._rules_by_id.pop(rule_id))
+        self._rule_fingerprints.pop(rule_id, None)
+
+
+# Location of the current rule within its folder
+class RuleLocation:
+    def __init__(self, snapshot, folder, rule_id):
+        self.folder = folder
+        self.rule_id = rule_id
+
+        self.folder_rule_list = snapshot.folder_rules(self.folder)
+        self.folder_index = snapshot.folder_index(self.rule_id)
+        self.folder_size = len(self.folder_rule_list)
 
     def is_equal(self, desired_location):
         desired_folder = desired_location.get("folder")
@@ -569,19 +839,25 @@ class RuleAPI(CheckmkAPI):
 
         self.module = module
         self.params = self.module.params
-        self.rule_id = self.params.get("rule").get("rule_id")
-        self.is_new_rule = self.rule_id is None
 
         if self.getversion() < CheckmkVersion("2.3.0"):
             self.version_select_str = "pre_230"
         else:
             self.version_select_str = "230_or_newer"
 
+        self._setup()
+
+    def _setup(self):
+        """Set up the rule given by the module parameters"""
+        self.rule_id = self.params.get("rule").get("rule_id")
+        self.is_new_rule = self.rule_id is None
+
         self.desired = self._clean_desired(self.params)
 
         self._changed_items = []
         self.current = None
         self.etag = ""
+        self.snapshot = RulesetSnapshot(self, self.desired.get("ruleset"))
 
         self._verify_parameters()
 
@@ -604,6 +880,14 @@ class RuleAPI(CheckmkAPI):
         neighbour_id = self.params.get("rule", {}).get("location", {}).get("neighbour")
 
         if neighbour_id:
+            neighbour = self.snapshot.get(neighbour_id)
+            if neighbour:
+                self.desired["rule"]["location"]["folder"] = neighbour.get(
+                    "extensions", {}
+                ).get("folder")
+                return
+
+            # The neighbour may still exist in another ruleset
             neighbour, state, result = self._get_rule_by_id(neighbour_id)
 
             if state == "absent":
@@ -653,7 +937,7 @@ class RuleAPI(CheckmkAPI):
 
         return desired
 
-    def _raw_value_eval(self, state, data):
+    def _literal_value(self, data):
         value_raw = data.get("value_raw", "''")
 
         # This is an ugly hack that translates tuples into lists to have a better hit rate with
@@ -662,43 +946,53 @@ class RuleAPI(CheckmkAPI):
         value_raw = value_raw.translate(str.maketrans("()", "[]"))
 
         # As safely as possible evaluate the value_raw
+        return literal_eval(value_raw)
+
+    def _raw_value_eval(self, state, data):
         try:
-            return literal_eval(value_raw)
+            return self._literal_value(data)
 
         except Exception as e:
             self.module.fail_json(
                 msg="ERROR: The %s value_raw has invalid format: %s" % (state, e)
             )
 
-    def _get_rules_in_ruleset(self, ruleset):
-        result = self._fetch(
-            code_mapping=RuleHTTPCodes.list_rules,
-            endpoint=RuleEndpoints.create + "?ruleset_name=" + ruleset,
-            method="GET",
-        )
-
-        if result.http_code == 200:
-            content = json.loads(result.content)
-            return content.get("value")
-
-        return []
-
     def _get_rule_id(self, desired):
-        d = desired.copy()
-        d["rule"] = self._normalize_rule(desired.get("rule"))
-
-        for c in self._get_rules_in_ruleset(d.get("ruleset")):
-            c = self._normalize_rule(c)
-            if (
-                c["extensions"]["folder"] == d["rule"]["location"]["folder"]
-                and c["extensions"]["conditions"] == d["rule"].get("conditions")
-                and c["extensions"]["properties"] == d["rule"].get("properties")
-                and self._raw_value_eval("search", c["extensions"])
-                == self._raw_value_eval("desired", d["rule"])
-            ):
-                return c["id"]
+        rule = desired.get("rule")
+        fingerprint = self._fingerprint(
+            rule.get("location", {}).get("folder"),
+            rule,
+            self._raw_value_eval("desired", rule),
+        )
+        return self.snapshot.find(fingerprint, self._rule_fingerprint)
 
-        return None
+    def _rule_fingerprint(self, rule):
+        extensions = rule.get("extensions", {})
+        try:
+            value = self._literal_value(extensions)
+        except Exception:
+            # A rule whose value cannot be parsed never equals a desired rule.
+            # It must not fail the tasks on the other rules of the ruleset.
+            return object()
+        return self._fingerprint(extensions.get("folder"), extensions, value)
+
+    def _fingerprint(self, folder, rule, value):
+        """Canonical, hashable form of the folder, conditions, properties and
+        value of a rule. Two rules have the same fingerprint if they are equal
+        after _normalize_rule()."""
+        normalized = []
+        for what in ("conditions", "properties"):
+            data = rule.get(what)
+            ignore = IGNORE_DEFAULTS[self.version_select_str].get(what)
+            if data and ignore:
+                data = {
+                    key: value
+                    for key, value in data.items()
+                    if not (key in ignore and value == ignore[key])
+                }
+            normalized.append(_freeze(data))
+
+        return (folder, normalized[0], normalized[1], _freeze(value))
 
     def _normalize_rule(self, r):
         loc = r.copy()
@@ -714,9 +1008,7 @@ class RuleAPI(CheckmkAPI):
                         ext[what].pop(key, None)
         return loc
 
-    def _detect_changes(self):
-        c = self._normalize_rule(self.current["rule"])
-        d = self._normalize_rule(self.desired.get("rule"))
+    def _detect_content_changes(self, c, d):
         changes = []
 
         if c.get("conditions", {}) != d.get("conditions", {}):
@@ -728,9 +1020,16 @@ class RuleAPI(CheckmkAPI):
         if self._raw_value_eval("current", c) != self._raw_value_eval("desired", d):
             changes.append("raw_value")
 
+        return changes
+
+    def _detect_changes(self):
+        c = self._normalize_rule(self.current["rule"])
+        d = self._normalize_rule(self.desired.get("rule"))
+        changes = self._detect_content_changes(c, d)
+
         desired_location = d.get("location")
         if desired_location:
-            c = RuleLocation(self.module, c.get("folder", "/"), self.rule_id)
+            c = RuleLocation(self.snapshot, c.get("folder", "/"), self.rule_id)
 
             if not c.is_equal(desired_location):
                 changes.append("location")
@@ -827,12 +1126,14 @@ class RuleAPI(CheckmkAPI):
         if self.module.check_mode:
             return self._check_output("move")
 
-        return self._fetch(
+        move_result = self._fetch(
             code_mapping=RuleHTTPCodes.move,
             endpoint=self._build_default_endpoint() + "/actions/move/invoke",
             data=data,
             method="POST",
         )
+        self.snapshot.invalidate()
+        return move_result
 
     def _merge_results(self, results):
         return RESULT(
@@ -873,6 +1174,7 @@ class RuleAPI(CheckmkAPI):
 
         if create_result.failed:
             return create_result
+        self.snapshot.invalidate()
 
         content = json.loads(create_result.content)
         self.rule_id = content.get("id")
@@ -910,6 +1212,7 @@ class RuleAPI(CheckmkAPI):
 
         if edit_result.failed:
             return edit_result
+        self.snapshot.invalidate()
 
         move_result = self._move_if_needed()
         if move_result:
@@ -926,52 +1229,433 @@ class RuleAPI(CheckmkAPI):
             endpoint=self._build_default_endpoint(),
             method="DELETE",
         )
+        self.snapshot.invalidate()
+
+        return result
+
+
+class RuleBulkAPI(RuleAPI):
+    """Manages a list of rules, with one read per ruleset.
+
+    All writes are planned first, on one RulesetSnapshot per ruleset. Every
+    planned write is applied to the snapshot, so the following rules are
+    compared with the state the ruleset will have at that point. The plan is
+    then applied in the order of the 'rules' parameter.
+    """
+
+    def _setup(self):
+        """Set up the list of rules given by the module parameters"""
+        self.snapshots = {}
+        # Placeholders of the rules to be created, and their ids once created
+        self._new_rules = {}
+        # The ETag of the last write to a rule, sent with the next write to it
+        self._etags = {}
+
+        self.desired = self._get_desired()
+
+    def _get_desired(self):
+        desired = []
+
+        for entry in self.params.get("rules"):
+            # Task level options are the defaults for every rule
+            ruleset = entry.get("ruleset") or self.params.get("ruleset")
+            if not ruleset:
+                self.module.fail_json(
+                    msg="ERROR: Every rule needs a ruleset, on the rule or the task level!"
+                )
+
+            rule = self._clean_desired({"ruleset": ruleset, "rule": entry.get("rule")})
+            desired.append(
+                {
+                    "ruleset": ruleset,
+                    "rule": rule["rule"],
+                    "rule_id": entry.get("rule").get("rule_id"),
+                    "state": entry.get("state") or self.params.get("state"),
+                    "actions": [],
+                    "changes": [],
+                    "diff": None,
+                    "changed": False,
+                    "failed": False,
+                    "msg": "",
+                }
+            )
+
+        return desired
+
+    def _get_snapshot(self, ruleset):
+        if ruleset not in self.snapshots:
+            self.snapshots[ruleset] = RulesetSnapshot(self, ruleset)
+        return self.snapshots[ruleset]
+
+    def _rule_id(self, rule_id):
+        """The id of a rule, None for a rule that is not created yet"""
+        if rule_id in self._new_rules:
+            return self._new_rules[rule_id]
+        return rule_id
+
+    def _diff_state(self, snapshot, rule_id):
+        extensions = snapshot.get(rule_id).get("extensions", {})
+        state = {key: extensions.get(key) for key in CURRENT_RULE_KEYS}
+        state["folder_index"] = snapshot.folder_index(rule_id)
+        return state
+
+    def _move_target(self, snapshot, rule_id, location):
+        """The folder and the index within the folder a move puts the rule at"""
+        position = location.get("position")
+        if position in ["before", "after"]:
+            neighbour = location.get("neighbour")
+            if snapshot.get(neighbour) is None:
+                # The position next to a rule of another ruleset is not known
+                return location.get("folder"), None
+            folder = snapshot.get(neighbour).get("extensions", {}).get("folder")
+            folder_rules = [r for r in snapshot.folder_rules(folder) if r != rule_id]
+            index = folder_rules.index(neighbour)
+            return folder, index + 1 if position == "after" else index
+
+        return location.get("folder"), 0 if position == "top" else None
+
+    def _move_data(self, location):
+        pos = location.get("position")
+        data = {"position": POSITION_MAPPING[pos]}
+        if pos in ["before", "after"]:
+            data["rule_id"] = location.get("neighbour")
+        else:
+            data["folder"] = location.get("folder", "/")
+        return data
+
+    def _plan(self, entry):
+        """Plan the writes for one rule and apply them to the snapshot"""
+        snapshot = self._get_snapshot(entry["ruleset"])
+        rule = entry["rule"]
+        location = rule.get("location", {})
+        state = entry["state"]
+
+        conditions = rule.get("conditions", {})
+        if self.version_select_str == "pre_230" and (
+            "host_label_groups" in conditions or "service_label_groups" in conditions
+        ):
+            entry.update(
+                failed=True,
+                msg="ERROR: label groups are only available from Checkmk 2.3.0 on.",
+            )
+            return
+
+        neighbour_id = location.get("neighbour")
+        neighbour = snapshot.get(neighbour_id)
+        if neighbour:
+            location["folder"] = neighbour.get("extensions", {}).get("folder")
+        elif neighbour_id and state == "present":
+            # Like in single mode, the neighbour may still exist in another ruleset
+            neighbour, neighbour_state, result = self._get_rule_by_id(neighbour_id)
+            if neighbour_state == "absent":
+                self.module.warn(
+                    "Specified neighbour: '%s' does not exist" % neighbour_id
+                )
+            else:
+                location["folder"] = neighbour.get("rule", {}).get("folder")
+
+        rule_id = entry["rule_id"]
+        if not rule_id:
+            rule_id = snapshot.find(
+                self._fingerprint(
+                    location.get("folder"),
+                    rule,
+                    self._raw_value_eval("desired", rule),
+                ),
+                self._rule_fingerprint,
+            )
+        current = snapshot.get(rule_id) if rule_id else None
+
+        if state == "absent":
+            if current is None:
+                entry.update(msg="Rule already absent.")
+                return
+            entry.update(
+                rule_id=rule_id, diff=(self._diff_state(snapshot, rule_id), {})
+            )
+            entry["actions"].append(("delete", None))
+            snapshot.remove(rule_id)
+            return
+
+        if current is None and rule_id:
+            entry.update(failed=True, msg="The provided rule_id was not found.")
+            return
+
+        # Validate before anything is planned or applied to the snapshot
+        if rule_id and location.get("neighbour") == rule_id:
+            entry.update(failed=True, msg="ERROR: A rule cannot be its own neighbour.")
+            return
+
+        if current is None:
+            before = {}
+            entry["actions"].append(("create", None))
+        else:
+            before = self._diff_state(snapshot, rule_id)
+            entry["changes"] = self._detect_content_changes(
+                self._normalize_rule(copy.deepcopy(current.get("extensions", {}))),
+                self._normalize_rule(copy.deepcopy(rule)),
+            )
+            if entry["changes"]:
+                entry["actions"].append(("edit", None))
+
+        if entry["actions"] and not rule.get("value_raw"):
+            entry.update(
+                actions=[],
+                failed=True,
+                msg="ERROR: The parameter value_raw is mandatory when 'state is present'.",
+            )
+            return
+
+        data = {key: value for key, value in rule.items() if key != "location"}
+        if current is None:
+            rule_id = "new rule %d" % len(self._new_rules)
+            self._new_rules[rule_id] = None
+            data["ruleset"] = entry["ruleset"]
+            data["folder"] = location.get("folder", "/")
+            entry["actions"][0] = ("create", data)
+            snapshot.add({"id": rule_id, "extensions": dict(data)})
+        elif entry["changes"]:
+            entry["actions"][0] = ("edit", data)
+            snapshot.update(rule_id, data)
+
+        folder = snapshot.get(rule_id).get("extensions", {}).get("folder")
+        if location and not RuleLocation(snapshot, folder, rule_id).is_equal(location):
+            entry["actions"].append(("move", self._move_data(location)))
+            folder, folder_index = self._move_target(snapshot, rule_id, location)
+            snapshot.move(rule_id, folder, folder_index)
+
+        entry["rule_id"] = rule_id
+        if entry["actions"]:
+            entry["diff"] = (before, self._diff_state(snapshot, rule_id))
+        else:
+            entry["msg"] = "Rule already exists with the desired parameters."
+
+    def _write(self, action, rule_id, data):
+        if action == "create":
+            return self._fetch(
+                code_mapping=RuleHTTPCodes.create,
+                endpoint=RuleEndpoints.create,
+                data=data,
+                method="POST",
+                fail_on_error=False,
+            )
+
+        etag = self._etags.get(rule_id)
+        if action == "edit" and not etag:
+            result = self._fetch(
+                code_mapping=RuleHTTPCodes.get,
+                endpoint=self._build_default_endpoint(rule_id),
+                method="GET",
+                fail_on_error=False,
+            )
+            if result.failed:
+                return result
+            etag = result.etag
+
+        if etag:
+            self.headers["If-Match"] = etag
+
+        if action == "edit":
+            result = self._fetch(
+                code_mapping=RuleHTTPCodes.edit,
+                endpoint=self._build_default_endpoint(rule_id),
+                data=data,
+                method="PUT",
+                fail_on_error=False,
+            )
+        elif action == "move":
+            result = self._fetch(
+                code_mapping=RuleHTTPCodes.move,
+                endpoint=self._build_default_endpoint(rule_id) + "/actions/move/invoke",
+                data=data,
+                method="POST",
+                fail_on_error=False,
+            )
+        else:
+            result = self._fetch(
+                code_mapping=RuleHTTPCodes.delete,
+                endpoint=self._build_default_endpoint(rule_id),
+                method="DELETE",
+                fail_on_error=False,
+            )
 
+        self.headers.pop("If-Match", None)
+        return result
+
+    def _apply(self, entry):
+        msgs = []
+
+        for action, data in entry["actions"]:
+            rule_id = self._rule_id(entry["rule_id"])
+            result = self._write(action, rule_id, data)
+
+            if result.failed:
+                entry.update(
+                    failed=True,
+                    msg="; ".join(msgs + ["ERROR: %s" % result.msg]),
+                )
+                return
+
+            if action == "create":
+                rule_id = json.loads(result.content).get("id")
+                self._new_rules[entry["rule_id"]] = rule_id
+                msgs.append("Rule created")
+            elif action == "edit":
+                msgs.append("Rule modified. Changed: %s" % ", ".join(entry["changes"]))
+            elif action == "move":
+                msgs.append("Rule moved")
+            else:
+                msgs.append("Rule deleted")
+
+            # The ETag of every write is the If-Match of the next write to the rule
+            self._etags[rule_id] = result.etag
+            entry["changed"] = True
+
+        entry["msg"] = "; ".join(msgs)
+
+    def run(self):
+        # Planning reads every ruleset once, when its first rule is planned
+        for entry in self.desired:
+            self._plan(entry)
+
+        for entry in self.desired:
+            if not entry["actions"]:
+                continue
+
+            if self.module.check_mode:
+                entry.update(
+                    changed=True,
+                    msg="Running in check mode. Would have done: %s."
+                    % ", ".join(action for action, data in entry["actions"]),
+                )
+            else:
+                self._apply(entry)
+
+        return self.result()
+
+    def result(self):
+        rules = []
+        diff = []
+        counts = {}
+
+        for entry in self.desired:
+            rule_id = self._rule_id(entry["rule_id"])
+            rules.append(
+                {
+                    "ruleset": entry["ruleset"],
+                    "rule_id": rule_id,
+                    "state": entry["state"],
+                    "actions": [action for action, data in entry["actions"]],
+                    "changed": entry["changed"],
+                    "failed": entry["failed"],
+                    "msg": entry["msg"],
+                }
+            )
+
+            if entry["diff"]:
+                header = "%s %s" % (entry["ruleset"], rule_id or "(new rule)")
+                diff.append(
+                    {
+                        "before_header": header,
+                        "after_header": header,
+                        "before": entry["diff"][0],
+                        "after": entry["diff"][1],
+                    }
+                )
+
+            if entry["failed"]:
+                key = "failed"
+            elif entry["changed"]:
+                key = "changed"
+            else:
+                key = "unchanged"
+            counts[key] = counts.get(key, 0) + 1
+
+        result = {
+            "changed": counts.get("changed", 0) > 0,
+            "failed": counts.get("failed", 0) > 0,
+            "msg": "Rules changed: %d, unchanged: %d, failed: %d."
+            % (
+                counts.get("changed", 0),
+                counts.get("unchanged", 0),
+                counts.get("failed", 0),
+            ),
+            "rules": rules,
+        }
+        if self.module._diff:
+            result["diff"] = diff
         return result
 
 
 def run_module():
+    rule_options = dict(
+        rule_id=dict(type="str", default=None),
+        conditions=dict(type="dict"),
+        properties=dict(type="dict"),
+        value_raw=dict(type="str"),
+        location=dict(
+            type="dict",
+            options=dict(
+                position=dict(
+                    type="str",
+                    choices=["top", "bottom", "any", "before", "after"],
+                    default="any",
+                ),
+                folder=dict(
+                    type="str",
+                    default="/",
+                ),
+                neighbour=dict(type="str", aliases=["rule_id"]),
+            ),
+            required_if=[
+                ("position", "top", ("folder",)),
+                ("position", "bottom", ("folder",)),
+                ("position", "any", ("folder",)),
+                ("position", "before", ("neighbour",)),
+                ("position", "after", ("neighbour",)),
+            ],
+            mutually_exclusive=[("folder", "neighbour")],
+            apply_defaults=True,
+        ),
+    )
+
     argument_spec = base_argument_spec()
     argument_spec.update(
-        ruleset=dict(type="str", required=True),
+        ruleset=dict(type="str", required=False),
         rule=dict(
             type="dict",
-            required=True,
+            required=False,
+            options=rule_options,
+        ),
+        rules=dict(
+            type="list",
+            required=False,
+            elements="dict",
             options=dict(
-                rule_id=dict(type="str", default=None),
-                conditions=dict(type="dict"),
-                properties=dict(type="dict"),
-                value_raw=dict(type="str"),
-                location=dict(
-                    type="dict",
-                    options=dict(
-                        position=dict(
-                            type="str",
-                            choices=["top", "bottom", "any", "before", "after"],
-                            default="any",
-                        ),
-                        folder=dict(
-                            type="str",
-                            default="/",
-                        ),
-                        neighbour=dict(type="str", aliases=["rule_id"]),
-                    ),
-                    required_if=[
-                        ("position", "top", ("folder",)),
-                        ("position", "bottom", ("folder",)),
-                        ("position", "any", ("folder",)),
-                        ("position", "before", ("neighbour",)),
-                        ("position", "after", ("neighbour",)),
-                    ],
-                    mutually_exclusive=[("folder", "neighbour")],
-                    apply_defaults=True,
-                ),
+                ruleset=dict(type="str", required=False),
+                rule=dict(type="dict", required=True, options=rule_options),
+                state=dict(type="str", required=False, choices=["present", "absent"]),
             ),
         ),
         state=dict(type="str", default="present", choices=["present", "absent"]),
     )
 
-    module = AnsibleModule(argument_spec=argument_spec, supports_check_mode=True)
+    module = AnsibleModule(
+        argument_spec=argument_spec,
+        mutually_exclusive=[
+            ("rule", "rules"),
+        ],
+        required_one_of=[
+            ("rule", "rules"),
+        ],
+        required_by={
+            "rule": ("ruleset",),
+        },
+        supports_check_mode=True,
+    )
+
+    if module.params.get("rules") is not None:
+        module.exit_json(**RuleBulkAPI(module).run())
 
     # Create an API object that contains the current and desired state
     current_rule = RuleAPI(module)
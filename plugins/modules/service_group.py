@@ -172,8 +172,14 @@ import json
 
 from ansible.module_utils.basic import AnsibleModule
 from ansible.module_utils.urls import fetch_url
+from ansible_collections.checkmk.general.plugins.module_utils.groups import (
+    parse_group_collection,
+    reconcile_groups,
+)
 from ansible_collections.checkmk.general.plugins.module_utils.utils import (
     base_argument_spec,
+    check_connection_params,
+    invalidate_lookup_cache_on_change,
 )
 
 
@@ -183,6 +189,7 @@ def exit_failed(module, msg):
 
 
 def exit_changed(module, msg):
+    invalidate_lookup_cache_on_change(module)
     result = {"msg": msg, "changed": True, "failed": False}
     module.exit_json(**result)
 
@@ -223,7 +230,7 @@ def get_current_single_service_group(module, base_url, headers):
 
 
 def get_current_service_groups(module, base_url, headers):
-    current_groups = []
+    current_groups = {}
 
     api_endpoint = "/domain-types/service_group_config/collections/all"
     url = base_url + api_endpoint
@@ -231,26 +238,9 @@ def get_current_service_groups(module, base_url, headers):
     response, info = fetch_url(module, url, headers=headers, method="GET")
 
     if info["status"] == 200:
-        body = json.loads(response.read())
-        tmp = body.get("value", [])
-        # Response from 2.2.0 is different. So this should fix it until module is migrated to new CheckMKAPI
-        for el in tmp:
-            if el.get("domainType") == "service_group_config":  # 2.2.0
-                current_groups = [
-                    {
-                        "name": el.get("id"),
-                        "title": el.get("title", el.get("name")),
-                    }
-                    for el in tmp
-                ]
-            else:  # 2.0.0 and 2.1.0
-                current_groups = [
-                    {
-                        "name": el.get("href").rsplit("/", 1)[-1],
-                        "title": el.get("title", el.get("name")),
-                    }
-                    for el in tmp
-                ]
+        current_groups = parse_group_collection(
+            json.loads(response.read()), "service_group_config"
+        )
     else:
         exit_failed(
             module,
@@ -430,6 +420,7 @@ def run_module():
         ],
         supports_check_mode=False,
     )
+    check_connection_params(module, connection_plugin_supported=False)
 
     # Use the parameters to initialize some common variables
     headers = {
@@ -466,68 +457,43 @@ def run_module():
         # Determine which service groups do already exest
         current_groups = get_current_service_groups(module, base_url, headers)
 
-        # Determine intersection and difference with input, according to 'name' only
-        if len(set([el.get("name") for el in groups])) != len(groups):
-            exit_failed(module, "two or more entries with the same name!")
-
-        listofnames = set([el.get("name") for el in current_groups])
-
-        intersection_list = [el for el in groups if el.get("name") in listofnames]
-        difference_list = [el for el in groups if not el.get("name") in listofnames]
-
-        # Handle the service group accordingly to above findings and desired state
-        if state == "present":
-            # create service groups which do not exist (difference)
-            # update service groups that exist (intersection)
-
-            msg_tokens = []
+        # Determine what to create, update and delete in one pass
+        try:
+            changes = reconcile_groups(groups, current_groups, state)
+        except ValueError as e:
+            exit_failed(module, str(e))
+
+        # Handle the service groups accordingly to above findings and desired state
+        msg_tokens = []
+
+        if len(changes.create) > 0:
+            create_service_groups(module, base_url, changes.create, headers)
+            msg_tokens.append(
+                "Service groups: "
+                + " ".join([el["name"] for el in changes.create])
+                + " were created."
+            )
 
-            if len(difference_list) > 0:
-                create_service_groups(module, base_url, difference_list, headers)
-                msg_tokens.append(
-                    "Service groups: "
-                    + " ".join([el["name"] for el in difference_list])
-                    + " were created."
-                )
-
-            if len(intersection_list) > 0:
-                # determines difference between lists according to 'name' and 'title' pair
-                current_groups_dict = dict(
-                    (el["name"], el["title"]) for el in current_groups
-                )
-                remainings_list = [
-                    el
-                    for el in intersection_list
-                    if el.get("title") != current_groups_dict[el.get("name")]
-                ]
-
-                if len(remainings_list) > 0:
-                    update_service_groups(module, base_url, remainings_list, headers)
-                    msg_tokens.append(
-                        "Service groups: "
-                        + " ".join([el["name"] for el in remainings_list])
-                        + " were updated."
-                    )
+        if len(changes.update) > 0:
+            update_service_groups(module, base_url, changes.update, headers)
+            msg_tokens.append(
+                "Service groups: "
+                + " ".join([el["name"] for el in changes.update])
+                + " were updated."
+            )
 
-            if len(msg_tokens) >= 1:
-                exit_changed(module, " ".join(msg_tokens))
-            else:
-                exit_ok(module, "Service groups already present.")
-
-        elif state == "absent":
-            # delete service groups that exist (intersection_list)
-            if len(intersection_list) > 0:
-                # extra check if title-s (alias-es) match.
-                delete_service_groups(module, base_url, intersection_list, headers)
-                exit_changed(
-                    module,
-                    "Service groups: "
-                    + " ".join([el["name"] for el in intersection_list])
-                    + " were deleted.",
-                )
+        if len(changes.delete) > 0:
+            delete_service_groups(module, base_url, changes.delete, headers)
+            msg_tokens.append(
+                "Service groups: "
+                + " ".join([el["name"] for el in changes.delete])
+                + " were deleted."
+            )
 
+        if len(msg_tokens) >= 1:
+            exit_changed(module, " ".join(msg_tokens))
         else:
-            exit_failed(module, "Unknown error")
+            exit_ok(module, "Service groups already %s." % state)
     elif "name" in module.params and module.params.get("name", ""):
         # Determine the current state of this particular service group
         (
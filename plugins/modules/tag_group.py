@@ -204,13 +204,26 @@ msg:
     type: str
     returned: always
     sample: 'OK'
+waited:
+    description: The time in seconds the module waited for the server to show the changed tag group.
+    type: float
+    returned: always
+    sample: 0.1
+ready:
+    description: Whether the server showed the changed tag group before the module stopped waiting.
+    type: bool
+    returned: always
+    sample: true
 """
 
 import json
-import time
 
 from ansible.module_utils.basic import AnsibleModule
 from ansible_collections.checkmk.general.plugins.module_utils.api import CheckmkAPI
+from ansible_collections.checkmk.general.plugins.module_utils.readiness import (
+    wait_for_object,
+    warn_if_not_ready,
+)
 from ansible_collections.checkmk.general.plugins.module_utils.types import RESULT
 from ansible_collections.checkmk.general.plugins.module_utils.utils import (
     base_argument_spec,
@@ -363,6 +376,9 @@ def run_module():
     )
 
     taggroup = TaggroupAPI(module)
+    endpoint = "/objects/host_tag_group/%s" % module.params.get("name")
+    waited = 0
+    ready = True
 
     if module.params.get("state") == "present":
         if taggroup.current.http_code == 200:
@@ -371,22 +387,29 @@ def run_module():
                 module, json.loads(taggroup.current.content.decode("utf-8"))
             ):
                 result = taggroup.put()
+                taggroup.headers.pop("If-Match", None)
 
-                time.sleep(3)
+                ready, waited = wait_for_object(
+                    taggroup,
+                    endpoint,
+                    etag=result.etag,
+                    etag_before=taggroup.current.etag,
+                )
 
         elif taggroup.current.http_code == 404:
             # Tag group is not there. Create it.
 
             result = taggroup.post()
 
-            time.sleep(3)
+            if not result.failed:
+                ready, waited = wait_for_object(taggroup, endpoint)
 
     if module.params.get("state") == "absent":
         # Only delete if the Taggroup exists
         if taggroup.current.http_code == 200:
             result = taggroup.delete()
 
-            time.sleep(3)
+            ready, waited = wait_for_object(taggroup, endpoint, present=False)
         elif taggroup.current.http_code == 404:
             result = RESULT(
                 http_code=0,
@@ -397,7 +420,8 @@ def run_module():
                 changed=False,
             )
 
-    module.exit_json(**result_as_dict(result))
+    warn_if_not_ready(module, ready, waited, "changed tag group")
+    module.exit_json(waited=waited, ready=ready, **result_as_dict(result))
 
 
 def main():
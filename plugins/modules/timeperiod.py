@@ -201,14 +201,27 @@ msg:
     type: str
     returned: always
     sample: 'Done.'
+waited:
+    description: The time in seconds the module waited for the server to show the changed time period.
+    type: float
+    returned: always
+    sample: 0.1
+ready:
+    description: Whether the server showed the changed time period before the module stopped waiting.
+    type: bool
+    returned: always
+    sample: true
 """
 
 import json
-import time
 from datetime import datetime
 
 from ansible.module_utils.basic import AnsibleModule
 from ansible_collections.checkmk.general.plugins.module_utils.api import CheckmkAPI
+from ansible_collections.checkmk.general.plugins.module_utils.readiness import (
+    wait_for_object,
+    warn_if_not_ready,
+)
 from ansible_collections.checkmk.general.plugins.module_utils.types import RESULT
 from ansible_collections.checkmk.general.plugins.module_utils.utils import (
     base_argument_spec,
@@ -423,6 +436,10 @@ def run_module():
         changed=False,
     )
 
+    endpoint = "/objects/time_period/%s" % module.params.get("name")
+    waited = 0
+    ready = True
+
     if module.params.get("state") == "present":
         timeperiodget = TimeperiodGetAPI(module)
         result = timeperiodget.get()
@@ -474,16 +491,19 @@ def run_module():
                     changed=False,
                 )
             else:
+                etag_before = result.etag
                 result = timeperiodupdate.put(existing["alias"])
 
-                time.sleep(3)
+                ready, waited = wait_for_object(
+                    timeperiodget, endpoint, etag=result.etag, etag_before=etag_before
+                )
 
         # Time period doesn't exist - Create new one.
         elif result.http_code == 404:
             timeperiodcreate = TimeperiodCreateAPI(module)
             result = timeperiodcreate.post()
 
-            time.sleep(3)
+            ready, waited = wait_for_object(timeperiodget, endpoint)
 
     if module.params.get("state") == "absent":
         timeperiodget = TimeperiodGetAPI(module)
@@ -494,9 +514,10 @@ def run_module():
             timeperioddelete.headers["If-Match"] = result.etag
             result = timeperioddelete.delete()
 
-            time.sleep(3)
+            ready, waited = wait_for_object(timeperiodget, endpoint, present=False)
 
-    module.exit_json(**result_as_dict(result))
+    warn_if_not_ready(module, ready, waited, "changed time period")
+    module.exit_json(waited=waited, ready=ready, **result_as_dict(result))
 
 
 def main():
@@ -0,0 +1,119 @@
+#!/usr/bin/env python
+# -*- encoding: utf-8; py-indent-offset: 4 -*-
+
+# Copyright: (c) 2026, Checkmk GmbH
+# GNU General Public License v3.0+
+# (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+from unittest.mock import MagicMock, patch
+
+from ansible_collections.checkmk.general.plugins.action.discovery_batch import (
+    ActionModule,
+)
+
+TASK_VARS = {
+    "inventory_hostname": "web1",
+    "ansible_play_batch": ["web1", "web2", "db1"],
+    "hostvars": {
+        "web1": {"checkmk_host_name": "web1.example.com"},
+        "web2": {"checkmk_host_name": "web2.example.com"},
+        "db1": {},
+    },
+}
+
+
+def _action(args):
+    task = MagicMock()
+    task.args = args
+    task.async_val = 0
+    task.check_mode = False
+    templar = MagicMock()
+    templar.template.side_effect = lambda value: value
+    return ActionModule(task, MagicMock(), MagicMock(), MagicMock(), templar, None)
+
+
+def test_one_bulk_discovery_for_the_batch():
+    action = _action({"state": "fix_all", "host_name_var": "checkmk_host_name"})
+    module_result = {
+        "changed": True,
+        "failed": False,
+        "msg": "Discovery successful.",
+        "progress": {"failed_hosts": {"web2.example.com": "Connection refused"}},
+    }
+
+    with patch.object(
+        action, "_execute_module", return_value=module_result
+    ) as execute_module:
+        result = action.run(task_vars=TASK_VARS)
+
+    execute_module.assert_called_once()
+    assert execute_module.call_args.kwargs["module_name"] == "checkmk.general.discovery"
+    assert execute_module.call_args.kwargs["module_args"] == {
+        "state": "fix_all",
+        "hosts": ["web1.example.com", "web2.example.com"],
+        "wait_for_completion": True,
+    }
+    assert result["host_results"] == {
+        "web1": {
+            "host_name": "web1.example.com",
+            "changed": True,
+            "failed": False,
+            "skipped": False,
+            "msg": "Discovery successful.",
+        },
+        "web2": {
+            "host_name": "web2.example.com",
+            "changed": False,
+            "failed": True,
+            "skipped": False,
+            "msg": "Connection refused",
+        },
+        "db1": {
+            "host_name": None,
+            "changed": False,
+            "failed": False,
+            "skipped": True,
+            "msg": "The host has no variable checkmk_host_name.",
+        },
+    }
+
+
+def test_host_options_are_rejected():
+    action = _action({"host_name": "web1"})
+
+    with patch.object(action, "_execute_module") as execute_module:
+        result = action.run(task_vars=TASK_VARS)
+
+    execute_module.assert_not_called()
+    assert result["failed"] is True
+
+
+def test_inventory_names_by_default():
+    action = _action({"state": "fix_all"})
+
+    with patch.object(
+        action, "_execute_module", return_value={"changed": True}
+    ) as execute_module:
+        result = action.run(task_vars=TASK_VARS)
+
+    assert execute_module.call_args.kwargs["module_args"]["hosts"] == [
+        "web1",
+        "web2",
+        "db1",
+    ]
+    assert not any(r["skipped"] for r in result["host_results"].values())
+
+
+def test_no_host_with_the_variable():
+    action = _action({"state": "fix_all", "host_name_var": "missing"})
+
+    with patch.object(action, "_execute_module") as execute_module:
+        result = action.run(task_vars=TASK_VARS)
+
+    execute_module.assert_not_called()
+    assert result["skipped"] is True
+    assert all(r["skipped"] for r in result["host_results"].values())
@@ -6,6 +6,8 @@ from __future__ import absolute_import, division, print_function
 __metaclass__ = type
 
 import json
+import time
+import tracemalloc
 
 import pytest
 from ansible.errors import AnsibleError
@@ -16,6 +18,9 @@ from ansible_collections.checkmk.general.plugins.inventory.checkmk import (
 from ansible_collections.checkmk.general.plugins.module_utils.lookup_api import (
     CheckMKLookupAPI,
 )
+from ansible_collections.checkmk.general.tests.unit.plugins.module_utils.lookup_api import (
+    collection_stream,
+)
 
 
 @pytest.fixture(scope="module")
@@ -202,6 +207,15 @@ def api():
     )
 
 
+def _mock_api(mocker):
+    """Mocked API, whose get_collection() streams what get() returns"""
+    api = mocker.MagicMock()
+    api.get_collection.side_effect = lambda endpoint, parameters=None: (
+        collection_stream(api.get(endpoint, parameters), endpoint)
+    )
+    return api
+
+
 def _prepare_tags_and_sites(inventory, api):
     inventory.hosttaggroups = inventory._get_taggroups(api)
     inventory.tags = [("tag_" + tag.get("id")) for tag in inventory.hosttaggroups]
@@ -222,20 +236,13 @@ def _raw_host(host_id, tags=None, folder="/main"):
     }
 
 
-def test_is_excluded(fresh_inventory):
+def test_excluded_by(fresh_inventory):
     fresh_inventory.exclude_tags = ["tag_criticality_test"]
-    assert (
-        fresh_inventory._is_excluded({"id": "h1", "tags": {"tag_criticality": "test"}})
-        is True
-    )
-    assert (
-        fresh_inventory._is_excluded({"id": "h2", "tags": {"tag_criticality": "prod"}})
-        is False
-    )
-    assert (
-        fresh_inventory._is_excluded({"id": "h3", "tags": {"tag_criticality": None}})
-        is False
-    )
+    grouping = fresh_inventory._new_grouping()
+
+    assert fresh_inventory._excluded_by(grouping, "h1", {"tag_criticality": "test"})
+    assert not fresh_inventory._excluded_by(grouping, "h2", {"tag_criticality": "prod"})
+    assert not fresh_inventory._excluded_by(grouping, "h3", {"tag_criticality": None})
 
 
 def test_exclude_tags(fresh_inventory, api):
@@ -270,7 +277,7 @@ def test_domain_map_first_match_wins(fresh_inventory):
         "tag_networking_lan": ".lan.example.com",
     }
     host_tags = {"tag_networking": "lan", "tag_criticality": "prod"}
-    assert fresh_inventory._get_domain_suffix(host_tags) == ".example.com"
+    assert fresh_inventory._new_grouping().domain_suffix(host_tags) == ".example.com"
 
 
 def test_lowercase_hosts(fresh_inventory):
@@ -308,7 +315,7 @@ def test_get_hosts_folder(fresh_inventory, mocker):
     fresh_inventory.tags = []
     fresh_inventory.folder = "/main"
 
-    api = mocker.MagicMock()
+    api = _mock_api(mocker)
     api.get.return_value = json.dumps(
         {
             "value": [
@@ -334,7 +341,7 @@ def test_get_hosts_folder_recursive(fresh_inventory, mocker):
     fresh_inventory.folder = "/main"
     fresh_inventory.recursive = True
 
-    api = mocker.MagicMock()
+    api = _mock_api(mocker)
     api.get.return_value = json.dumps(
         {
             "value": [
@@ -387,7 +394,7 @@ def test_recursive_without_folder(fresh_inventory, mocker):
     fresh_inventory.tags = []
     fresh_inventory.recursive = True
 
-    api = mocker.MagicMock()
+    api = _mock_api(mocker)
     api.get.return_value = json.dumps({"value": [_raw_host("host_a")]})
 
     host_ids = [host["id"] for host in fresh_inventory._get_hosts(api)]
@@ -403,7 +410,7 @@ def test_recursive_without_folder(fresh_inventory, mocker):
 def test_get_hosts_error(fresh_inventory, mocker):
     fresh_inventory.tags = []
 
-    api = mocker.MagicMock()
+    api = _mock_api(mocker)
     api.get.return_value = json.dumps(
         {"code": 404, "msg": "Not Found", "url": "http://localhost"}
     )
@@ -433,3 +440,218 @@ def test_populate_with_renamed_hosts(fresh_inventory, api):
 
     # Hosts without a matching tag keep their name and groups
     assert "testhost2" in groups_dict["tag_criticality_prod"]
+
+
+def test_cache_key_depends_on_user(fresh_inventory, mocker):
+    fresh_inventory.get_cache_key = mocker.MagicMock(side_effect=lambda key: key)
+    fresh_inventory.folder = "/main"
+    fresh_inventory.recursive = False
+    fresh_inventory.api_auth_type = "bearer"
+    fresh_inventory.api_auth_cookie = None
+
+    fresh_inventory.user = "cmkadmin"
+    admin_key = fresh_inventory._cache_key("checkmk.yml", "http://127.0.0.1/stable")
+    fresh_inventory.user = "guest"
+    guest_key = fresh_inventory._cache_key("checkmk.yml", "http://127.0.0.1/stable")
+
+    assert admin_key != guest_key
+    assert "cmkadmin" not in admin_key
+
+    # Cookies are not kept in plain text either
+    fresh_inventory.api_auth_type = "cookie"
+    fresh_inventory.api_auth_cookie = "secretcookie"
+    assert "secretcookie" not in fresh_inventory._cache_key(
+        "checkmk.yml", "http://127.0.0.1/stable"
+    )
+
+
+def test_get_data_uses_cache(fresh_inventory, api, mocker):
+    fresh_inventory._cache = {}
+    mocker.patch.object(fresh_inventory, "get_option", get_option({"cache": True}))
+    spy = mocker.spy(api, "get")
+
+    # Refresh: fetch from the site and fill the cache
+    data = fresh_inventory._get_data(api, "key", cache=False)
+    calls = spy.call_count
+    assert calls == 3
+    assert fresh_inventory._cache["key"] == data
+    assert data["hosts"][0]["id"] == "checkmk-server-main"
+
+    # Only the fields needed by _parse_hosts end up in the cache
+    assert set(data["hosts"][0]["extensions"]) == {
+        "title",
+        "folder",
+        "attributes",
+        "effective_attributes",
+    }
+
+    # Cached: no further requests
+    assert fresh_inventory._get_data(api, "key", cache=True) == data
+    assert spy.call_count == calls
+
+    # Cache miss: fetch and store again
+    fresh_inventory._cache = {}
+    fresh_inventory._get_data(api, "key", cache=True)
+    assert spy.call_count == 2 * calls
+    assert "key" in fresh_inventory._cache
+
+
+def test_get_data_without_cache(fresh_inventory, api, mocker):
+    fresh_inventory._cache = {"key": {"hosts": [], "sites": [], "hosttaggroups": []}}
+    mocker.patch.object(fresh_inventory, "get_option", get_option({"cache": False}))
+
+    data = fresh_inventory._get_data(api, "key", cache=True)
+
+    assert data["hosts"]
+    assert fresh_inventory._cache["key"]["hosts"] == []
+
+
+@pytest.mark.parametrize("max_concurrency", [1, 3])
+def test_fetch_data_concurrently(fresh_inventory, api, max_concurrency):
+    fresh_inventory.max_concurrency = max_concurrency
+
+    data = fresh_inventory._fetch_data(api)
+
+    assert [group["id"] for group in data["hosttaggroups"]] == [
+        group["id"] for group in fresh_inventory._get_taggroups(api)
+    ]
+    assert data["sites"] == fresh_inventory._get_sites(api)
+    assert data["hosts"] == fresh_inventory._request_hosts(api)
+
+
+def test_fetch_data_error(fresh_inventory, mocker):
+    def get(endpoint="", parameters=None):
+        if "site_connection" in endpoint:
+            return json.dumps({"code": 403, "msg": "Forbidden", "url": endpoint})
+        return json.dumps({"value": []})
+
+    api = _mock_api(mocker)
+    api.get.side_effect = get
+
+    with pytest.raises(AnsibleError, match="403"):
+        fresh_inventory._fetch_data(api)
+
+
+def _folder_api(mocker, version):
+    """Fake API that serves two folders with one host each and records requests."""
+    hosts = {
+        "~linux": [_raw_host("lnx1", folder="/linux")],
+        "~linux~prod": [_raw_host("lnx2", folder="/linux/prod")],
+    }
+
+    def get(endpoint="", parameters=None):
+        if endpoint == "/version":
+            return json.dumps({"versions": {"checkmk": version}})
+        if endpoint == "/domain-types/folder_config/collections/all":
+            return json.dumps({"value": [{"extensions": {"path": "/linux/prod"}}]})
+        if endpoint.startswith("/objects/folder_config/"):
+            return json.dumps({"value": hosts[endpoint.split("/")[3]]})
+        if endpoint == "/domain-types/host_config/collections/all":
+            return json.dumps(
+                {
+                    "value": [
+                        _raw_host("other1", folder="/windows"),
+                        hosts["~linux"][0],
+                        hosts["~linux~prod"][0],
+                    ]
+                }
+            )
+        return json.dumps({"value": []})
+
+    api = _mock_api(mocker)
+    api.get.side_effect = get
+    return api
+
+
+def _requested(api):
+    return [c.args[0] for c in api.get.call_args_list]
+
+
+@pytest.mark.parametrize(
+    "recursive, expected", [(False, ["lnx1"]), (True, ["lnx1", "lnx2"])]
+)
+def test_fetch_data_folder_scoped(fresh_inventory, mocker, recursive, expected):
+    api = _folder_api(mocker, "2.3.0p10.cre")
+    fresh_inventory.folder = "/linux"
+    fresh_inventory.recursive = recursive
+
+    data = fresh_inventory._fetch_data(api)
+
+    assert [host["id"] for host in data["hosts"]] == expected
+    assert "/domain-types/host_config/collections/all" not in _requested(api)
+    assert "/objects/folder_config/~linux/collections/hosts" in _requested(api)
+
+
+def test_fetch_data_folder_fallback(fresh_inventory, mocker):
+    api = _folder_api(mocker, "2.2.0p20.cre")
+    fresh_inventory.folder = "/linux"
+    fresh_inventory.recursive = True
+
+    data = fresh_inventory._fetch_data(api)
+
+    assert "/domain-types/host_config/collections/all" in _requested(api)
+    assert not [e for e in _requested(api) if e.startswith("/objects/")]
+    # Filtering happens on the client side, with the same result
+    hosts = fresh_inventory._parse_hosts(data["hosts"])
+    assert [host["id"] for host in hosts] == ["lnx1", "lnx2"]
+
+
+def _synthetic_hosts(count, tags, profiles=1000):
+    """Raw hosts for the benchmark. The hosts share a limited number of tag
+    combinations, as they do in real sites. Every host still gets its own
+    tag values tuple from _parse_hosts."""
+    effective_attributes = []
+    for profile in range(profiles):
+        attributes = {"site": "site %d" % (profile % 5)}
+        for index, tag in enumerate(tags):
+            value = (profile * 7 + index * 13) % 4
+            attributes[tag] = "value %d" % value if value else None
+        effective_attributes.append(attributes)
+
+    return [
+        {
+            "id": "host%06d" % i,
+            "extensions": {
+                "title": "host%06d" % i,
+                "folder": "/folder%d" % (i % 50),
+                "attributes": {"ipaddress": "10.0.0.1"},
+                "effective_attributes": effective_attributes[i % profiles],
+            },
+        }
+        for i in range(count)
+    ]
+
+
+def test_benchmark_grouping_200k_hosts(fresh_inventory):
+    """Filter, rename and group 200k hosts with 100 tag groups.
+
+    Budget: 20 seconds and 200 MB of memory allocated by the plugin on top
+    of the raw hosts. That is about ten times the time and four times the
+    memory measured on a developer machine (2 s and 46 MB with the
+    measurement enabled). Adding the hosts and groups to Ansible's
+    InventoryData is not included, as it is outside of the plugin.
+    """
+    count = 200000
+    tags = ["tag_group%d" % index for index in range(100)]
+    raw_hosts = _synthetic_hosts(count, tags)
+
+    fresh_inventory.tags = tags
+    fresh_inventory.groupsources = ["hosttags", "sites"]
+    fresh_inventory.exclude_tags = ["tag_group3_value 1"]
+    fresh_inventory.domain_map = {"tag_group7_value 3": ".example.com"}
+
+    tracemalloc.start()
+    start = time.time()
+    hosts = fresh_inventory._parse_hosts(raw_hosts)
+    grouping = fresh_inventory._grouping
+    memberships = sum(
+        len(grouping.host_groups(host["tags"], host["site"])) for host in hosts
+    )
+    elapsed = time.time() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    assert 0 < len(hosts) < count
+    assert memberships == len(hosts) * (len(tags) + 1)
+    assert elapsed < 20.0
+    assert peak < 200 * 1024 * 1024
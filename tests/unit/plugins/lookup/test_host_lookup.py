@@ -0,0 +1,98 @@
+#!/usr/bin/env python
+# -*- encoding: utf-8; py-indent-offset: 4 -*-
+
+# Copyright: (c) 2026, Checkmk GmbH
+# GNU General Public License v3.0+
+# (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import json
+from unittest.mock import MagicMock, patch
+
+import pytest
+from ansible.errors import AnsibleError
+from ansible.plugins.loader import lookup_loader
+from ansible_collections.checkmk.general.plugins.lookup import host
+from ansible_collections.checkmk.general.tests.unit.plugins.module_utils.lookup_api import (
+    collection_stream,
+)
+
+OPTIONS = {
+    "server_url": "https://localhost",
+    "site": "mysite",
+    "api_user": "myuser",
+    "api_secret": "mysecret",
+    "batch_threshold": 2,
+}
+
+
+def _hosts(names):
+    return json.dumps(
+        {
+            "value": [
+                {"id": name, "extensions": {"folder": "/", "name": name}}
+                for name in names
+            ]
+        }
+    )
+
+
+def _api(version, names):
+    api = MagicMock()
+    api.url = "https://localhost/mysite/check_mk/api/1.0"
+    api.get_json.return_value = {"versions": {"checkmk": version}}
+    api.get_collection.side_effect = lambda endpoint, parameters: collection_stream(
+        _hosts(n for n in names if n in parameters.get("hostnames", names)),
+        api.url + endpoint,
+    )
+    return api
+
+
+def _run(api, terms, **options):
+    lookup = lookup_loader.get("checkmk.general.host")
+    with patch.object(host, "CheckMKLookupAPI", return_value=api):
+        return lookup.run(terms, {}, **dict(OPTIONS, **options))
+
+
+def test_batch_with_hostnames_filter():
+    api = _api("2.3.0p1", ["host%d" % i for i in range(5)])
+
+    result = _run(
+        api,
+        ["host3", "host1", "host3", "host0"],
+        effective_attributes=True,
+    )
+
+    assert [h["name"] for h in result] == ["host3", "host1", "host3", "host0"]
+    api.get_collection.assert_called_once_with(
+        "/domain-types/host_config/collections/all",
+        {"effective_attributes": True, "hostnames": ["host3", "host1", "host0"]},
+    )
+    api.get_json_all.assert_not_called()
+
+
+def test_batch_without_hostnames_filter():
+    api = _api("2.2.0p20", ["host%d" % i for i in range(5)])
+
+    assert [h["name"] for h in _run(api, ["host4", "host2", "host1"])] == [
+        "host4",
+        "host2",
+        "host1",
+    ]
+    api.get_collection.assert_called_once_with(
+        "/domain-types/host_config/collections/all", {"effective_attributes": False}
+    )
+
+    with pytest.raises(AnsibleError, match="host_config/missing - 404"):
+        _run(api, ["host4", "missing", "host1"])
+
+
+def test_below_threshold():
+    api = _api("2.3.0p1", [])
+    api.get_json_all.return_value = [{"extensions": {"name": "host1"}}]
+
+    assert _run(api, ["host1"]) == [{"name": "host1"}]
+    api.get_collection.assert_not_called()
@@ -7,11 +7,28 @@
 from __future__ import absolute_import, division, print_function
 
 import base64
+import io
+import json
+
+from ansible_collections.checkmk.general.plugins.module_utils.json_stream import (
+    CollectionStream,
+)
 
 __metaclass__ = type
 
 # This is a fake lookup_api to create static response for unit testing modules of the checkmk collection
 
+HTTP_ERROR_CODES = {
+    400: "Bad Request: Parameter or validation failure.",
+    403: "Forbidden: Configuration via Setup is disabled.",
+    404: "Not Found: The requested object has not been found.",
+    406: "Not Acceptable: The requests accept headers can not be satisfied.",
+}
+
+
+def map_concurrently(func, items, max_concurrency=4):
+    return [func(item) for item in items]
+
 
 class CheckMKLookupAPI:
     """Base class to contact a Checkmk server for ~Lookup calls"""
@@ -24,6 +41,11 @@ class CheckMKLookupAPI:
         api_user=None,
         api_secret=None,
         validate_certs=True,
+        cache_ttl=0,
+        cache_size=32,
+        display=None,
+        cache_ttl_by_endpoint=None,
+        persistent_cache=False,
     ):
         self.headers = {
             "Accept": "application/json",
@@ -1505,3 +1527,20 @@ class CheckMKLookupAPI:
                 ]
             }"""
             return host_config
+
+    def get_json(self, endpoint="", parameters=None):
+        return json.loads(self.get(endpoint, parameters))
+
+    def get_json_all(self, endpoints, parameters=None, max_concurrency=4):
+        return [self.get_json(endpoint, parameters) for endpoint in endpoints]
+
+    def get_collection(self, endpoint="", parameters=None):
+        return collection_stream(self.get(endpoint, parameters), self.url + endpoint)
+
+
+def collection_stream(text, url):
+    """Stream a static response like CheckMKLookupAPI.get_collection() does"""
+    response = json.loads(text)
+    if "code" in response:
+        return CollectionStream(None, url, error=response)
+    return CollectionStream(io.BytesIO(text.encode("utf-8")), url, chunk_size=256)
@@ -0,0 +1,109 @@
+#!/usr/bin/env python
+# -*- encoding: utf-8; py-indent-offset: 4 -*-
+
+# Copyright: (c) 2026, Checkmk GmbH
+# GNU General Public License v3.0+
+# (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import os
+from unittest.mock import patch
+
+from ansible_collections.checkmk.general.plugins.module_utils.cache import (
+    FileCache,
+    FileLock,
+)
+
+
+def test_miss_then_hit(tmp_path):
+    cache = FileCache("version", 60, directory=str(tmp_path))
+
+    value, stats = cache.get("https://myserver/|mysite")
+    assert value is None
+
+    stats = cache.set("https://myserver/|mysite", "2.4.0p1.cre", stats)
+    assert stats == {"hits": 0, "misses": 1}
+
+    value, stats = cache.get("https://myserver/|mysite")
+    assert value == "2.4.0p1.cre"
+    assert stats == {"hits": 1, "misses": 1}
+
+    # Another site does not share the entry
+    value, stats = cache.get("https://myserver/|othersite")
+    assert value is None
+
+
+def test_expired_entry_is_a_miss(tmp_path):
+    cache = FileCache("version", 0, directory=str(tmp_path))
+    cache.set("key", "2.4.0p1.cre")
+
+    cache.ttl = -1
+    value, stats = cache.get("key")
+
+    assert value is None
+    assert stats == {"hits": 0, "misses": 1}
+
+
+def test_invalidate(tmp_path):
+    cache = FileCache("version", 60, directory=str(tmp_path))
+    cache.set("key", "2.4.0p1.cre")
+
+    cache.invalidate("key")
+    cache.invalidate("key")
+
+    assert cache.get("key")[0] is None
+    assert not [f for f in os.listdir(str(tmp_path)) if f.endswith(".tmp")]
+
+
+def test_evict_least_recently_used(tmp_path):
+    cache = FileCache("lookup", 60, directory=str(tmp_path), max_entries=2)
+    for age, key in enumerate(["a", "b"]):
+        cache.set(key, key)
+        os.utime(cache._path(key), (1000 + age, 1000 + age))
+
+    cache.set("c", "c")
+
+    assert cache.get("a")[0] is None
+    assert cache.get("b")[0] == "b"
+    assert cache.get("c")[0] == "c"
+
+
+def test_clear(tmp_path):
+    cache = FileCache("lookup", 60, directory=str(tmp_path))
+    cache.set("a", "a")
+    cache.set("b", "b")
+
+    cache.clear()
+
+    assert os.listdir(str(tmp_path)) == []
+
+
+def test_directory_readable_by_others_is_bypassed(tmp_path):
+    directory = tmp_path / "cache"
+    directory.mkdir(0o755)
+    directory.chmod(0o755)
+    cache = FileCache("version", 60, directory=str(directory))
+
+    cache.set("key", "value")
+    assert os.listdir(str(directory)) == []
+    (directory / os.path.basename(cache._path("key"))).write_text(
+        '{"value": "planted", "timestamp": 9999999999}'
+    )
+    assert cache.get("key")[0] is None
+
+    with FileLock("version", "key", directory=str(directory)) as lock:
+        assert lock._file is None
+
+
+def test_directory_of_another_user_is_bypassed(tmp_path):
+    directory = tmp_path / "cache"
+    cache = FileCache("version", 60, directory=str(directory))
+    cache.set("key", "value")
+    assert cache.get("key")[0] == "value"
+    assert oct(directory.stat().st_mode & 0o777) == oct(0o700)
+
+    with patch("os.getuid", return_value=os.getuid() + 1):
+        assert cache.get("key")[0] is None
@@ -0,0 +1,148 @@
+#!/usr/bin/env python
+# -*- encoding: utf-8; py-indent-offset: 4 -*-
+
+# Copyright: (c) 2026, Checkmk GmbH
+# GNU General Public License v3.0+
+# (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+import pytest
+from ansible_collections.checkmk.general.plugins.module_utils.connection_pool import (
+    MAX_REDIRECTS,
+    ConnectionPool,
+)
+
+
+class KeepAliveHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def _reply(self, code, payload):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(code)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("ETag", '"abc"')
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _redirect(self, code, location):
+        self.send_response(code)
+        self.send_header("Location", location)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def do_GET(self):
+        if self.path.endswith("/redirect"):
+            self._redirect(302, "/target")
+        elif self.path.endswith("/loop"):
+            self._redirect(302, self.path)
+        elif self.path.endswith("/missing"):
+            self._reply(404, {"title": "Not Found"})
+        else:
+            self._reply(200, {"path": self.path})
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        payload = json.loads(self.rfile.read(length))
+        if self.path.endswith("/see-other"):
+            self._redirect(303, "/target")
+        elif self.path.endswith("/temporary"):
+            self._redirect(307, "/objects")
+        else:
+            self._reply(200, payload)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    httpd = HTTPServer(("127.0.0.1", 0), KeepAliveHandler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield "http://127.0.0.1:%d" % httpd.server_address[1]
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def test_connection_is_reused(server):
+    pool = ConnectionPool()
+
+    for i in range(3):
+        response, info = pool.request(url="%s/version?i=%d" % (server, i))
+        assert info["status"] == 200
+        assert info["etag"] == '"abc"'
+        assert json.loads(response.read()) == {"path": "/version?i=%d" % i}
+
+    response, info = pool.request(
+        url="%s/objects" % server, data='{"a": 1}', method="POST"
+    )
+    assert json.loads(response.read()) == {"a": 1}
+
+    assert pool.requests == 4
+    assert pool.connections == 1
+    assert pool.reused == 3
+    pool.close()
+
+
+def test_error_body_is_in_info(server):
+    pool = ConnectionPool()
+
+    response, info = pool.request(url="%s/missing" % server)
+
+    assert info["status"] == 404
+    assert json.loads(info["body"]) == {"title": "Not Found"}
+    assert response.read() == b""
+
+
+def test_connection_failure():
+    pool = ConnectionPool()
+
+    response, info = pool.request(url="http://127.0.0.1:1/version", timeout=1)
+
+    assert response is None
+    assert info["status"] == -1
+    assert info["msg"].startswith("Connection failure")
+
+
+def test_redirects_are_followed(server):
+    pool = ConnectionPool()
+
+    response, info = pool.request(url="%s/redirect" % server)
+    assert info["status"] == 200
+    assert info["url"] == "%s/target" % server
+    assert json.loads(response.read()) == {"path": "/target"}
+
+    # A POST is followed with a GET after a 303 ...
+    response, info = pool.request(
+        url="%s/see-other" % server, data='{"a": 1}', method="POST"
+    )
+    assert json.loads(response.read()) == {"path": "/target"}
+
+    # ... and with the same method and body after a 307
+    response, info = pool.request(
+        url="%s/temporary" % server, data='{"a": 1}', method="POST"
+    )
+    assert json.loads(response.read()) == {"a": 1}
+
+    assert pool.connections == 1
+    pool.close()
+
+
+def test_redirect_loop_is_stopped(server):
+    pool = ConnectionPool()
+
+    response, info = pool.request(url="%s/loop" % server)
+
+    assert info["status"] == 302
+    assert info["msg"].startswith("HTTP Error 302: Too many redirects")
+    assert response.read() == b""
+    assert pool.requests == MAX_REDIRECTS + 1
+    pool.close()
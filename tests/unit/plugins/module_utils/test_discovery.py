@@ -0,0 +1,234 @@
+#!/usr/bin/env python
+# -*- encoding: utf-8; py-indent-offset: 4 -*-
+
+# Copyright: (c) 2026, Checkmk GmbH
+# GNU General Public License v3.0+
+# (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import json
+from unittest.mock import MagicMock, patch
+
+from ansible_collections.checkmk.general.plugins.module_utils import (
+    discovery,
+    discovery_300,
+)
+from ansible_collections.checkmk.general.plugins.module_utils.discovery import (
+    job_active,
+    job_progress,
+)
+from ansible_collections.checkmk.general.plugins.module_utils.discovery_300 import (
+    Discovery300,
+)
+from ansible_collections.checkmk.general.plugins.module_utils.types import RESULT
+
+PARAMS = {
+    "server_url": "https://localhost/",
+    "site": "mysite",
+    "api_user": "cmkadmin",
+    "api_secret": "mysecret",
+    "validate_certs": True,
+    "hosts": ["host1", "host2", "host3"],
+    "state": "new",
+    "wait_timeout": -1,
+    "wait_for_completion": True,
+    "wait_for_previous": True,
+    "poll_interval_min": 0.5,
+    "poll_interval_max": 2.0,
+}
+
+
+def _job(active, progress=None, state="running"):
+    return json.dumps(
+        {
+            "id": "bulk_discovery-1",
+            "extensions": {
+                "active": active,
+                "status": {
+                    "state": state,
+                    "log_info": {
+                        "JobProgressUpdate": progress or [],
+                        "JobResult": [] if active else ["Bulk discovery successful"],
+                        "JobException": [],
+                    },
+                },
+            },
+        }
+    ).encode("utf-8")
+
+
+def _result(http_code, content=b"{}"):
+    return RESULT(
+        http_code=http_code,
+        msg="",
+        content=content,
+        etag="",
+        failed=False,
+        changed=True,
+    )
+
+
+# Log of a bulk discovery job of Checkmk, one progress line per host
+PROGRESS = [
+    "Bulk discovery started...",
+    "Processing hosts host1, host2, host3",
+    "host1: discovery successful",
+    "host2: discovery failed: [Errno 111] Connection refused",
+    "host3: discovery skipped: host not monitored",
+    'Log line with "active": false inside',
+    "Final summary: 1 succeeded, 1 failed, 1 skipped",
+]
+
+
+def test_job_active():
+    assert job_active(_job(True, PROGRESS)) is True
+    assert job_active(_job(False, PROGRESS)) is False
+
+
+def test_job_progress():
+    progress = job_progress(_job(False, PROGRESS, state="finished"))
+
+    assert progress == {
+        "job_state": "finished",
+        "hosts_processed": 3,
+        "failed_hosts": {
+            "host2": "discovery failed: [Errno 111] Connection refused",
+        },
+        "job_result": ["Bulk discovery successful"],
+    }
+
+
+def test_bulk_discovery_backoff():
+    module = MagicMock()
+    module.params = PARAMS
+    module._socket_path = None
+
+    api = Discovery300(module, MagicMock())
+    api.discovery_bulk = MagicMock()
+    api.discovery_bulk.post.return_value = _result(200, _job(True))
+    api.discovery_api = api.discovery_bulk
+    api.service_completion_api = MagicMock()
+    api.service_completion_api.get.side_effect = [
+        _result(200, _job(True)) for i in range(5)
+    ] + [_result(200, _job(False, PROGRESS, state="finished"))]
+
+    with patch.object(discovery.time, "sleep") as sleep:
+        result = api.start_discovery()
+
+    assert [c.args[0] for c in sleep.call_args_list] == [0.5, 1.0, 2.0, 2.0, 2.0]
+    api.service_completion_api.get.assert_called_with("bulk_discovery-1")
+    assert result.http_code == 200
+
+    progress = api.report(result)
+    assert progress["polls"] == 6
+    assert progress["hosts_processed"] == 3
+    assert progress["job_state"] == "finished"
+    assert list(progress["failed_hosts"]) == ["host2"]
+
+
+def test_sharded_bulk_discovery():
+    hosts = ["host%d" % i for i in range(10)]
+    module = MagicMock()
+    module.params = dict(
+        PARAMS, hosts=hosts, shard_size=4, max_concurrent_jobs=3, shard_retries=1
+    )
+    module._socket_path = None
+
+    api = Discovery300(module, MagicMock())
+    assert api.sharded() is True
+
+    jobs = []
+
+    def post():
+        # Called on the copy of the discovery API of a shard
+        jobs.append(list(post_api.params["hosts"]))
+        return _result(200, json.dumps({"id": "job%d" % len(jobs)}).encode())
+
+    def get(job_id):
+        shard = jobs[int(job_id[3:]) - 1]
+        if shard[0] == "host4" and len(jobs) <= 3:
+            # The job of the second shard breaks down on the first attempt
+            return _result(200, _job(False, state="exception"))
+        progress = [
+            "[%d/%d] %s: discovery %s"
+            % (i + 1, len(shard), host, "failed" if host == "host9" else "successful")
+            for i, host in enumerate(shard)
+        ]
+        return _result(200, _job(False, progress, state="finished"))
+
+    class PostAPI:
+        params = module.params
+
+        def post(self):
+            return post()
+
+    post_api = None
+    api.discovery_api = PostAPI()
+    api.service_completion_api = MagicMock()
+    api.service_completion_api.get.side_effect = get
+
+    original_shard = api._shard
+
+    def shard(hosts):
+        nonlocal post_api
+        copied = original_shard(hosts)
+        post_api = copied.discovery_api
+        return copied
+
+    with (
+        patch.object(api, "_shard", side_effect=shard),
+        patch.object(
+            discovery, "ThreadPoolExecutor", wraps=discovery.ThreadPoolExecutor
+        ) as executor,
+    ):
+        # One worker keeps the order of the jobs deterministic for this test
+        api.max_concurrent_jobs = 1
+        result = api.start_sharded_discovery()
+
+    assert jobs == [
+        ["host0", "host1", "host2", "host3"],
+        ["host4", "host5", "host6", "host7"],
+        ["host8", "host9"],
+        # Only the hosts of the broken job and the failed host are retried
+        ["host4", "host5", "host6", "host7"],
+        ["host9"],
+    ]
+    assert executor.call_args_list[0].kwargs == {"max_workers": 1}
+    assert result.failed is False
+    assert result.changed is True
+    assert result.msg == "Discovered 10 hosts in 5 shards, 9 succeeded, 1 failed."
+    assert api.progress["failed_hosts"] == {"host9": "discovery failed"}
+    assert api.progress["retried_hosts"] == 5
+
+
+def test_failed_request_of_shard_is_retried():
+    hosts = ["host%d" % i for i in range(4)]
+    module = MagicMock()
+    module.params = dict(PARAMS, hosts=hosts, shard_size=2, shard_retries=1)
+    module._socket_path = None
+
+    api = Discovery300(module, MagicMock())
+    posts = []
+
+    def fetch(self, code_mapping="", endpoint="", data=None, method="GET", **kwargs):
+        if method == "POST":
+            posts.append(list(data["hostnames"]))
+            if len(posts) == 1:
+                # A failed request must not end the module in a worker thread
+                assert self.fail_on_error is False
+                return _result(500)._replace(failed=True, msg="500 - Error")
+            return _result(200, json.dumps({"id": "job%d" % len(posts)}).encode())
+        job = posts[int(endpoint.rsplit("job", 1)[1]) - 1]
+        progress = ["%s: discovery successful" % host for host in job]
+        return _result(200, _job(False, progress, state="finished"))
+
+    with patch.object(discovery_300.CheckmkAPI, "_fetch", fetch):
+        result = api.start_sharded_discovery()
+
+    assert posts == [["host0", "host1"], ["host2", "host3"], ["host0", "host1"]]
+    assert result.failed is False
+    assert api.progress["failed_hosts"] == {}
+    assert api.progress["retried_hosts"] == 2
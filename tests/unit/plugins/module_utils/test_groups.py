@@ -0,0 +1,117 @@
+#!/usr/bin/env python
+# -*- encoding: utf-8; py-indent-offset: 4 -*-
+
+# Copyright: (c) 2026, Checkmk GmbH
+# GNU General Public License v3.0+
+# (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import pytest
+from ansible_collections.checkmk.general.plugins.module_utils.groups import (
+    parse_group_collection,
+    reconcile_groups,
+)
+
+
+def _collection(count, domain_type="host_group_config"):
+    return {
+        "value": [
+            {
+                "domainType": domain_type,
+                "id": "group%d" % i,
+                "title": "Group %d" % i,
+                "href": "https://myserver/objects/%s/group%d" % (domain_type, i),
+            }
+            for i in range(count)
+        ]
+    }
+
+
+def test_parse_group_collection():
+    assert parse_group_collection(_collection(2), "host_group_config") == {
+        "group0": "Group 0",
+        "group1": "Group 1",
+    }
+    # 2.0.0 and 2.1.0 only have the name in the href
+    assert parse_group_collection(_collection(1, "link"), "host_group_config") == {
+        "group0": "Group 0"
+    }
+
+
+def test_reconcile_present():
+    current = {"a": "A", "b": "B", "c": "c"}
+    desired = [
+        {"name": "a", "title": "A"},
+        {"name": "b", "title": "New B"},
+        {"name": "c"},
+        {"name": "d", "title": "D"},
+    ]
+
+    changes = reconcile_groups(desired, current, "present")
+
+    assert changes.create == [{"name": "d", "title": "D"}]
+    assert changes.update == [{"name": "b", "title": "New B"}]
+    assert changes.delete == []
+
+
+def test_reconcile_absent():
+    changes = reconcile_groups(
+        [{"name": "a"}, {"name": "x"}], {"a": "A", "b": "B"}, "absent"
+    )
+
+    assert changes.create == []
+    assert changes.update == []
+    assert changes.delete == [{"name": "a"}]
+
+
+def test_reconcile_duplicates():
+    with pytest.raises(ValueError):
+        reconcile_groups([{"name": "a"}, {"name": "a"}], {}, "present")
+
+
+class _CountingDict(dict):
+    """Counts the lookups of single groups, and fails on any scan of all groups"""
+
+    lookups = 0
+
+    def __contains__(self, key):
+        self.lookups += 1
+        return super(_CountingDict, self).__contains__(key)
+
+    def __getitem__(self, key):
+        self.lookups += 1
+        return super(_CountingDict, self).__getitem__(key)
+
+    def _scan(self, *args):
+        raise AssertionError("The current groups must not be scanned")
+
+    __iter__ = keys = values = items = _scan
+
+
+def test_reconcile_is_linear():
+    """50k current and 50k desired groups, half of them new, a tenth renamed.
+
+    The previous list based implementation was quadratic in the number of
+    groups. Every desired group must cost at most two lookups of the current
+    groups, without ever scanning them.
+    """
+    count = 50000
+    current = _CountingDict(
+        parse_group_collection(_collection(count), "host_group_config")
+    )
+    desired = [
+        {
+            "name": "group%d" % i,
+            "title": "Renamed %d" % i if i % 10 == 0 else "Group %d" % i,
+        }
+        for i in range(count // 2, count + count // 2)
+    ]
+
+    changes = reconcile_groups(desired, current, "present")
+
+    assert len(changes.create) == count // 2
+    assert len(changes.update) == count // 2 // 10
+    assert current.lookups <= 2 * len(desired)
@@ -0,0 +1,82 @@
+#!/usr/bin/env python
+# -*- encoding: utf-8; py-indent-offset: 4 -*-
+
+# Copyright: (c) 2026, Checkmk GmbH
+# GNU General Public License v3.0+
+# (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+from ansible_collections.checkmk.general.plugins.module_utils.inventory_grouping import (
+    GroupingEngine,
+    convertname,
+    split_full_tags,
+)
+
+
+def test_convertname():
+    assert convertname("my site") == "mysite"
+    assert convertname("cmk-agent.v2") == "cmk_agent_v2"
+
+
+def test_split_full_tags():
+    assert dict(split_full_tags(["tag_address_family_ip-v4-only"])) == {
+        "tag_address": {"family_ip-v4-only": "tag_address_family_ip-v4-only"},
+        "tag_address_family": {"ip-v4-only": "tag_address_family_ip-v4-only"},
+    }
+    # Without a value there is nothing to match
+    assert split_full_tags(["tag_criticality_"]) == []
+
+
+def test_excluded_by():
+    grouping = GroupingEngine(
+        ["tag_criticality", "tag_address_family"],
+        exclude_tags=["tag_criticality_test", "tag_address_family_no-ip"],
+    )
+
+    assert grouping.excluded_by({"tag_criticality": "test"}) == "tag_criticality_test"
+    assert (
+        grouping.excluded_by({"tag_address_family": "no-ip"})
+        == "tag_address_family_no-ip"
+    )
+    assert grouping.excluded_by({"tag_criticality": "prod"}) is None
+    assert grouping.excluded_by({"tag_criticality": None}) is None
+
+
+def test_domain_suffix_first_match_wins():
+    grouping = GroupingEngine(
+        [],
+        domain_map={
+            "tag_criticality_prod": ".example.com",
+            "tag_networking_lan": ".lan.example.com",
+        },
+    )
+
+    host_tags = {"tag_networking": "lan", "tag_criticality": "prod"}
+    assert grouping.domain_suffix(host_tags) == ".example.com"
+    assert grouping.domain_suffix({"tag_networking": "lan"}) == ".lan.example.com"
+    assert grouping.domain_suffix({}) == ""
+
+
+def test_host_groups():
+    grouping = GroupingEngine(
+        ["tag_criticality", "tag_agent"], groupsources=["hosttags", "sites"]
+    )
+
+    tag_values = grouping.tag_values(
+        {"tag_criticality": "prod", "tag_agent": None, "site": "ignored"}
+    )
+
+    assert tag_values == ("prod", None)
+    assert grouping.host_groups(tag_values, "my site") == [
+        "tag_criticality_prod",
+        "tag_agent_None",
+        "site_mysite",
+    ]
+    # Identical tag values are shared between hosts
+    assert grouping.tag_values({"tag_criticality": "prod"}) is tag_values
+
+    grouping.groupsources = []
+    assert grouping.host_groups(tag_values, "my site") == []
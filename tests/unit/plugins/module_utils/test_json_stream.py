@@ -0,0 +1,88 @@
+#!/usr/bin/env python
+# -*- encoding: utf-8; py-indent-offset: 4 -*-
+
+# Copyright: (c) 2026, Checkmk GmbH
+# GNU General Public License v3.0+
+# (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import io
+import json
+
+import pytest
+from ansible_collections.checkmk.general.plugins.module_utils.json_stream import (
+    CollectionStream,
+)
+
+COLLECTION = {
+    "links": [{"href": "http://myserver/mysite/check_mk/api/1.0/", "rel": "self"}],
+    "domainType": "host_config",
+    "value": [
+        {
+            "id": "host%d" % i,
+            "extensions": {
+                "attributes": {"alias": "Hôst № %d" % i, "ipaddress": "10.0.0.%d" % i},
+                "is_cluster": False,
+                "cluster_nodes": None,
+                "weight": 1.5 * i,
+            },
+        }
+        for i in range(20)
+    ],
+    "extensions": {"count": 20},
+}
+
+
+class ClosingBytesIO(io.BytesIO):
+    closed_by_stream = False
+
+    def close(self):
+        self.closed_by_stream = True
+        super(ClosingBytesIO, self).close()
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 64, 65536])
+@pytest.mark.parametrize("indent", [None, 2])
+def test_stream_collection(chunk_size, indent):
+    body = json.dumps(COLLECTION, indent=indent, ensure_ascii=False).encode("utf-8")
+    raw_response = ClosingBytesIO(body)
+
+    stream = CollectionStream(raw_response, "http://myserver", chunk_size=chunk_size)
+
+    assert list(stream) == COLLECTION["value"]
+    assert stream.error is None
+    assert stream.members == {
+        "links": COLLECTION["links"],
+        "domainType": "host_config",
+        "extensions": {"count": 20},
+    }
+    assert raw_response.closed_by_stream
+
+
+def test_stream_empty_collection():
+    stream = CollectionStream(io.BytesIO(b'{"value": []}'), "http://myserver")
+
+    assert list(stream) == []
+    assert stream.error is None
+
+
+def test_stream_request_error():
+    error = {"code": 404, "msg": "Not Found", "url": "http://myserver"}
+
+    stream = CollectionStream(None, "http://myserver", error=error)
+
+    assert list(stream) == []
+    assert stream.error == error
+
+
+def test_stream_truncated_response():
+    body = b'{"value": [{"id": "host1"}, {"id": "ho'
+
+    stream = CollectionStream(io.BytesIO(body), "http://myserver", chunk_size=8)
+
+    assert list(stream) == [{"id": "host1"}]
+    assert stream.error["code"] == 0
+    assert stream.error["url"] == "http://myserver"
@@ -0,0 +1,261 @@
+#!/usr/bin/env python
+# -*- encoding: utf-8; py-indent-offset: 4 -*-
+
+# Copyright: (c) 2026, Checkmk GmbH
+# GNU General Public License v3.0+
+# (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import importlib.util
+import io
+import os
+import threading
+from http.server import ThreadingHTTPServer
+from unittest.mock import MagicMock, patch
+
+import pytest
+from ansible_collections.checkmk.general.plugins.module_utils import json_stream
+from ansible_collections.checkmk.general.tests.unit.plugins.module_utils.test_connection_pool import (
+    KeepAliveHandler,
+)
+
+# The inventory tests replace lookup_api in sys.modules with a fake, so load
+# the real module from its file.
+_spec = importlib.util.spec_from_file_location(
+    "checkmk_lookup_api",
+    os.path.join(os.path.dirname(json_stream.__file__), "lookup_api.py"),
+)
+lookup_api = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(lookup_api)
+
+RESPONSE_CACHE = lookup_api.RESPONSE_CACHE
+CheckMKLookupAPI = lookup_api.CheckMKLookupAPI
+ResponseCache = lookup_api.ResponseCache
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    RESPONSE_CACHE.clear()
+    yield
+    RESPONSE_CACHE.clear()
+
+
+def _api(api_user="myuser", **kwargs):
+    return CheckMKLookupAPI(
+        site_url="https://localhost/mysite",
+        api_user=api_user,
+        api_secret="mysecret",
+        **kwargs,
+    )
+
+
+def _open_url(url, headers=None, validate_certs=True):
+    return io.BytesIO(b'{"value": [{"id": "%s"}]}' % url.encode("utf-8"))
+
+
+def test_response_cache_lru_and_ttl():
+    cache = ResponseCache()
+    with patch.object(lookup_api.time, "monotonic", return_value=100.0):
+        cache.set("a", 1, size=2)
+        cache.set("b", 2, size=2)
+        assert cache.get("a", ttl=10) == 1
+        # "b" is the least recently used entry now
+        cache.set("c", 3, size=2)
+        assert cache.get("b", ttl=10) is None
+        assert cache.get("c", ttl=10) == 3
+
+    with patch.object(lookup_api.time, "monotonic", return_value=111.0):
+        assert cache.get("a", ttl=10) is None
+
+    assert (cache.hits, cache.misses) == (2, 2)
+    # Expired entries are kept to revalidate them
+    assert cache.lookup("a", ttl=10) == (1, False)
+    assert len(cache) == 2
+
+
+def test_get_is_cached_per_url_and_credentials():
+    display = MagicMock()
+    with patch.object(CheckMKLookupAPI, "_open", side_effect=_open_url) as open_url:
+        api = _api(cache_ttl=60, display=display)
+        first = api.get("/objects/host_config/myhost", {"effective_attributes": True})
+        second = api.get("/objects/host_config/myhost", {"effective_attributes": True})
+        api.get("/objects/host_config/myhost", {"effective_attributes": False})
+        _api(api_user="otheruser", cache_ttl=60).get(
+            "/objects/host_config/myhost", {"effective_attributes": True}
+        )
+
+    assert first == second
+    assert open_url.call_count == 3
+    assert (RESPONSE_CACHE.hits, RESPONSE_CACHE.misses) == (1, 3)
+    assert "hit" in display.vvv.call_args_list[1].args[0]
+
+
+def test_collection_is_cached():
+    with patch.object(CheckMKLookupAPI, "_open", side_effect=_open_url) as open_url:
+        for i in range(3):
+            stream = _api(cache_ttl=60).get_collection(
+                "/domain-types/host_config/collections/all"
+            )
+            assert [entry["id"] for entry in stream] == [
+                "https://localhost/mysite/check_mk/api/1.0"
+                "/domain-types/host_config/collections/all"
+            ]
+
+    assert open_url.call_count == 1
+
+
+def test_cache_is_off_by_default():
+    with patch.object(CheckMKLookupAPI, "_open", side_effect=_open_url) as open_url:
+        _api().get("/version")
+        _api().get("/version")
+
+    assert open_url.call_count == 2
+    assert len(RESPONSE_CACHE) == 0
+
+
+def test_ttl_by_endpoint():
+    api = _api(cache_ttl=10, cache_ttl_by_endpoint={"/version": 3600, "/objects": 0})
+
+    assert api._ttl("/version") == 3600
+    assert api._ttl("/objects/host_config/myhost") == 0
+    assert api._ttl("/domain-types/rule/collections/all") == 10
+
+
+def test_persistent_cache_is_shared_by_forks(tmp_path):
+    with (
+        patch.object(lookup_api, "lookup_cache_dir", return_value=str(tmp_path)),
+        patch.object(CheckMKLookupAPI, "_open", side_effect=_open_url) as open_url,
+    ):
+        first = _api(cache_ttl=60, persistent_cache=True).get("/version")
+        # Another fork starts with an empty in-process cache
+        RESPONSE_CACHE.clear()
+        second = _api(cache_ttl=60, persistent_cache=True).get("/version")
+
+        invalidate = lookup_api.FileCache("lookup", 0, directory=str(tmp_path))
+        invalidate.clear()
+        RESPONSE_CACHE.clear()
+        _api(cache_ttl=60, persistent_cache=True).get("/version")
+
+    assert first == second
+    assert open_url.call_count == 2
+
+
+class _Response(io.BytesIO):
+    def __init__(self, body, etag):
+        super(_Response, self).__init__(body)
+        self.headers = {"ETag": etag}
+
+
+def _not_modified(url):
+    return lookup_api.HTTPError(url, 304, "Not Modified", {}, None)
+
+
+def test_expired_response_is_revalidated():
+    requests = []
+
+    def open_url(url, headers=None, validate_certs=True):
+        requests.append(headers.get("If-None-Match"))
+        if headers.get("If-None-Match") == '"v1"':
+            raise _not_modified(url)
+        return _Response(b'{"extensions": {"name": "myhost"}}', '"v1"')
+
+    display = MagicMock()
+    api = _api(cache_ttl=60, display=display)
+    with (
+        patch.object(CheckMKLookupAPI, "_open", side_effect=open_url),
+        patch.object(lookup_api.time, "monotonic", return_value=100.0),
+    ):
+        first = api.get_json("/objects/host_config/myhost")
+    with (
+        patch.object(CheckMKLookupAPI, "_open", side_effect=open_url),
+        patch.object(lookup_api.time, "monotonic", return_value=200.0),
+    ):
+        second = api.get_json("/objects/host_config/myhost")
+        # The revalidated entry is fresh again
+        third = api.get_json("/objects/host_config/myhost")
+
+    assert requests == [None, '"v1"']
+    assert first == {"extensions": {"name": "myhost"}}
+    # The decoded response is reused, not decoded again
+    assert second is first and third is first
+    assert "revalidated" in display.vvv.call_args_list[1].args[0]
+
+
+def test_changed_response_is_replaced(tmp_path):
+    bodies = iter([(b'{"id": 1}', '"v1"'), (b'{"id": 2}', '"v2"')])
+
+    def open_url(url, headers=None, validate_certs=True):
+        return _Response(*next(bodies))
+
+    with (
+        patch.object(lookup_api, "lookup_cache_dir", return_value=str(tmp_path)),
+        patch.object(CheckMKLookupAPI, "_open", side_effect=open_url) as mocked,
+    ):
+        api = _api(cache_ttl=60, persistent_cache=True)
+        assert api.get_json("/version") == {"id": 1}
+        RESPONSE_CACHE.clear()
+        with patch.object(lookup_api.FileCache, "lookup") as lookup:
+            # The entry of another fork has expired
+            lookup.return_value = ({"body": '{"id": 1}', "etag": '"v1"'}, False)
+            assert api.get_json("/version") == {"id": 2}
+
+    assert mocked.call_args.kwargs["headers"]["If-None-Match"] == '"v1"'
+
+
+def test_errors_of_get_json():
+    def open_url(url, headers=None, validate_certs=True):
+        raise lookup_api.HTTPError(url, 404, "Not Found", {}, None)
+
+    with patch.object(CheckMKLookupAPI, "_open", side_effect=open_url):
+        response = _api(cache_ttl=60).get_json("/objects/host_config/nohost")
+
+    assert response["code"] == 404
+    assert len(RESPONSE_CACHE) == 0
+
+
+def test_get_json_all_keeps_the_order():
+    started = threading.Barrier(3, timeout=5)
+
+    def open_url(url, headers=None, validate_certs=True):
+        if url.endswith("/missing"):
+            raise lookup_api.HTTPError(url, 404, "Not Found", {}, None)
+        # All three requests have to run at the same time to pass the barrier
+        started.wait()
+        return io.BytesIO(b'{"id": "%s"}' % url.rsplit("/", 1)[1].encode("utf-8"))
+
+    endpoints = ["/objects/host_config/%s" % name for name in "abc"]
+    with patch.object(CheckMKLookupAPI, "_open", side_effect=open_url):
+        responses = _api().get_json_all(
+            endpoints + ["/objects/host_config/missing"], max_concurrency=3
+        )
+
+    assert responses[:3] == [{"id": "a"}, {"id": "b"}, {"id": "c"}]
+    assert responses[3]["code"] == 404
+
+
+def test_workers_share_keep_alive_connections():
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), KeepAliveHandler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    try:
+        api = CheckMKLookupAPI(
+            site_url="http://127.0.0.1:%d/mysite" % httpd.server_address[1],
+            api_user="myuser",
+            api_secret="mysecret",
+        )
+        endpoints = ["/objects/host/host%d" % i for i in range(8)] + ["/missing"]
+
+        result = api.get_json_all(endpoints, max_concurrency=2)
+    finally:
+        httpd.shutdown()
+        httpd.server_close()
+
+    assert [r["path"] for r in result[:-1]] == [
+        "/mysite/check_mk/api/1.0" + endpoint for endpoint in endpoints[:-1]
+    ]
+    assert result[-1]["code"] == 404
+    assert api.connection_pool.requests == 9
+    assert api.connection_pool.connections <= 2
@@ -0,0 +1,109 @@
+#!/usr/bin/env python
+# -*- encoding: utf-8; py-indent-offset: 4 -*-
+
+# Copyright: (c) 2026, Checkmk GmbH
+# GNU General Public License v3.0+
+# (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+from unittest.mock import MagicMock
+
+import pytest
+from ansible_collections.checkmk.general.plugins.module_utils import readiness
+from ansible_collections.checkmk.general.plugins.module_utils.types import RESULT
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """A fake clock, time.sleep() advances it and records the delays"""
+    state = {"now": 100.0, "sleeps": []}
+
+    def sleep(seconds):
+        state["sleeps"].append(seconds)
+        state["now"] += seconds
+
+    monkeypatch.setattr(readiness.time, "monotonic", lambda: state["now"])
+    monkeypatch.setattr(readiness.time, "sleep", sleep)
+    return state
+
+
+def _api(*responses):
+    api = MagicMock()
+    api._fetch.side_effect = [
+        RESULT(
+            http_code=http_code,
+            msg="",
+            content="",
+            etag=etag,
+            failed=http_code not in (200, 404),
+            changed=False,
+        )
+        for http_code, etag in responses
+    ]
+    return api
+
+
+def test_wait_until_ready_at_once(clock):
+    assert readiness.wait_until(lambda: True) == (True, 0)
+    assert clock["sleeps"] == []
+
+
+def test_wait_until_backoff(clock):
+    answers = iter([False] * 6 + [True])
+
+    ready, waited = readiness.wait_until(lambda: next(answers))
+
+    assert ready is True
+    assert clock["sleeps"] == [0.1, 0.2, 0.4, 0.8, 1.6, 2.0]
+    assert waited == pytest.approx(5.1)
+
+
+def test_wait_until_deadline(clock):
+    ready, waited = readiness.wait_until(lambda: False, timeout=5)
+
+    assert ready is False
+    assert waited == pytest.approx(5)
+    assert clock["sleeps"][-1] == pytest.approx(1.9)
+
+
+def test_wait_for_created_object(clock):
+    api = _api((404, ""), (200, "new"))
+
+    assert readiness.wait_for_object(api, "/objects/x/y") == (True, 0.1)
+    assert api._fetch.call_count == 2
+
+
+def test_wait_for_deleted_object(clock):
+    api = _api((200, "old"), (404, ""))
+
+    assert readiness.wait_for_object(api, "/objects/x/y", present=False)[0] is True
+
+
+def test_wait_for_updated_object(clock):
+    api = _api((200, "old"), (200, "new"))
+
+    ready, waited = readiness.wait_for_object(
+        api, "/objects/x/y", etag="new", etag_before="old"
+    )
+
+    assert ready is True
+    assert api._fetch.call_count == 2
+
+
+def test_wait_ends_on_errors(clock):
+    api = _api((500, ""))
+
+    assert readiness.wait_for_object(api, "/objects/x/y") == (True, 0)
+
+
+def test_warn_if_not_ready():
+    module = MagicMock()
+
+    readiness.warn_if_not_ready(module, True, 0.1, "changed tag group")
+    module.warn.assert_not_called()
+
+    readiness.warn_if_not_ready(module, False, 30.0, "changed tag group")
+    assert "changed tag group within 30.0 seconds" in module.warn.call_args.args[0]
@@ -0,0 +1,246 @@
+#!/usr/bin/env python
+# -*- encoding: utf-8; py-indent-offset: 4 -*-
+
+# Copyright: (c) 2026, Checkmk GmbH
+# GNU General Public License v3.0+
+# (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import json
+from unittest.mock import MagicMock, patch
+
+import pytest
+from ansible_collections.checkmk.general.plugins.module_utils import readiness
+from ansible_collections.checkmk.general.plugins.module_utils.types import RESULT
+from ansible_collections.checkmk.general.plugins.modules import activation
+from ansible_collections.checkmk.general.plugins.modules.activation import (
+    ActivationAPI,
+    run_module,
+    site_status,
+)
+
+PARAMS = {
+    "server_url": "https://localhost/",
+    "site": "mysite",
+    "api_user": "cmkadmin",
+    "api_secret": "mysecret",
+    "validate_certs": True,
+    "sites": [],
+    "force_foreign_changes": False,
+    "redirect": False,
+    "debounce": 0,
+    "wait_for_completion": False,
+    "wait_timeout": -1,
+}
+
+ACTIVATION_STARTED = RESULT(
+    http_code=200,
+    msg="Activation started.",
+    content=json.dumps({"id": "new-run"}).encode("utf-8"),
+    etag="",
+    failed=False,
+    changed=True,
+)
+
+
+def _get(responses):
+    """Answer the GET requests of ActivationAPI._get() by endpoint"""
+    return lambda endpoint: responses.get(endpoint)
+
+
+@pytest.fixture
+def module():
+    with (
+        patch.object(activation, "AnsibleModule") as module_cls,
+        patch.object(activation, "FileLock", MagicMock()),
+    ):
+        module = module_cls.return_value
+        module.params = dict(PARAMS)
+        module._socket_path = None
+        module.exit_json.side_effect = SystemExit
+        yield module
+
+
+def _run(module, responses):
+    with (
+        patch.object(ActivationAPI, "_get", side_effect=_get(responses)),
+        patch.object(ActivationAPI, "post", return_value=ACTIVATION_STARTED) as post,
+        patch.object(activation, "wait_for_object", return_value=(True, 0.1)),
+        patch.object(activation, "wait_until", return_value=(True, 12.0)) as wait_until,
+    ):
+        with pytest.raises(SystemExit):
+            run_module()
+    return post, wait_until, module.exit_json.call_args.kwargs
+
+
+PENDING = "domain-types/activation_run/collections/pending_changes"
+RUNNING = "domain-types/activation_run/collections/running"
+SITES = "domain-types/site_connection/collections/all"
+ALL_SITES = {"value": [{"id": "mysite"}]}
+
+
+def test_nothing_pending(module):
+    post, wait_until, result = _run(module, {PENDING: {"value": []}, RUNNING: {}})
+
+    post.assert_not_called()
+    assert result["changed"] is False
+    assert result["msg"] == "There are no changes to be activated."
+
+
+def test_activate_pending_changes(module):
+    post, wait_until, result = _run(
+        module, {PENDING: {"value": [{"id": "change-1"}]}, RUNNING: {"value": []}}
+    )
+
+    post.assert_called_once()
+    wait_until.assert_not_called()
+    assert result["changed"] is True
+    assert result["joined"] == ""
+
+
+def test_join_running_activation(module):
+    running = {"value": [{"id": "run-1", "extensions": {"sites": ["mysite"]}}]}
+    responses = {PENDING: {"value": []}, RUNNING: running, SITES: ALL_SITES}
+
+    with patch.object(
+        ActivationAPI,
+        "wait_for_completion",
+        return_value=(True, 4.5, RUN["extensions"]),
+    ) as wait:
+        post, wait_until, result = _run(module, responses)
+
+    wait.assert_called_once_with("run-1")
+    post.assert_not_called()
+    assert result["changed"] is False
+    assert result["failed"] is False
+    assert result["joined"] == "run-1"
+    assert result["waited"] == 4.5
+    assert result["sites"]["mysite"]["state"] == "success"
+
+
+def test_join_and_activate_later_changes(module):
+    running = {"value": [{"id": "run-1", "extensions": {"sites": ["mysite"]}}]}
+    responses = {
+        PENDING: {"value": [{"id": "change-1"}]},
+        RUNNING: running,
+        SITES: ALL_SITES,
+    }
+
+    post, wait_until, result = _run(module, responses)
+
+    # The changes made after the joined activation started are activated
+    wait_until.assert_called_once()
+    post.assert_called_once()
+    assert result["joined"] == "run-1"
+
+
+def test_all_sites_do_not_join_activation_of_some(module):
+    running = {"value": [{"id": "run-1", "extensions": {"sites": ["mysite"]}}]}
+    responses = {
+        PENDING: {"value": [{"id": "change-1"}]},
+        RUNNING: running,
+        SITES: {"value": [{"id": "mysite"}, {"id": "remote"}]},
+    }
+
+    post, wait_until, result = _run(module, responses)
+
+    post.assert_called_once()
+    assert result["joined"] == ""
+
+
+def test_join_and_activate_later_changes_of_sites(module):
+    module.params.update(redirect=True, sites=["mysite"])
+    running = {"value": [{"id": "run-1", "extensions": {"sites": ["mysite"]}}]}
+
+    post, wait_until, result = _run(
+        module, {PENDING: {"value": [{"id": "change-2"}]}, RUNNING: running}
+    )
+
+    wait_until.assert_called_once()
+    post.assert_called_once()
+    assert result["joined"] == "run-1"
+    assert result["waited"] == pytest.approx(12.1)
+
+
+def test_do_not_join_activation_of_other_sites(module):
+    module.params.update(sites=["mysite"])
+    running = {"value": [{"id": "run-1", "extensions": {"sites": ["remote"]}}]}
+
+    post, wait_until, result = _run(
+        module, {PENDING: {"value": [{"id": "change-1"}]}, RUNNING: running}
+    )
+
+    post.assert_called_once()
+    assert result["joined"] == ""
+
+
+RUN = {
+    "id": "new-run",
+    "extensions": {
+        "is_running": False,
+        "status_per_site": [
+            {
+                "site": "mysite",
+                "phase": "done",
+                "state": "success",
+                "status_text": "Success",
+                "start_time": "2026-01-01T10:00:00+00:00",
+                "end_time": "2026-01-01T10:00:04.5+00:00",
+            },
+            {
+                "site": "remote",
+                "phase": "done",
+                "state": "error",
+                "status_text": "Timeout",
+                "start_time": "2026-01-01T10:00:00Z",
+                "end_time": "2026-01-01T10:01:00Z",
+            },
+        ],
+    },
+}
+
+
+def test_site_status():
+    assert site_status(RUN["extensions"]) == {
+        "mysite": {
+            "phase": "done",
+            "state": "success",
+            "status_text": "Success",
+            "duration": 4.5,
+        },
+        "remote": {
+            "phase": "done",
+            "state": "error",
+            "status_text": "Timeout",
+            "duration": 60.0,
+        },
+    }
+    assert site_status({}) == {}
+
+
+def test_wait_for_completion(module):
+    module.params.update(wait_for_completion=True)
+    running = dict(RUN, extensions=dict(RUN["extensions"], is_running=True))
+    runs = iter([running, running, RUN])
+    responses = {PENDING: {"value": [{"id": "change-1"}]}, RUNNING: {"value": []}}
+
+    def get(endpoint):
+        if endpoint == "objects/activation_run/new-run":
+            return next(runs)
+        return responses.get(endpoint)
+
+    with (
+        patch.object(ActivationAPI, "_get", side_effect=get),
+        patch.object(ActivationAPI, "post", return_value=ACTIVATION_STARTED),
+        patch.object(readiness.time, "sleep"),
+    ):
+        with pytest.raises(SystemExit):
+            run_module()
+
+    result = module.exit_json.call_args.kwargs
+    assert result["failed"] is True
+    assert result["msg"] == "Activation new-run failed on the sites remote."
+    assert result["sites"]["remote"]["duration"] == 60.0
@@ -0,0 +1,124 @@
+#!/usr/bin/env python
+# -*- encoding: utf-8; py-indent-offset: 4 -*-
+
+# Copyright: (c) 2026, Checkmk GmbH
+# GNU General Public License v3.0+
+# (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import json
+from unittest.mock import MagicMock, patch
+
+import pytest
+from ansible_collections.checkmk.general.plugins.modules import downtime
+from ansible_collections.checkmk.general.plugins.modules.downtime import bulk_downtimes
+
+PARAMS = {
+    "hosts": ["host1", "host2", "host3"],
+    "batch_size": 100,
+    "comment": "Managed by Ansible",
+    "duration": 0,
+    "start_after": {},
+    "start_time": "2026-01-01T10:00:00Z",
+    "end_after": {},
+    "end_time": "2026-01-01T12:00:00Z",
+    "force": False,
+    "service_descriptions": [],
+    "state": "present",
+}
+
+
+def _downtime(host_name, service_description=None):
+    title = "Downtime for host: %s" % host_name
+    if service_description:
+        title = "Downtime for service: %s" % service_description
+    return {"title": title, "extensions": {"host_name": host_name}}
+
+
+def _run(params, downtimes, status=204):
+    module = MagicMock()
+    module.params = dict(PARAMS, **params)
+    module.jsonify.side_effect = json.dumps
+    module.exit_json.side_effect = SystemExit
+    module.fail_json.side_effect = SystemExit
+
+    get = MagicMock()
+    get.read.return_value = json.dumps({"value": downtimes}).encode("utf-8")
+    requests = []
+
+    def fetch_url(module, url, data=None, headers=None, method=None):
+        requests.append((method, url, json.loads(data) if data else None))
+        if method == "GET":
+            return get, {"status": 200}
+        return None, {"status": status, "body": "error"}
+
+    with patch.object(downtime, "fetch_url", side_effect=fetch_url):
+        with pytest.raises(SystemExit):
+            bulk_downtimes(module, "https://localhost/mysite/check_mk/api/1.0", {})
+
+    return requests, module
+
+
+def test_create_missing_host_downtimes_in_batches():
+    requests, module = _run(
+        {"batch_size": 1}, [_downtime("host2"), _downtime("otherhost")]
+    )
+
+    assert [method for method, url, data in requests] == ["GET", "POST", "POST"]
+    queries = [json.loads(data["query"]) for method, url, data in requests[1:]]
+    assert [q["expr"][0]["right"] for q in queries] == ["host1", "host3"]
+    assert requests[1][2]["downtime_type"] == "host_by_query"
+
+    result = module.exit_json.call_args.kwargs
+    assert result["changed"] is True
+    assert result["msg"] == (
+        "Downtimes added for 2 of 3 hosts with comment 'Managed by Ansible'."
+    )
+    assert result["targets"]["host1"]["changed"] is True
+    assert result["targets"]["host2"]["changed"] is False
+
+
+def test_create_missing_service_downtimes():
+    requests, module = _run(
+        {"service_descriptions": ["CPU", "Memory"], "hosts": ["host1", "host2"]},
+        [
+            _downtime("host1", "CPU"),
+            _downtime("host2", "CPU"),
+            _downtime("host2", "Memory"),
+        ],
+    )
+
+    assert len(requests) == 2
+    assert requests[1][2]["downtime_type"] == "service_by_query"
+    assert json.loads(requests[1][2]["query"]) == {
+        "op": "or",
+        "expr": [
+            {
+                "op": "and",
+                "expr": [
+                    {"op": "=", "left": "host_name", "right": "host1"},
+                    {
+                        "op": "or",
+                        "expr": [{"op": "=", "left": "description", "right": "Memory"}],
+                    },
+                ],
+            }
+        ],
+    }
+    targets = module.exit_json.call_args.kwargs["targets"]
+    assert targets["host1"]["service_descriptions"] == ["Memory"]
+    assert targets["host2"]["changed"] is False
+
+
+def test_remove_host_downtimes():
+    requests, module = _run({"state": "absent"}, [_downtime("host3")], status=500)
+
+    assert len(requests) == 2
+    assert requests[1][2]["delete_type"] == "query"
+    result = module.fail_json.call_args.kwargs
+    assert result["changed"] is False
+    assert result["targets"]["host3"]["failed"] is True
+    assert result["targets"]["host1"]["failed"] is False
@@ -0,0 +1,208 @@
+#!/usr/bin/env python
+# -*- encoding: utf-8; py-indent-offset: 4 -*-
+
+# Copyright: (c) 2026, Checkmk GmbH
+# GNU General Public License v3.0+
+# (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import json
+from unittest.mock import MagicMock, patch
+
+import pytest
+from ansible_collections.checkmk.general.plugins.module_utils.types import RESULT
+from ansible_collections.checkmk.general.plugins.modules.host import (
+    HostBulkAPI,
+    HostEndpoints,
+)
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+
+COMMON_PARAMS = {
+    "server_url": "https://localhost/",
+    "site": "mysite",
+    "api_user": "cmkadmin",
+    "api_secret": "mysecret",
+    "api_auth_type": "bearer",
+    "validate_certs": True,
+    "extended_functionality": True,
+    "folder": None,
+    "attributes": None,
+    "update_attributes": None,
+    "remove_attributes": None,
+    "chunk_size": 2,
+    "state": "present",
+}
+
+CURRENT_HOSTS = {
+    "value": [
+        {
+            "id": "host1",
+            "extensions": {
+                "folder": "/",
+                "attributes": {"ipaddress": "127.0.0.1", "meta_data": {}},
+            },
+        },
+        {
+            "id": "host2",
+            "extensions": {
+                "folder": "/linux",
+                "attributes": {"alias": "Host 2", "meta_data": {}},
+            },
+        },
+    ]
+}
+
+
+def _result(http_code, changed=False, failed=False, content="", etag=""):
+    return RESULT(
+        http_code=http_code,
+        msg="%d - mocked" % http_code,
+        content=content,
+        etag=etag,
+        failed=failed,
+        changed=changed,
+    )
+
+
+def _run_bulk(hosts, check_mode=False, **overrides):
+    params = dict(COMMON_PARAMS)
+    params.update(overrides)
+    params["hosts"] = hosts
+
+    module = MagicMock()
+    module.params = params
+    module.check_mode = check_mode
+    module._socket_path = None
+
+    calls = []
+
+    def fake_fetch(code_mapping="", endpoint="", data=None, method="GET", **kwargs):
+        calls.append((method, endpoint, data))
+        if endpoint == HostEndpoints.create and method == "GET":
+            return _result(200, content=json.dumps(CURRENT_HOSTS))
+        if method == "GET":
+            return _result(200, etag="etag")
+        return _result(204 if "delete" in endpoint else 200, changed=True)
+
+    with patch.object(HostBulkAPI, "_fetch", side_effect=fake_fetch):
+        result = HostBulkAPI(module).run()
+
+    return result, calls
+
+
+# ---------------------------------------------------------------------------
+# Tests for the bulk mode
+# ---------------------------------------------------------------------------
+
+
+class TestHostBulkAPI:
+    def test_create_edit_and_unchanged(self):
+        result, calls = _run_bulk(
+            [
+                {
+                    "name": "host1",
+                    "folder": "/",
+                    "attributes": {"ipaddress": "127.0.0.1"},
+                },
+                {"name": "host2", "update_attributes": {"alias": "New alias"}},
+                {"name": "host3"},
+                {"name": "host4"},
+                {"name": "host5"},
+            ],
+            folder="/linux",
+        )
+
+        assert result["changed"] is True
+        assert result["failed"] is False
+        assert [h["name"] for h in result["hosts"]] == [
+            "host1",
+            "host2",
+            "host3",
+            "host4",
+            "host5",
+        ]
+        assert result["hosts"][0]["changed"] is False
+        assert result["hosts"][1]["changed"] is True
+        assert (
+            result["hosts"][0]["msg"]
+            == "Host already exists with the desired parameters."
+        )
+
+        endpoints = [(method, endpoint) for method, endpoint, data in calls]
+        assert endpoints.count(("POST", HostEndpoints.bulk_create)) == 2
+        assert endpoints.count(("PUT", HostEndpoints.bulk_edit)) == 1
+
+        creates = [
+            data
+            for method, endpoint, data in calls
+            if endpoint == HostEndpoints.bulk_create
+        ]
+        assert [e["host_name"] for e in creates[0]["entries"]] == ["host3", "host4"]
+        assert creates[0]["entries"][0]["folder"] == "/linux"
+
+    def test_move_is_done_per_host(self):
+        result, calls = _run_bulk([{"name": "host1", "folder": "/linux"}])
+
+        assert result["hosts"][0]["changed"] is True
+        assert result["hosts"][0]["msg"] == "Host moved. Moved to: /linux"
+        assert (
+            "POST",
+            "%s/host1/actions/move/invoke" % HostEndpoints.default,
+            {"target_folder": "/linux"},
+        ) in calls
+
+    def test_move_and_edit_fails_only_this_host(self):
+        result, calls = _run_bulk(
+            [
+                {"name": "host1", "folder": "/linux", "attributes": {"alias": "x"}},
+                {"name": "host3"},
+            ]
+        )
+
+        assert result["failed"] is True
+        assert result["hosts"][0]["failed"] is True
+        assert result["hosts"][1]["changed"] is True
+
+    def test_delete(self):
+        result, calls = _run_bulk(
+            [{"name": "host1"}, {"name": "host2"}, {"name": "absent_host"}],
+            state="absent",
+        )
+
+        assert [h["changed"] for h in result["hosts"]] == [True, True, False]
+        deletes = [
+            data
+            for method, endpoint, data in calls
+            if endpoint == HostEndpoints.bulk_delete
+        ]
+        assert deletes == [{"entries": ["host1", "host2"]}]
+
+    def test_check_mode_does_not_write(self):
+        result, calls = _run_bulk(
+            [{"name": "host3"}, {"name": "host2", "remove_attributes": ["alias"]}],
+            check_mode=True,
+        )
+
+        assert [h["changed"] for h in result["hosts"]] == [True, True]
+        assert [method for method, endpoint, data in calls] == ["GET"]
+
+    @pytest.mark.parametrize("chunk_size", [0, -1])
+    def test_chunk_size_below_one_is_rejected(self, chunk_size):
+        module = MagicMock()
+        module.params = dict(COMMON_PARAMS, chunk_size=chunk_size, hosts=[])
+        module.fail_json.side_effect = SystemExit
+
+        with patch.object(HostBulkAPI, "_fetch") as fetch:
+            with pytest.raises(SystemExit):
+                HostBulkAPI(module)
+
+        fetch.assert_not_called()
+        assert module.fail_json.call_args.kwargs["msg"] == (
+            "ERROR: chunk_size must be at least 1, got %d!" % chunk_size
+        )
@@ -0,0 +1,487 @@
+#!/usr/bin/env python
+# -*- encoding: utf-8; py-indent-offset: 4 -*-
+
+# Copyright: (c) 2026, Checkmk GmbH
+# GNU General Public License v3.0+
+# (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import json
+from unittest.mock import MagicMock, patch
+
+from ansible_collections.checkmk.general.plugins.module_utils.types import RESULT
+from ansible_collections.checkmk.general.plugins.module_utils.version import (
+    CheckmkVersion,
+)
+from ansible_collections.checkmk.general.plugins.modules.rule import (
+    RuleAPI,
+    RuleBulkAPI,
+    RuleEndpoints,
+)
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+
+COMMON_PARAMS = {
+    "server_url": "https://localhost/",
+    "site": "mysite",
+    "api_user": "cmkadmin",
+    "api_secret": "mysecret",
+    "api_auth_type": "bearer",
+    "validate_certs": True,
+    "ruleset": "checkgroup_parameters:filesystem",
+    "state": "present",
+}
+
+CONDITIONS = {"host_tags": [], "host_label_groups": [], "service_label_groups": []}
+
+
+def _rule(rule_id, folder, value_raw):
+    return {
+        "id": rule_id,
+        "extensions": {
+            "ruleset": COMMON_PARAMS["ruleset"],
+            "folder": folder,
+            "properties": {"disabled": False},
+            "conditions": dict(CONDITIONS),
+            "value_raw": value_raw,
+        },
+    }
+
+
+RULES = [
+    _rule("rule1", "/", "{'levels': (80.0, 90.0)}"),
+    _rule("rule2", "/linux", "{'levels': (85.0, 95.0)}"),
+    _rule("rule3", "/", "{'levels': (70.0, 80.0)}"),
+]
+
+
+def _result(http_code, changed=False, content="", etag=""):
+    return RESULT(
+        http_code=http_code,
+        msg="%d - mocked" % http_code,
+        content=content,
+        etag=etag,
+        failed=False,
+        changed=changed,
+    )
+
+
+def _rule_api(rule, state="present"):
+    params = dict(COMMON_PARAMS)
+    params["state"] = state
+    params["rule"] = rule
+
+    module = MagicMock()
+    module.params = params
+    module.check_mode = False
+    module._socket_path = None
+
+    calls = []
+
+    def fake_fetch(code_mapping="", endpoint="", data=None, method="GET", **kwargs):
+        calls.append((method, endpoint))
+        if endpoint.startswith(RuleEndpoints.create) and method == "GET":
+            return _result(200, content=json.dumps({"value": RULES}))
+        if method == "GET":
+            rule_id = endpoint.rsplit("/", 1)[-1]
+            for r in RULES:
+                if r["id"] == rule_id:
+                    return _result(200, content=json.dumps(r), etag="etag")
+            return _result(404)
+        return _result(200, changed=True, content=json.dumps({"id": "new"}))
+
+    with (
+        patch.object(RuleAPI, "_fetch", side_effect=fake_fetch),
+        patch.object(RuleAPI, "getversion", return_value=CheckmkVersion("2.3.0p1")),
+    ):
+        api = RuleAPI(module)
+
+    return api, calls, fake_fetch
+
+
+def _ruleset_fetches(calls):
+    return [
+        c
+        for c in calls
+        if c
+        == ("GET", RuleEndpoints.create + "?ruleset_name=" + COMMON_PARAMS["ruleset"])
+    ]
+
+
+# ---------------------------------------------------------------------------
+# Tests for the ruleset snapshot
+# ---------------------------------------------------------------------------
+
+
+class TestRulesetSnapshot:
+    def test_ruleset_is_fetched_once(self):
+        api, calls, fake_fetch = _rule_api(
+            {
+                "rule_id": None,
+                "conditions": CONDITIONS,
+                "properties": {"disabled": False},
+                "value_raw": "{'levels': (70.0, 80.0)}",
+                "location": {"position": "bottom", "folder": "/", "neighbour": None},
+            }
+        )
+
+        # The rule is found by its attributes, its location is checked
+        # against the same snapshot
+        assert api.rule_id == "rule3"
+        assert api.needs_update() is False
+        assert len(_ruleset_fetches(calls)) == 1
+
+    def test_location_change_detected(self):
+        api, calls, fake_fetch = _rule_api(
+            {
+                "rule_id": "rule1",
+                "conditions": CONDITIONS,
+                "properties": {"disabled": False},
+                "value_raw": "{'levels': (80.0, 90.0)}",
+                "location": {"position": "after", "folder": None, "neighbour": "rule3"},
+            }
+        )
+
+        # The neighbour's folder is taken from the snapshot, too
+        assert api.desired["rule"]["location"]["folder"] == "/"
+        assert api._changed_items == ["location"]
+        assert len(_ruleset_fetches(calls)) == 1
+
+    def test_snapshot_refreshed_after_write(self):
+        api, calls, fake_fetch = _rule_api(
+            {
+                "rule_id": "rule1",
+                "conditions": CONDITIONS,
+                "properties": {"disabled": False},
+                "value_raw": "{'levels': (81.0, 91.0)}",
+                "location": {"position": "any", "folder": "/", "neighbour": None},
+            }
+        )
+        snapshot = api.snapshot
+
+        assert snapshot.folder_rules("/") == ["rule1", "rule3"]
+        assert snapshot.folder_index("rule3") == 1
+
+        with patch.object(RuleAPI, "_fetch", side_effect=fake_fetch):
+            api.edit()
+            assert snapshot.get("rule1")
+
+        assert len(_ruleset_fetches(calls)) == 2
+
+
+# ---------------------------------------------------------------------------
+# Tests for the fingerprint index
+# ---------------------------------------------------------------------------
+
+
+class TestFingerprintIndex:
+    def _api(self):
+        api, calls, fake_fetch = _rule_api(
+            {
+                "rule_id": "rule1",
+                "conditions": CONDITIONS,
+                "properties": {"disabled": False},
+                "value_raw": "{'levels': (80.0, 90.0)}",
+                "location": {"position": "any", "folder": "/", "neighbour": None},
+            }
+        )
+        return api
+
+    def test_fingerprint_ignores_defaults_and_number_types(self):
+        api = self._api()
+
+        current = {
+            "conditions": dict(CONDITIONS, host_labels=[]),
+            "properties": {"disabled": False, "description": ""},
+        }
+        desired = {"conditions": CONDITIONS, "properties": {"disabled": False}}
+
+        assert api._fingerprint("/", current, {"levels": [80, 90]}) == (
+            api._fingerprint("/", desired, {"levels": [80.0, 90.0]})
+        )
+        assert api._fingerprint("/", current, {"levels": [80, 90]}) != (
+            api._fingerprint("/linux", desired, {"levels": [80, 90]})
+        )
+        assert api._fingerprint("/", current, {"levels": [80, 90]}) != (
+            api._fingerprint("/", desired, {"levels": [90, 80]})
+        )
+
+    def test_unparsable_rule_is_skipped(self):
+        api = self._api()
+        rules = [_rule("broken", "/other", "{'levels': (80.0,")] + RULES
+        collection = _result(200, content=json.dumps({"value": rules}))
+        api.snapshot.invalidate()
+
+        with patch.object(api, "_fetch", return_value=collection):
+            found = api._get_rule_id(
+                {
+                    "ruleset": COMMON_PARAMS["ruleset"],
+                    "rule": {
+                        "location": {"folder": "/"},
+                        "conditions": CONDITIONS,
+                        "properties": {"disabled": False},
+                        "value_raw": "{'levels': (70.0, 80.0)}",
+                    },
+                }
+            )
+
+        assert found == "rule3"
+        api.module.fail_json.assert_not_called()
+
+    def test_find_1000_of_10k_rules(self):
+        """Find 1000 desired rules in a ruleset of 10k rules.
+
+        The ruleset is fetched once, and the index is built with one
+        literal_eval per rule, instead of scanning the ruleset for every
+        desired rule.
+        """
+        api = self._api()
+        rules = [
+            _rule(
+                "rule%d" % i,
+                "/folder%d" % (i % 100),
+                "{'levels': (%d.0, %d.0), 'magic': 0.8}" % (i, i + 10),
+            )
+            for i in range(10000)
+        ]
+        collection = _result(200, content=json.dumps({"value": rules}))
+        api.snapshot.invalidate()
+
+        with patch.object(api, "_fetch", return_value=collection) as fetch:
+            found = [
+                api._get_rule_id(
+                    {
+                        "ruleset": COMMON_PARAMS["ruleset"],
+                        "rule": {
+                            "location": {"folder": "/folder%d" % (i % 100)},
+                            "conditions": CONDITIONS,
+                            "properties": {"disabled": False, "description": ""},
+                            "value_raw": "{'levels': (%d, %d), 'magic': 0.8}"
+                            % (i, i + 10),
+                        },
+                    }
+                )
+                for i in range(0, 10000, 10)
+            ]
+
+        assert found == ["rule%d" % i for i in range(0, 10000, 10)]
+        fetch.assert_called_once()
+
+
+# ---------------------------------------------------------------------------
+# Tests for the bulk mode
+# ---------------------------------------------------------------------------
+
+
+def _location(position="any", folder="/", neighbour=None):
+    return {"position": position, "folder": folder, "neighbour": neighbour}
+
+
+def _desired(value_raw, rule_id=None, location=None, state=None):
+    return {
+        "ruleset": None,
+        "state": state,
+        "rule": {
+            "rule_id": rule_id,
+            "conditions": dict(CONDITIONS),
+            "properties": {"disabled": False},
+            "value_raw": value_raw,
+            "location": location or _location(),
+        },
+    }
+
+
+def _bulk_api(rules, check_mode=False):
+    params = dict(COMMON_PARAMS)
+    params["rules"] = rules
+
+    module = MagicMock()
+    module.params = params
+    module.check_mode = check_mode
+    module._diff = True
+    module._socket_path = None
+
+    calls = []
+    holder = {}
+
+    def fake_fetch(code_mapping="", endpoint="", data=None, method="GET", **kwargs):
+        calls.append((method, endpoint, holder["api"].headers.get("If-Match")))
+        if endpoint.startswith(RuleEndpoints.create) and method == "GET":
+            return _result(200, content=json.dumps({"value": RULES}))
+        if method == "GET":
+            return _result(200, content=json.dumps(RULES[0]), etag="etag-get")
+        if method == "POST" and endpoint == RuleEndpoints.create:
+            return _result(
+                200, changed=True, content=json.dumps({"id": "new"}), etag="etag-new"
+            )
+        return _result(200, changed=True, content="{}", etag="etag-%s" % method.lower())
+
+    with patch.object(
+        RuleBulkAPI, "getversion", return_value=CheckmkVersion("2.3.0p1")
+    ):
+        api = RuleBulkAPI(module)
+    holder["api"] = api
+
+    with patch.object(RuleBulkAPI, "_fetch", side_effect=fake_fetch):
+        result = api.run()
+
+    return result, [c for c in calls if not c[1].startswith(RuleEndpoints.create + "?")]
+
+
+class TestBulkMode:
+    def test_plan_and_apply(self):
+        result, writes = _bulk_api(
+            [
+                # rule1 unchanged, rule2 edited, rule3 deleted, one new rule
+                _desired("{'levels': (80.0, 90.0)}"),
+                _desired(
+                    "{'levels': (86.0, 96.0)}",
+                    rule_id="rule2",
+                    location=_location(folder="/linux"),
+                ),
+                _desired(None, rule_id="rule3", state="absent"),
+                _desired("{'levels': (1.0, 2.0)}", location=_location("top")),
+            ]
+        )
+
+        assert [r["actions"] for r in result["rules"]] == [
+            [],
+            ["edit"],
+            ["delete"],
+            ["create", "move"],
+        ]
+        assert [r["rule_id"] for r in result["rules"]] == [
+            "rule1",
+            "rule2",
+            "rule3",
+            "new",
+        ]
+        assert result["changed"] is True
+        assert result["failed"] is False
+        assert result["msg"] == "Rules changed: 3, unchanged: 1, failed: 0."
+        assert [(method, endpoint) for method, endpoint, etag in writes] == [
+            ("GET", RuleEndpoints.default + "/rule2"),
+            ("PUT", RuleEndpoints.default + "/rule2"),
+            ("DELETE", RuleEndpoints.default + "/rule3"),
+            ("POST", RuleEndpoints.create),
+            ("POST", RuleEndpoints.default + "/new/actions/move/invoke"),
+        ]
+
+    def test_etag_chaining(self):
+        result, writes = _bulk_api(
+            [
+                _desired(
+                    "{'levels': (81.0, 91.0)}",
+                    rule_id="rule1",
+                    location=_location("bottom"),
+                ),
+                _desired(None, rule_id="rule1", state="absent"),
+            ]
+        )
+
+        # The ETag of the GET is used for the edit, the ETag of every write
+        # for the next write to the same rule
+        assert writes == [
+            ("GET", RuleEndpoints.default + "/rule1", None),
+            ("PUT", RuleEndpoints.default + "/rule1", "etag-get"),
+            ("POST", RuleEndpoints.default + "/rule1/actions/move/invoke", "etag-put"),
+            ("DELETE", RuleEndpoints.default + "/rule1", "etag-post"),
+        ]
+
+    def test_own_neighbour_leaves_the_snapshot_unchanged(self):
+        result, writes = _bulk_api(
+            [
+                _desired(
+                    "{'levels': (81.0, 91.0)}",
+                    rule_id="rule1",
+                    location=_location("before", neighbour="rule1"),
+                ),
+                _desired("{'levels': (81.0, 91.0)}", rule_id="rule1"),
+            ]
+        )
+
+        assert result["rules"][0]["failed"] is True
+        assert result["rules"][0]["msg"] == "ERROR: A rule cannot be its own neighbour."
+        # The failed rule was not applied to the snapshot, so the edit is still due
+        assert [r["actions"] for r in result["rules"]] == [[], ["edit"]]
+
+    def test_neighbour_of_another_ruleset(self):
+        result, writes = _bulk_api(
+            [
+                _desired(
+                    "{'levels': (1.0, 2.0)}",
+                    location=_location("after", folder=None, neighbour="other"),
+                )
+            ]
+        )
+
+        # Like in single mode, the neighbour is looked up by its id
+        assert result["rules"][0]["failed"] is False
+        assert result["rules"][0]["actions"] == ["create", "move"]
+        assert [(method, endpoint) for method, endpoint, etag in writes] == [
+            ("GET", RuleEndpoints.default + "/other"),
+            ("POST", RuleEndpoints.create),
+            ("POST", RuleEndpoints.default + "/new/actions/move/invoke"),
+        ]
+
+    def test_moves_are_planned_on_the_snapshot(self):
+        result, writes = _bulk_api(
+            [
+                _desired("{'levels': (70.0, 80.0)}", location=_location("top")),
+                _desired("{'levels': (80.0, 90.0)}", location=_location("top")),
+                # Already at the bottom once the first two moves are done
+                _desired("{'levels': (70.0, 80.0)}", location=_location("bottom")),
+            ]
+        )
+
+        assert [r["actions"] for r in result["rules"]] == [["move"], ["move"], []]
+
+    def test_duplicate_rules_are_created_once(self):
+        result, writes = _bulk_api(
+            [_desired("{'levels': (1.0, 2.0)}"), _desired("{'levels': (1.0, 2.0)}")]
+        )
+
+        assert [r["actions"] for r in result["rules"]] == [["create"], []]
+        assert [r["rule_id"] for r in result["rules"]] == ["new", "new"]
+
+    def test_check_mode_diff(self):
+        result, writes = _bulk_api(
+            [
+                _desired("{'levels': (1.0, 2.0)}", location=_location("top")),
+                _desired(None, rule_id="unknown", state="absent"),
+                _desired(None, rule_id="unknown"),
+            ],
+            check_mode=True,
+        )
+
+        assert writes == []
+        assert result["rules"][0]["msg"] == (
+            "Running in check mode. Would have done: create, move."
+        )
+        assert result["rules"][0]["rule_id"] is None
+        assert result["rules"][1]["msg"] == "Rule already absent."
+        assert result["rules"][2]["failed"] is True
+        assert result["diff"] == [
+            {
+                "before_header": COMMON_PARAMS["ruleset"] + " (new rule)",
+                "after_header": COMMON_PARAMS["ruleset"] + " (new rule)",
+                "before": {},
+                "after": {
+                    "folder": "/",
+                    "ruleset": COMMON_PARAMS["ruleset"],
+                    "conditions": {
+                        "host_tags": [],
+                        "host_label_groups": [],
+                        "service_label_groups": [],
+                    },
+                    "properties": {"disabled": False},
+                    "value_raw": "{'levels': (1.0, 2.0)}",
+                    "folder_index": 0,
+                },
+            }
+        ]